@@ -1,13 +1,121 @@
 import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+
+def _copy_json(value):
+    """Copia profunda de datos JSON (dict/list/escalares), bastante más rápida que copy.deepcopy."""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+class MemoryTier:
+    """
+    LRU en memoria de entradas ya parseadas, acotado por cantidad y por bytes
+    (el tamaño del archivo en disco como estimación). Cada entrada guarda su
+    vencimiento: el TTL se revisa sin tocar el disco.
+    """
+    def __init__(self, max_entries: int = 32, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = 1
+        self.max_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Any, datetime, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.resize(max_entries, max_bytes)
+
+    def resize(self, max_entries: int, max_bytes: int):
+        """Nuevos límites; si bajan, se desalojan las entradas menos usadas."""
+        with self._lock:
+            self.max_entries = max(1, int(max_entries))
+            self.max_bytes = max(0, int(max_bytes))
+            self._shrink()
+
+    def get(self, key: str, now: datetime) -> Tuple[bool, Any]:
+        """(encontrado, datos); una entrada vencida se descarta y cuenta como fallo."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            data, expires_at, size = entry
+            if now > expires_at:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, data
+
+    def put(self, key: str, data: Any, expires_at: datetime, size: int):
+        size = max(0, int(size))
+        with self._lock:
+            self._drop(key)
+            if self.max_bytes and size > self.max_bytes:
+                return  # más grande que todo el nivel: solo en disco
+            self._entries[key] = (data, expires_at, size)
+            self._bytes += size
+            self._shrink()
+
+    def discard(self, key: str):
+        with self._lock:
+            self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_size_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _shrink(self):
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or (self.max_bytes and self._bytes > self.max_bytes)):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+
+# Índice y nivel en memoria por directorio de caché, compartidos entre instancias:
+# un APIClient nuevo (nueva partida) encuentra lo ya cargado sin leer el disco.
+# Los límites del nivel en memoria son los de la última instancia creada.
+_SHARED: Dict[str, Tuple[Dict[str, Any], MemoryTier]] = {}
+_SHARED_LOCK = threading.Lock()
 
 
 class APICache:
-    def __init__(self, cache_directory: str = "api_cache"):
+    def __init__(self, cache_directory: str = "api_cache", memory_entries: int = 32,
+                 memory_mb: float = 32, copy_on_read: bool = True):
         self.cache_dir = Path(cache_directory)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Copia al leer: quien recibe los datos puede modificarlos sin tocar el caché
+        self.copy_on_read = bool(copy_on_read)
 
         self.default_ttl = timedelta(hours=1)  # Tiempo de vida por defecto
         self.max_cache_size = 100 * 1024 * 1024  # 100MB máximo
@@ -19,7 +127,17 @@ class APICache:
         }
 
         self.index_file = self.cache_dir / "cache_index.json"
-        self.index = self._load_index()
+        shared_key = str(self.cache_dir.resolve())
+        with _SHARED_LOCK:
+            shared = _SHARED.get(shared_key)
+            if shared is None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                shared = _SHARED[shared_key] = (
+                    self._load_index(), MemoryTier(memory_entries, int(memory_mb * 1024 * 1024)))
+            else:
+                shared[1].resize(memory_entries, int(memory_mb * 1024 * 1024))
+        self.index, self.memory = shared
+        self.disk_reads = 0
 
     def save(self, key: str, data: Dict[str, Any], ttl: Optional[timedelta] = None) -> bool:
         try:
@@ -52,6 +170,7 @@ class APICache:
             }
 
             self._save_index()
+            self.memory.put(key, _copy_json(data), expires_at, self.index[key]["size"])
 
             # Limpiar caché si es necesario
             self._cleanup_if_needed()
@@ -64,6 +183,11 @@ class APICache:
 
     def load(self, key: str) -> Optional[Dict[str, Any]]:
         try:
+            # Nivel en memoria (TTL incluido) antes que el disco
+            found, data = self.memory.get(key, datetime.now())
+            if found:
+                return _copy_json(data) if self.copy_on_read else data
+
             # Verificar si existe en el índice
             if key not in self.index:
                 return None
@@ -86,8 +210,11 @@ class APICache:
 
             with open(cache_file, 'r', encoding='utf-8') as f:
                 cache_entry = json.load(f)
+            self.disk_reads += 1
 
-            return cache_entry["data"]
+            data = cache_entry["data"]
+            self.memory.put(key, data, expires_at, entry_info.get("size", 0))
+            return _copy_json(data) if self.copy_on_read else data
 
         except Exception as e:
             print(f"Error al cargar desde caché {key}: {e}")
@@ -106,6 +233,7 @@ class APICache:
             return False
 
     def remove(self, key: str) -> bool:
+        self.memory.discard(key)
         try:
             if key in self.index:
                 entry_info = self.index[key]
@@ -127,6 +255,7 @@ class APICache:
         return False
 
     def clear(self) -> bool:
+        self.memory.clear()
         try:
             for cache_file in self.cache_dir.glob("*.json"):
                 if cache_file.name != "cache_index.json":
@@ -167,7 +296,9 @@ class APICache:
             "expired_entries": expired_entries,
             "total_size_bytes": total_size,
             "cache_directory": str(self.cache_dir),
-            "max_size_bytes": self.max_cache_size
+            "max_size_bytes": self.max_cache_size,
+            "disk_reads": self.disk_reads,
+            "memory": self.memory.stats()
         }
 
     def cleanup_expired(self) -> int:
@@ -214,6 +345,7 @@ class APICache:
             return False
 
     def _remove_expired_entry(self, key: str):
+        self.memory.discard(key)
         try:
             if key in self.index:
                 entry_info = self.index[key]
@@ -12,11 +12,17 @@ class APIClient:
         self.base_url = config.get("base_url", "")
         self.timeout = config.get("timeout", 10)
         self.cache_enabled = config.get("cache_enabled", True)
+        # Servir entradas vigentes (dentro de su TTL) desde el caché sin ir a la red
+        self.prefer_cache = config.get("prefer_cache", True)
 
         # Inicializar caché si está habilitado
         if self.cache_enabled:
             cache_dir = config.get("cache_directory", "api_cache")
-            self.cache = APICache(cache_dir)
+            self.cache = APICache(
+                cache_dir,
+                memory_entries=config.get("memory_cache_entries", 32),
+                memory_mb=config.get("memory_cache_mb", 32),
+            )
         else:
             self.cache = None
 
@@ -44,9 +50,16 @@ class APIClient:
     def _make_request(self, endpoint: str, cache_key: str) -> Optional[Dict[str, Any]]:
         url = self.base_url + endpoint
 
+        # Si ya se consultó el caché aquí, el respaldo no lo vuelve a consultar (un solo fallo por pedido)
+        cache_checked = bool(self.cache and self.prefer_cache)
+        if cache_checked:
+            cached_data = self.cache.load(cache_key)
+            if cached_data:
+                return cached_data
+
         try:
             if not self._check_connection():
-                return self._get_from_cache_or_backup(cache_key)
+                return self._get_from_cache_or_backup(cache_key, cache_checked)
 
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
@@ -65,11 +78,11 @@ class APIClient:
         except requests.exceptions.RequestException as e:
             print(f"Error en petición API {endpoint}: {e}")
             self.is_online = False
-            return self._get_from_cache_or_backup(cache_key)
+            return self._get_from_cache_or_backup(cache_key, cache_checked)
 
         except json.JSONDecodeError as e:
             print(f"Error al decodificar JSON desde {endpoint}: {e}")
-            return self._get_from_cache_or_backup(cache_key)
+            return self._get_from_cache_or_backup(cache_key, cache_checked)
 
     def _save_backup(self, cache_key: str, data: Dict[str, Any]):
         backup_files = {
@@ -110,9 +123,9 @@ class APIClient:
 
         return self.is_online
 
-    def _get_from_cache_or_backup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    def _get_from_cache_or_backup(self, cache_key: str, cache_checked: bool = False) -> Optional[Dict[str, Any]]:
         # Intentar obtener desde caché
-        if self.cache:
+        if self.cache and not cache_checked:
             cached_data = self.cache.load(cache_key)
             if cached_data:
                 print(f"Datos obtenidos desde caché: {cache_key}")
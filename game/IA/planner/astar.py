@@ -27,6 +27,7 @@ class AStarPlanner(PathPlanner):
         self._goal: Optional[Tuple[int, int]] = None
         self._path: List[Tuple[int, int]] = []
         self._last_start: Optional[Tuple[int, int]] = None
+        self._map_version = getattr(world.city, "map_version", 0) if getattr(world, "city", None) else 0
         self.debug = False
 
     def set_goal(self, goal: Optional[Tuple[int, int]]) -> None:
@@ -44,7 +45,7 @@ class AStarPlanner(PathPlanner):
             return False
 
         # 2. La celda NO debe ser edificio
-        if city.tiles[y][x] == "B":
+        if city.is_blocked_cell(x, y):
             return False
 
         # 3. SOLO bloquear esquinas que sean REALMENTE imposibles
@@ -57,7 +58,7 @@ class AStarPlanner(PathPlanner):
                 continue
 
             # Si hay edificio en diagonal
-            if city.tiles[corner_y][corner_x] == "B":
+            if city.is_blocked_cell(corner_x, corner_y):
                 # Solo bloquear si AMBOS lados adyacentes son edificios
                 side1_x, side1_y = x + dx, y
                 side2_x, side2_y = x, y + dy
@@ -66,12 +67,12 @@ class AStarPlanner(PathPlanner):
                 side2_wall = False
 
                 if 0 <= side1_x < city.width and 0 <= side1_y < city.height:
-                    side1_wall = (city.tiles[side1_y][side1_x] == "B")
+                    side1_wall = city.is_blocked_cell(side1_x, side1_y)
                 else:
                     side1_wall = True  # Fuera de límites = pared
 
                 if 0 <= side2_x < city.width and 0 <= side2_y < city.height:
-                    side2_wall = (city.tiles[side2_y][side2_x] == "B")
+                    side2_wall = city.is_blocked_cell(side2_x, side2_y)
                 else:
                     side2_wall = True  # Fuera de límites = pared
 
@@ -195,6 +196,18 @@ class AStarPlanner(PathPlanner):
         if self.debug:
             print(f"[A*] Camino encontrado: {len(self._path)} pasos (iteraciones: {iterations})")
 
+    def _drop_path_if_map_edited(self):
+        """Descarta el camino solo si una edición del mapa tocó alguna de sus celdas."""
+        city = self.world.city
+        version = getattr(city, "map_version", 0)
+        if version == self._map_version:
+            return
+        if self._path and city.edits_touch(self._map_version, self._path):
+            if self.debug:
+                print("[A*] Mapa editado sobre el camino, replanificando")
+            self._path = []
+        self._map_version = version
+
     def _validate_path(self, path: List[Tuple[int, int]]) -> bool:
         """
         Valida que todo el camino sea seguro (sin edificios).
@@ -256,6 +269,8 @@ class AStarPlanner(PathPlanner):
         if not self._goal:
             return (0, 0)
 
+        self._drop_path_if_map_edited()
+
         # Redondear posición actual al entero más cercano
         start = (int(ai.x + 0.5), int(ai.y + 0.5))
 
@@ -21,7 +21,7 @@ def _is_walkable(world, x: float, y: float) -> bool:
         return False
 
     # Verificar la celda principal
-    if city.tiles[iy][ix] == "B":
+    if city.is_blocked_cell(ix, iy):
         return False
 
     return True
@@ -92,6 +92,7 @@ class GreedyPolicy(StepPolicy):
         self._bfs_target = None
         self._stuck_counter = 0
         self._last_position = None
+        self._map_version = getattr(getattr(world, "city", None), "map_version", 0)
 
         # Control de debug
         self._last_debug_time = 0.0
@@ -193,6 +194,14 @@ class GreedyPolicy(StepPolicy):
 
         self._last_position = current_pos
 
+        # Si una edición del mapa tocó el path BFS, descartarlo
+        city = self.world.city
+        version = getattr(city, "map_version", 0)
+        if version != self._map_version:
+            if self._bfs_path and city.edits_touch(self._map_version, self._bfs_path):
+                self._bfs_path = []
+            self._map_version = version
+
         # Si está atascado O el target cambió, recalcular path con BFS
         should_replan = False
 
@@ -150,7 +150,7 @@ class EasyStrategy(BaseStrategy):
 
             if stamina_ok:
                 if ai.try_accept_order_with_delay(order, now):
-                    order.start_timer(now)
+                    game.orders_manager.start_order_timer(order, ai, now)
                     order.status = "in_progress"
                     game.pending_orders.remove(order)
 
@@ -210,7 +210,7 @@ class MediumStrategy(BaseStrategy):
             if not ai.inventory.orders and game.pending_orders:
                 best = self._find_best_order(ai, game.pending_orders, game)
                 if best and ai.try_accept_order_with_delay(best, now):
-                    best.start_timer(now)
+                    game.orders_manager.start_order_timer(best, ai, now)
                     best.status = "in_progress"
                     game.pending_orders.remove(best)
                     if hasattr(game.orders_manager, 'pending_orders'):
@@ -236,7 +236,7 @@ class MediumStrategy(BaseStrategy):
 
         best = self._find_best_order(ai, game.pending_orders, game)
         if best and ai.try_accept_order_with_delay(best, now):
-            best.start_timer(now)
+            game.orders_manager.start_order_timer(best, ai, now)
             best.status = "in_progress"
             game.pending_orders.remove(best)
             if hasattr(game.orders_manager, 'pending_orders'):
@@ -409,7 +409,7 @@ class HardStrategy(BaseStrategy):
                     if new_weight > ai.inventory.max_weight:
                         continue
                     if ai.try_accept_order_with_delay(cand, now):
-                        cand.start_timer(now)
+                        game.orders_manager.start_order_timer(cand, ai, now)
                         cand.status = "in_progress"
                         game.pending_orders.remove(cand)
                         if hasattr(game.orders_manager, 'pending_orders'):
@@ -467,7 +467,7 @@ class HardStrategy(BaseStrategy):
                 new_weight = ai.inventory.current_weight + float(getattr(order, 'weight', 0.0))
                 if new_weight <= ai.inventory.max_weight:
                     if ai.try_accept_order_with_delay(order, now):
-                        order.start_timer(now)
+                        game.orders_manager.start_order_timer(order, ai, now)
                         order.status = "in_progress"
                         game.pending_orders.remove(order)
                         if hasattr(game.orders_manager, 'pending_orders'):
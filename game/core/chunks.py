@@ -0,0 +1,306 @@
+"""
+Almacenamiento de tiles por chunks para mapas muy grandes.
+
+El mapa se divide en bloques cuadrados de chunk_size x chunk_size (potencia
+de 2). Cada bloque se decodifica a demanda desde su fuente (filas del payload
+JSON o capa "tiles" de un .cqmap mapeado) y se guarda en un LRU acotado, así
+la memoria residente depende del área activa y no del tamaño del mapa.
+
+ChunkedGrid expone dos capas con indexado plano (y * width + x), `codes` y
+`blocked`, que reemplazan a los bytearray de CityMap sin cambiar a quienes
+leen la grilla (is_wall, get_surface_weight, el DDA del raycaster, A*).
+"""
+import threading
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class ChunkSource:
+    """Origen de los códigos de tile de un chunk (bytes fila mayor, ancho fijo)."""
+    def __init__(self, width: int, height: int):
+        self.width = int(width)
+        self.height = int(height)
+
+    def load(self, x0: int, y0: int, w: int, h: int) -> bytearray:
+        raise NotImplementedError
+
+    def sample_row(self, y: int, x0: int, x1: int, step: int = 1) -> bytes:
+        """Códigos de la fila y en [x0, x1) cada `step` tiles."""
+        return bytes(self.load(x0, y, x1 - x0, 1)[::step])
+
+    def close(self):
+        pass
+
+
+class RowsChunkSource(ChunkSource):
+    """Decodifica los chunks desde las filas del payload (listas o str) al pedirlos."""
+    def __init__(self, rows: Sequence, width: int, code_of: Callable[[str], int]):
+        super().__init__(width, len(rows))
+        self.rows = rows
+        self.code_of = code_of
+        self._lock = threading.Lock()  # code_of registra tiles nuevos
+
+    def load(self, x0, y0, w, h):
+        out = bytearray(w * h)
+        cache: Dict[str, int] = {}
+        with self._lock:
+            for j in range(h):
+                base = j * w
+                for i, ch in enumerate(self.rows[y0 + j][x0:x0 + w]):
+                    code = cache.get(ch)
+                    if code is None:
+                        code = cache[ch] = self.code_of(ch)
+                    out[base + i] = code
+        return out
+
+    def sample_row(self, y, x0, x1, step=1):
+        code_of = self.code_of
+        with self._lock:
+            return bytes(code_of(ch) for ch in self.rows[y][x0:x1:step])
+
+
+class BufferChunkSource(ChunkSource):
+    """Chunks copiados desde un buffer plano (p. ej. la capa "tiles" del mmap de un .cqmap)."""
+    def __init__(self, buf, width: int, height: int, on_close: Optional[Callable[[], None]] = None):
+        super().__init__(width, height)
+        self.buf = buf
+        self._on_close = on_close
+
+    def load(self, x0, y0, w, h):
+        out = bytearray(w * h)
+        W = self.width
+        for j in range(h):
+            start = (y0 + j) * W + x0
+            out[j * w:(j + 1) * w] = self.buf[start:start + w]
+        return out
+
+    def sample_row(self, y, x0, x1, step=1):
+        start = y * self.width
+        return bytes(self.buf[start + x0:start + x1:step])
+
+    def close(self):
+        self.buf = None
+        if self._on_close is not None:
+            self._on_close()
+
+
+class _ChunkLayer:
+    """Capa de ChunkedGrid con indexado plano; 0 = códigos, 1 = bloqueado."""
+    __slots__ = ("_grid", "_layer")
+
+    def __init__(self, grid: "ChunkedGrid", layer: int):
+        self._grid = grid
+        self._layer = layer
+
+    def __len__(self) -> int:
+        return self._grid.width * self._grid.height
+
+    def __getitem__(self, i):
+        g = self._grid
+        if isinstance(i, slice):
+            return bytes(self[k] for k in range(*i.indices(len(self))))
+        y, x = divmod(i, g.width)
+        key = (y >> g.shift) * g.ncx + (x >> g.shift)
+        chunk = g._resident.get(key)
+        if chunk is None:
+            chunk = g._load(key)
+        g._last_use[key] = g._tick
+        return chunk[self._layer][((y & g.mask) << g.shift) | (x & g.mask)]
+
+    def __setitem__(self, i, value):
+        if self._layer == 0:
+            self._grid.set_code(i, value)
+        else:
+            self._grid.set_blocked(i, value)
+
+    def row(self, y: int) -> bytes:
+        return self._grid.row_bytes(y, self._layer)
+
+    def iter_rows(self) -> Iterator[bytes]:
+        for y in range(self._grid.height):
+            yield self._grid.row_bytes(y, self._layer)
+
+    def tobytes(self) -> bytes:
+        return b"".join(self.iter_rows())
+
+
+class ChunkedGrid:
+    """
+    LRU de chunks residentes sobre una ChunkSource. Los chunks editados quedan
+    fijos en memoria (la fuente es de solo lectura). La recencia se refresca en
+    cada acceso; prefetch() carga por adelantado alrededor de los puntos dados.
+    """
+    def __init__(self, source: ChunkSource, blocked_table: bytes,
+                 chunk_size: int = 64, max_resident: int = 256):
+        size = max(8, int(chunk_size))
+        self.shift = size.bit_length() - 1
+        self.chunk_size = 1 << self.shift  # potencia de 2
+        self.mask = self.chunk_size - 1
+        self.width = source.width
+        self.height = source.height
+        self.ncx = (self.width + self.mask) >> self.shift
+        self.ncy = (self.height + self.mask) >> self.shift
+        self.max_resident = max(4, int(max_resident))
+        self.source = source
+        self.blocked_table = bytes(blocked_table)
+
+        self._resident: Dict[int, Tuple[bytearray, bytearray]] = {}
+        self._last_use: Dict[int, int] = {}
+        self._pinned: Set[int] = set()
+        self._tick = 0
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.evictions = 0
+
+        self.codes = _ChunkLayer(self, 0)
+        self.blocked = _ChunkLayer(self, 1)
+
+    # ---------- Lectura ----------
+    def chunk_key(self, x: int, y: int) -> int:
+        return (y >> self.shift) * self.ncx + (x >> self.shift)
+
+    def row_bytes(self, y: int, layer: int = 0) -> bytes:
+        S, shift, mask = self.chunk_size, self.shift, self.mask
+        off = (y & mask) << shift
+        parts = []
+        base_key = (y >> shift) * self.ncx
+        for cx in range(self.ncx):
+            key = base_key + cx
+            chunk = self._resident.get(key) or self._load(key)
+            w = min(S, self.width - (cx << shift))
+            parts.append(bytes(chunk[layer][off:off + w]))
+        return b"".join(parts)
+
+    def sample_row(self, y: int, x0: int, x1: int, step: int = 1) -> bytes:
+        """
+        Códigos de la fila y en [x0, x1) cada `step` tiles leídos directo de la
+        fuente, sin cargar ni desalojar chunks del LRU; los chunks editados
+        (fijos en memoria) se leen de su copia residente.
+        """
+        out = bytearray(self.source.sample_row(y, x0, x1, step))
+        shift, cy = self.shift, y >> self.shift
+        off = (y & self.mask) << shift
+        with self._lock:
+            for key in self._pinned:
+                if key // self.ncx != cy:
+                    continue
+                cx = key - cy * self.ncx
+                lo, hi = max(x0, cx << shift), min(x1, (cx + 1) << shift)
+                first = x0 + -(-(lo - x0) // step) * step
+                codes = self._resident[key][0]
+                for x in range(first, hi, step):
+                    out[(x - x0) // step] = codes[off + (x & self.mask)]
+        return bytes(out)
+
+    def is_resident(self, x: int, y: int) -> bool:
+        return self.chunk_key(x, y) in self._resident
+
+    # ---------- Edición ----------
+    def set_code(self, i: int, code: int):
+        chunk, j = self._writable(i)
+        chunk[0][j] = code
+        chunk[1][j] = self.blocked_table[code]
+
+    def set_blocked(self, i: int, value: int):
+        chunk, j = self._writable(i)
+        chunk[1][j] = 1 if value else 0
+
+    def set_blocked_table(self, table: bytes):
+        """Nueva tabla código -> bloqueado (cambio de leyenda): se recalculan los residentes."""
+        with self._lock:
+            self.blocked_table = bytes(table)
+            for codes, blocked in self._resident.values():
+                blocked[:] = codes.translate(self.blocked_table)
+
+    # ---------- Prefetch ----------
+    def prefetch(self, points: Iterable[Tuple[float, float]], radius: int, budget: int = 4) -> int:
+        """
+        Refresca y, si faltan, carga los chunks a `radius` tiles de cada punto.
+        Carga como máximo `budget` chunks por llamada; retorna cuántos cargó.
+        """
+        self._tick += 1
+        wanted: List[int] = []
+        seen = set()
+        shift = self.shift
+        for px, py in points:
+            ix, iy = int(px), int(py)
+            cx0, cx1 = max(0, (ix - radius) >> shift), min(self.ncx - 1, (ix + radius) >> shift)
+            cy0, cy1 = max(0, (iy - radius) >> shift), min(self.ncy - 1, (iy + radius) >> shift)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    key = cy * self.ncx + cx
+                    if key not in seen:
+                        seen.add(key)
+                        wanted.append(key)
+        loaded = 0
+        for key in wanted:
+            if key in self._resident:
+                self._last_use[key] = self._tick
+            elif loaded < budget:
+                self._load(key)
+                loaded += 1
+        return loaded
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "chunk_size": self.chunk_size,
+            "chunks_total": self.ncx * self.ncy,
+            "resident": len(self._resident),
+            "pinned": len(self._pinned),
+            "max_resident": self.max_resident,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            self._resident.clear()
+            self._last_use.clear()
+            self._pinned.clear()
+            try:
+                self.source.close()
+            except Exception:
+                pass
+
+    # ---------- helpers privados ----------
+    def _writable(self, i: int):
+        y, x = divmod(i, self.width)
+        key = self.chunk_key(x, y)
+        with self._lock:
+            chunk = self._resident.get(key) or self._load(key)
+            self._pinned.add(key)
+        return chunk, ((y & self.mask) << self.shift) | (x & self.mask)
+
+    def _load(self, key: int) -> Tuple[bytearray, bytearray]:
+        with self._lock:
+            chunk = self._resident.get(key)
+            if chunk is not None:
+                return chunk
+            cy, cx = divmod(key, self.ncx)
+            x0, y0 = cx << self.shift, cy << self.shift
+            w = min(self.chunk_size, self.width - x0)
+            h = min(self.chunk_size, self.height - y0)
+            raw = self.source.load(x0, y0, w, h)
+            # Chunks de borde se rellenan a S x S para indexar siempre igual
+            S = self.chunk_size
+            codes = bytearray(S * S)
+            for j in range(h):
+                codes[j * S:j * S + w] = raw[j * w:(j + 1) * w]
+            chunk = (codes, bytearray(codes.translate(self.blocked_table)))
+            self._evict(len(self._resident) + 1 - self.max_resident)
+            self._tick += 1
+            self._resident[key] = chunk
+            self._last_use[key] = self._tick
+            self.loads += 1
+            return chunk
+
+    def _evict(self, n: int):
+        if n <= 0:
+            return
+        candidates = sorted((k for k in self._resident if k not in self._pinned),
+                            key=lambda k: self._last_use.get(k, 0))
+        for key in candidates[:n]:
+            # Quien ya tenga el chunk en mano lo sigue leyendo sin problema
+            self._resident.pop(key, None)
+            self._last_use.pop(key, None)
+            self.evictions += 1
@@ -1,7 +1,81 @@
 import json
-from typing import Dict, Any, List, Tuple, Optional
+import threading
+from array import array
+from collections import deque
+from typing import Dict, Any, List, Tuple, Optional, Iterable, Sequence, Callable
 from pathlib import Path
 
+from game.core.chunks import BufferChunkSource, ChunkedGrid, RowsChunkSource
+from game.core.cqmap import CQMapError, CQMapFile, save_city_cqmap
+from game.core.precompute import (
+    DERIVED_LAYERS, PrecomputeCache, map_content_hash, is_facade, update_nearest_feature,
+)
+
+WALL_TILE = "B"
+
+
+class TileGridView(Sequence):
+    """
+    Vista de compatibilidad de solo lectura sobre la grilla compacta:
+    tiles[y][x] retorna el caracter del tile como antes. Cada fila es un str
+    construido a demanda desde el bytearray y cacheado.
+    """
+    __slots__ = ("_city", "_rows")
+
+    def __init__(self, city: "CityMap"):
+        self._city = city
+        self._rows: List[Optional[Sequence[str]]] = [None] * city.height
+
+    def __len__(self) -> int:
+        return self._city.height
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [self[i] for i in range(*y.indices(len(self)))]
+        if y < 0:
+            y += self._city.height
+        row = self._rows[y]
+        if row is None:
+            row = self._city._build_row(y)
+            self._rows[y] = row
+        return row
+
+    def __iter__(self):
+        for y in range(self._city.height):
+            yield self[y]
+
+    def invalidate_row(self, y: int):
+        if 0 <= y < len(self._rows):
+            self._rows[y] = None
+
+
+class ChunkedRow(Sequence):
+    """Fila de un mapa por chunks: lee la grilla al vuelo en vez de copiarla."""
+    __slots__ = ("_city", "_y")
+
+    def __init__(self, city: "CityMap", y: int):
+        self._city = city
+        self._y = y
+
+    def __len__(self) -> int:
+        return self._city.width
+
+    def __getitem__(self, x):
+        city = self._city
+        if isinstance(x, slice):
+            return [city._chars[c] for c in city._chunks.row_bytes(self._y)[x]]
+        if x < 0:
+            x += city.width
+        if not 0 <= x < city.width:
+            raise IndexError("columna fuera del mapa")
+        return city._chars[city.grid[self._y * city.width + x]]
+
+    def __iter__(self):
+        chars = self._city._chars
+        for c in self._city._chunks.row_bytes(self._y):
+            yield chars[c]
+
+
 class CityMap:
 
     def __init__(self, api_client, config: Dict[str, Any]):
@@ -9,14 +83,24 @@ class CityMap:
         self.api_client = api_client
         self.config = config
 
-        # Datos del mapa
-        self.tiles: List[List[str]] = []
+        # Datos del mapa: grilla compacta (1 byte por tile, fila mayor)
+        # - grid: código del tile; blocked: 1 si es pared.
+        # - El peso de superficie se resuelve con una tabla por código (_weight_lut).
         self.width = 0
         self.height = 0
+        self.grid = bytearray()
+        self.blocked = bytearray()
+        self._codes: Dict[str, int] = {}
+        self._chars: List[str] = []
+        self._weight_lut: List[float] = [1.0] * 256
+        self._tiles_view: Optional[TileGridView] = None
+        # Mapas grandes: grid/blocked pasan a ser capas de un ChunkedGrid (ver _use_chunks)
+        self._chunks: Optional[ChunkedGrid] = None
         self.version = "1.0"
         self.goal = 3000
 
         # Leyenda de tiles
+        self._legend: Dict[str, Any] = {}
         self.legend = {
             "C": {"name": "calle", "surface_weight": 1.00},
             "B": {"name": "edificio", "blocked": True},
@@ -25,6 +109,21 @@ class CityMap:
 
         # Archivos de respaldo
         self.map_backup_file = Path(config["files"]["data_directory"]) / "ciudad.json"
+        # Copia binaria (.cqmap) del backup, abierta con mmap
+        self.map_binary_file = self.map_backup_file.with_suffix(".cqmap")
+        self.use_cqmap = bool(config.get("files", {}).get("use_cqmap", True))
+        self._cqmap = None
+
+        # Datos derivados (ver derived_layer): memo en memoria + caché en disco por hash
+        self._content_hash: Optional[str] = None
+        self._derived: Dict[str, Any] = {}
+        self._precompute: Optional[PrecomputeCache] = None
+        self._derived_lock = threading.Lock()
+
+        # Ediciones: versión incremental + rectángulos sucios (x0, y0, x1, y1 inclusivos)
+        self.map_version = 0
+        self._edit_log = deque(maxlen=128)  # (versión, rect)
+        self._edit_listeners: List[Callable[[Tuple[int, int, int, int], int], None]] = []
 
     def load_map(self) -> bool:
         try:
@@ -39,12 +138,23 @@ class CityMap:
         except Exception as e:
             print(f"Error al cargar mapa desde API: {e}")
 
+        # Copia binaria del backup si está al día
+        if self.use_cqmap and self._cqmap_is_fresh():
+            try:
+                self.load_cqmap(self.map_binary_file)
+                print("Mapa cargado desde backup binario (.cqmap)")
+                return True
+            except Exception as e:
+                print(f"Error al cargar mapa .cqmap: {e}")
+
         # Cargar desde backup offline
         try:
             backup_data = self._load_json(str(self.map_backup_file))
             if backup_data:
                 self._parse_map_data(backup_data)
                 print("Mapa cargado desde backup offline")
+                if self.use_cqmap:
+                    self.save_cqmap(self.map_binary_file)
                 return True
         except Exception as e:
             print(f"Error al cargar mapa desde backup: {e}")
@@ -53,6 +163,293 @@ class CityMap:
         print("Usando mapa por defecto")
         return True
 
+    def load_cqmap(self, path) -> None:
+        """
+        Carga un .cqmap: las capas tiles/blocked quedan apuntando al mmap
+        (solo lectura, compartido entre procesos).
+        """
+        f = CQMapFile(path)
+        tiles = f.layer("tiles")
+        if tiles is None or len(tiles) != f.width * f.height:
+            f.close()
+            raise CQMapError("El .cqmap no contiene una capa de tiles válida")
+        meta = f.meta
+        chars = [str(c) for c in meta.get("codes", [])]
+
+        self.close_cqmap()
+        self._cqmap = f
+        self._chars = chars
+        self._codes = {ch: i for i, ch in enumerate(chars)}
+        self.legend = meta.get("legend") or self.legend
+        self.version = f.map_version
+        self.goal = meta.get("goal", self.goal)
+        self.width = f.width
+        self.height = f.height
+        if self._should_chunk(f.width, f.height):
+            # El mmap es la fuente de los chunks: queda abierto mientras se use
+            self._use_chunks(BufferChunkSource(tiles, f.width, f.height))
+        else:
+            self._drop_chunks()
+            self.grid = tiles
+            blocked = f.layer("blocked")
+            if blocked is not None and len(blocked) == len(tiles):
+                self.blocked = blocked
+            else:
+                self._rebuild_blocked()
+        self._tiles_view = None
+        self._invalidate_derived()
+        self._publish_edit((0, 0, self.width - 1, self.height - 1))
+
+    def save_cqmap(self, path=None) -> bool:
+        try:
+            save_city_cqmap(self, path or self.map_binary_file)
+            return True
+        except Exception as e:
+            print(f"Error al guardar mapa .cqmap: {e}")
+            return False
+
+    # ---------- Edición de tiles ----------
+    def subscribe_edits(self, callback: Callable[[Tuple[int, int, int, int], int], None]):
+        """callback(rect, map_version) tras cada edición; rect = (x0, y0, x1, y1) inclusivo."""
+        if callback not in self._edit_listeners:
+            self._edit_listeners.append(callback)
+
+    def unsubscribe_edits(self, callback):
+        try:
+            self._edit_listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def edits_since(self, version: int) -> Optional[List[Tuple[int, int, int, int]]]:
+        """Rectángulos editados después de `version`; None si el registro ya no alcanza."""
+        if version >= self.map_version:
+            return []
+        log = self._edit_log
+        if not log or log[0][0] > version + 1:
+            return None
+        return [rect for v, rect in log if v > version]
+
+    def edits_touch(self, version: int, cells: Iterable[Tuple[int, int]]) -> bool:
+        """True si alguna edición posterior a `version` toca alguna de las celdas."""
+        rects = self.edits_since(version)
+        if rects is None:
+            return True
+        if not rects:
+            return False
+        for cx, cy in cells:
+            for x0, y0, x1, y1 in rects:
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    return True
+        return False
+
+    def set_tile(self, x: int, y: int, tile: str) -> bool:
+        return self.set_tiles([(x, y, tile)]) > 0
+
+    def set_tiles(self, edits: Iterable[Tuple[int, int, str]]) -> int:
+        """
+        Cambia tiles puntuales (cierres de calle, obras, etc.). Actualiza la
+        grilla, repara solo la zona afectada de las capas derivadas y publica
+        el rectángulo sucio. Retorna cuántos tiles cambiaron.
+        """
+        W, H = self.width, self.height
+        changes = {}
+        for x, y, tile in edits:
+            x, y = int(x), int(y)
+            if 0 <= x < W and 0 <= y < H:
+                changes[y * W + x] = self.tile_code(str(tile))
+        changes = {i: c for i, c in changes.items() if self.grid[i] != c}
+        if not changes:
+            return 0
+
+        self._ensure_writable()
+        xs = [i % W for i in changes]
+        ys = [i // W for i in changes]
+        rect = (min(xs), min(ys), max(xs), max(ys))
+
+        # Las fachadas dependen de los vecinos: revisar el rectángulo +1
+        x0, y0 = max(0, rect[0] - 1), max(0, rect[1] - 1)
+        x1, y1 = min(W - 1, rect[2] + 1), min(H - 1, rect[3] + 1)
+        region = [y * W + x for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+        old_facade = {i for i in region if is_facade(self.blocked, W, H, i)}
+        street = self._codes.get("C")
+        old_street = {i for i in changes if self.grid[i] == street}
+
+        wall = self._codes.get(WALL_TILE)
+        for i, code in changes.items():
+            self.grid[i] = code
+            self.blocked[i] = 1 if code == wall else 0
+        if self._tiles_view is not None:
+            for y in range(rect[1], rect[3] + 1):
+                self._tiles_view.invalidate_row(y)
+
+        new_facade = {i for i in region if is_facade(self.blocked, W, H, i)}
+        new_street = {i for i in changes if self.grid[i] == street}
+        self._repair_derived("near_facade", new_facade - old_facade, old_facade - new_facade,
+                             lambda i: is_facade(self.blocked, W, H, i))
+        self._repair_derived("near_street", new_street - old_street, old_street - new_street,
+                             lambda i: self.grid[i] == street)
+
+        self._content_hash = None
+        self._publish_edit(rect)
+        return len(changes)
+
+    def _ensure_writable(self):
+        """La grilla mapeada desde .cqmap es de solo lectura: copiarla antes de editar."""
+        if self._chunks is not None:
+            # Los chunks editados se copian y fijan en memoria (ChunkedGrid._writable)
+            return
+        if not isinstance(self.grid, bytearray):
+            self.grid = bytearray(self.grid)
+        if not isinstance(self.blocked, bytearray):
+            self.blocked = bytearray(self.blocked)
+        self.close_cqmap()
+
+    def _repair_derived(self, name: str, added, removed, is_feature):
+        layer = self._derived.get(name)
+        if layer is None or not (added or removed):
+            return
+        if not isinstance(layer, array):
+            copy = array("i")
+            copy.frombytes(memoryview(layer).cast("B"))
+            layer = copy
+            self._derived[name] = layer
+        _, build = DERIVED_LAYERS[name]
+        update_nearest_feature(layer, is_feature, self.width, self.height,
+                               added=sorted(added), removed=sorted(removed),
+                               rebuild=lambda: build(self))
+
+    def _publish_edit(self, rect: Tuple[int, int, int, int]):
+        self.map_version += 1
+        self._edit_log.append((self.map_version, rect))
+        for cb in list(self._edit_listeners):
+            try:
+                cb(rect, self.map_version)
+            except Exception as e:
+                print(f"Error notificando edición de mapa: {e}")
+
+    def content_hash(self) -> str:
+        """Hash del contenido (dimensiones, tiles, leyenda); clave de los precálculos."""
+        if self._content_hash is None:
+            self._content_hash = map_content_hash(self)
+        return self._content_hash
+
+    def derived_layer(self, name: str):
+        """
+        Capa derivada del mapa (ver precompute.DERIVED_LAYERS), indexada por
+        y * width + x. Se busca en memoria, luego en la caché de disco y solo
+        si falta se calcula. None en mapas por chunks (serían del tamaño del mapa).
+        """
+        if self._chunks is not None:
+            return None
+        layer = self._derived.get(name)
+        if layer is not None:
+            return layer
+        kind, build = DERIVED_LAYERS[name]
+        with self._derived_lock:
+            layer = self._derived.get(name)
+            if layer is not None:
+                return layer
+            cache = self._get_precompute_cache()
+            if cache is None:
+                layer = build(self)
+            else:
+                layer = cache.get_layer(self.content_hash(), name, kind,
+                                        lambda: build(self), self.width, self.height)
+            self._derived[name] = layer
+            return layer
+
+    def _get_precompute_cache(self) -> Optional[PrecomputeCache]:
+        files = self.config.get("files", {}) if isinstance(self.config, dict) else {}
+        if not files.get("precompute_cache", True):
+            return None
+        if self._precompute is None:
+            try:
+                base = Path(files.get("cache_directory", "api_cache")) / "precompute"
+                self._precompute = PrecomputeCache(
+                    str(base),
+                    max_size_mb=float(files.get("precompute_max_mb", 64)),
+                    max_age_days=float(files.get("precompute_max_age_days", 30)),
+                )
+            except Exception as e:
+                print(f"Caché de precálculos deshabilitada: {e}")
+                files["precompute_cache"] = False
+                return None
+        return self._precompute
+
+    def close_precompute(self):
+        """Suelta las capas derivadas y cierra la caché de precálculos (escribe su índice)."""
+        self._derived = {}
+        if self._precompute is not None:
+            self._precompute.close()
+            self._precompute = None
+
+    def _invalidate_derived(self):
+        self._content_hash = None
+        self._derived = {}
+
+    # ---------- Chunks ----------
+    @property
+    def is_chunked(self) -> bool:
+        return self._chunks is not None
+
+    def prefetch_around(self, points: Iterable[Tuple[float, float]]) -> int:
+        """Carga por adelantado los chunks cerca de jugador/IA (no-op si no hay chunks)."""
+        if self._chunks is None:
+            return 0
+        files = self.config.get("files", {})
+        radius = int(files.get("chunk_prefetch_radius", self._chunks.chunk_size))
+        budget = int(files.get("chunk_prefetch_budget", 4))
+        return self._chunks.prefetch(points, radius, budget)
+
+    def sample_row(self, y: int, x0: int, x1: int, step: int = 1) -> bytes:
+        """Códigos de la fila y en [x0, x1) cada `step` tiles; con chunks no toca el LRU."""
+        if self._chunks is not None:
+            return self._chunks.sample_row(y, x0, x1, step)
+        base = y * self.width
+        return bytes(self.grid[base + x0:base + x1:step])
+
+    def chunk_stats(self) -> Dict[str, int]:
+        return self._chunks.stats() if self._chunks is not None else {}
+
+    def _should_chunk(self, width: int, height: int) -> bool:
+        files = self.config.get("files", {}) if isinstance(self.config, dict) else {}
+        threshold = int(files.get("chunked_tiles_min", 4_000_000))
+        return threshold > 0 and width * height >= threshold
+
+    def _use_chunks(self, source):
+        files = self.config.get("files", {}) if isinstance(self.config, dict) else {}
+        self.tile_code(WALL_TILE)  # el código de pared debe existir antes del primer chunk
+        old = self._chunks
+        self._chunks = ChunkedGrid(
+            source, self._blocked_table(),
+            chunk_size=int(files.get("chunk_size", 64)),
+            max_resident=int(files.get("max_resident_chunks", 256)),
+        )
+        self.grid = self._chunks.codes
+        self.blocked = self._chunks.blocked
+        if old is not None:
+            old.close()
+
+    def _drop_chunks(self):
+        if self._chunks is not None:
+            old, self._chunks = self._chunks, None
+            old.close()
+
+    def close_cqmap(self):
+        if self._cqmap is not None:
+            self._cqmap.close()
+            self._cqmap = None
+
+    def _cqmap_is_fresh(self) -> bool:
+        try:
+            if not self.map_binary_file.exists():
+                return False
+            if not self.map_backup_file.exists():
+                return True
+            return self.map_binary_file.stat().st_mtime >= self.map_backup_file.stat().st_mtime
+        except Exception:
+            return False
+
     def _load_json(self, filepath: str) -> Dict[str, Any]:
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
@@ -62,6 +459,50 @@ class CityMap:
 
 
 
+    # ---------- Grilla compacta ----------
+    @property
+    def tiles(self) -> TileGridView:
+        """Vista compatible tiles[y][x] -> str. Asignar una lista de filas reemplaza la grilla."""
+        if self._tiles_view is None:
+            self._tiles_view = TileGridView(self)
+        return self._tiles_view
+
+    @tiles.setter
+    def tiles(self, rows: Iterable[Iterable[str]]):
+        self._set_tiles(rows)
+
+    @property
+    def legend(self) -> Dict[str, Any]:
+        return self._legend
+
+    @legend.setter
+    def legend(self, value: Dict[str, Any]):
+        self._legend = dict(value or {})
+        self._rebuild_weight_lut()
+        self._invalidate_derived()
+
+    def tiles_as_lists(self) -> List[List[str]]:
+        """Copia en el formato original (lista de listas) para guardar/exportar."""
+        return [list(row) for row in self.tiles]
+
+    def tile_code(self, ch: str) -> int:
+        """Código de byte para un tile; se registra si es nuevo."""
+        code = self._codes.get(ch)
+        if code is None:
+            code = len(self._chars)
+            if code > 255:
+                raise ValueError("Demasiados tipos de tile distintos (máx. 256)")
+            self._codes[ch] = code
+            self._chars.append(ch)
+            self._weight_lut[code] = self._legend_weight(ch)
+        return code
+
+    def is_blocked_cell(self, ix: int, iy: int) -> bool:
+        """Como is_wall pero para índices enteros (sin conversión)."""
+        if ix < 0 or iy < 0 or ix >= self.width or iy >= self.height:
+            return True
+        return self.blocked[iy * self.width + ix] == 1
+
     def is_wall(self, x: float, y: float) -> bool:
         ix, iy = int(x), int(y)
 
@@ -69,9 +510,7 @@ class CityMap:
         if ix < 0 or iy < 0 or ix >= self.width or iy >= self.height:
             return True
 
-        # Verificar si el tile es un edificio (pared)
-        tile_type = self.tiles[iy][ix]
-        return tile_type == "B"
+        return self.blocked[iy * self.width + ix] == 1
 
     def get_surface_weight(self, x: float, y: float) -> float:
         ix, iy = int(x), int(y)
@@ -80,10 +519,7 @@ class CityMap:
         if ix < 0 or iy < 0 or ix >= self.width or iy >= self.height:
             return 1.0
 
-        tile_type = self.tiles[iy][ix]
-        tile_info = self.legend.get(tile_type, {"surface_weight": 1.0})
-
-        return tile_info.get("surface_weight", 1.0)
+        return self._weight_lut[self.grid[iy * self.width + ix]]
 
     def get_spawn_position(self) -> Tuple[float, float]:
 
@@ -109,21 +545,25 @@ class CityMap:
             map_data = map_data["data"]
 
         self.version = map_data.get("version", "1.0")
-        self.width = map_data.get("width", 0)
-        self.height = map_data.get("height", 0)
-        self.tiles = map_data.get("tiles", [])
+        width = map_data.get("width", 0)
+        height = map_data.get("height", 0)
+        tiles = map_data.get("tiles", [])
         self.goal = map_data.get("goal", 3000)
 
         # Actualizar leyenda si está presente
         if "legend" in map_data:
-            self.legend.update(map_data["legend"])
+            legend = dict(self.legend)
+            legend.update(map_data["legend"])
+            self.legend = legend
 
         # Validar datos
-        if self.height != len(self.tiles):
-            raise ValueError(f"Altura del mapa ({self.height}) no coincide con número de filas ({len(self.tiles)})")
+        if height != len(tiles):
+            raise ValueError(f"Altura del mapa ({height}) no coincide con número de filas ({len(tiles)})")
 
-        if self.tiles and self.width != len(self.tiles[0]):
-            raise ValueError(f"Ancho del mapa ({self.width}) no coincide con número de columnas ({len(self.tiles[0])})")
+        if tiles and width != len(tiles[0]):
+            raise ValueError(f"Ancho del mapa ({width}) no coincide con número de columnas ({len(tiles[0])})")
+
+        self.tiles = tiles
 
 
 
@@ -134,7 +574,7 @@ class CityMap:
         self.goal = 3000
 
         # Crear mapa simple con calles y algunos edificios
-        self.tiles = []
+        tiles = []
         for y in range(self.height):
             row = []
             for x in range(self.width):
@@ -150,13 +590,14 @@ class CityMap:
                 # Resto son calles
                 else:
                     row.append("C")
-            self.tiles.append(row)
+            tiles.append(row)
+        self.tiles = tiles
 
 
 
     def get_tile_at(self, x: int, y: int) -> str:
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.tiles[y][x]
+            return self._chars[self.grid[y * self.width + x]]
         return "B"  # Fuera de límites se considera pared
 
     def is_valid_position(self, x: float, y: float) -> bool:
@@ -174,3 +615,86 @@ class CityMap:
             "available_pickups": len(self.pickup_points),
             "available_dropoffs": len(self.dropoff_points)
         }
+
+    # ---------- helpers privados ----------
+    def _set_tiles(self, rows: Iterable[Iterable[str]]):
+        rows = [row for row in (rows or [])]
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        if self._should_chunk(width, height):
+            for y, row in enumerate(rows):
+                if len(row) != width:
+                    raise ValueError(f"Fila {y} con ancho {len(row)} (esperado {width})")
+            # Los chunks se decodifican desde las filas del payload cuando se piden
+            self.width = width
+            self.height = height
+            self._use_chunks(RowsChunkSource(rows, width, self.tile_code))
+            self._tiles_view = None
+            self._invalidate_derived()
+            self.close_cqmap()
+            self._publish_edit((0, 0, width - 1, height - 1))
+            return
+        self._drop_chunks()
+        grid = bytearray(width * height)
+        code_of = self.tile_code
+        cache: Dict[str, int] = {}
+        for y, row in enumerate(rows):
+            if len(row) != width:
+                raise ValueError(f"Fila {y} con ancho {len(row)} (esperado {width})")
+            base = y * width
+            for x, ch in enumerate(row):
+                code = cache.get(ch)
+                if code is None:
+                    code = cache[ch] = code_of(ch)
+                grid[base + x] = code
+        self.width = width
+        self.height = height
+        self.grid = grid
+        self._rebuild_blocked()
+        self._tiles_view = None
+        self._invalidate_derived()
+        self.close_cqmap()
+        self._publish_edit((0, 0, width - 1, height - 1))
+
+    def _blocked_table(self) -> bytes:
+        table = bytearray(256)
+        wall = self._codes.get(WALL_TILE)
+        if wall is not None:
+            table[wall] = 1
+        return bytes(table)
+
+    def _rebuild_blocked(self):
+        if self._chunks is not None:
+            self._chunks.set_blocked_table(self._blocked_table())
+            return
+        wall = self._codes.get(WALL_TILE)
+        if wall is None:
+            self.blocked = bytearray(len(self.grid))
+            return
+        # Tabla de traducción código -> 0/1 (bytes.translate corre en C)
+        table = bytearray(256)
+        table[wall] = 1
+        grid = self.grid if isinstance(self.grid, (bytes, bytearray)) else bytes(self.grid)
+        self.blocked = bytearray(grid.translate(table))
+
+    def _legend_weight(self, ch: str) -> float:
+        info = self._legend.get(ch, {"surface_weight": 1.0})
+        try:
+            return float(info.get("surface_weight", 1.0))
+        except Exception:
+            return 1.0
+
+    def _rebuild_weight_lut(self):
+        for code, ch in enumerate(self._chars):
+            self._weight_lut[code] = self._legend_weight(ch)
+
+    def _build_row(self, y: int):
+        if self._chunks is not None:
+            return ChunkedRow(self, y)
+        chars = self._chars
+        w = self.width
+        row = [chars[c] for c in self.grid[y * w:(y + 1) * w]]
+        # Filas de tiles de un caracter como str (1 byte por tile en CPython)
+        if all(len(ch) == 1 for ch in chars):
+            return "".join(row)
+        return row
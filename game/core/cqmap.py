@@ -0,0 +1,185 @@
+"""
+Contenedor binario .cqmap para mapas de ciudad.
+
+Estructura (little-endian):
+    cabecera   : MAGIC(6) | formato u16 | ancho u32 | alto u32 | n_capas u32 | meta_len u32
+    meta       : JSON utf-8 (versión del mapa, goal, leyenda, tabla código -> tile)
+    tabla      : n_capas x [nombre 16s | tipo 1s | pad 3x | offset u64 | bytes u64 | crc32 u32 | pad 4x]
+    datos      : capas alineadas a 8 bytes
+
+Las capas se leen vía mmap (solo lectura), así varios procesos comparten una
+sola copia física. Capas estándar: "tiles" (u8, código por tile) y "blocked"
+(u8). Otras capas derivadas (distancias, calles cercanas, puertas) se agregan
+con el mismo mecanismo.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+MAGIC = b"CQMAP\x00"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<6sHIIII")
+_LAYER = struct.Struct("<16ss3xQQI4x")
+_ALIGN = 8
+
+# tipo -> formato de memoryview.cast
+LAYER_TYPES = {"B": "B", "H": "H", "i": "i", "I": "I", "f": "f"}
+
+
+class CQMapError(Exception):
+    pass
+
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+
+def write_cqmap(path, width: int, height: int, meta: Dict[str, Any],
+                layers: Iterable[Tuple[str, str, Any]]) -> Path:
+    """
+    Escribe un .cqmap. `layers` = [(nombre, tipo, buffer)], con buffer cualquier
+    objeto que soporte el protocolo de buffer (bytearray, array, memoryview).
+    Se escribe a un archivo temporal y se reemplaza de forma atómica.
+    """
+    path = Path(path)
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    items = []
+    for name, kind, buf in layers:
+        if kind not in LAYER_TYPES:
+            raise CQMapError(f"Tipo de capa no soportado: {kind}")
+        raw = memoryview(buf).cast("B")
+        items.append((name.encode("ascii")[:16], kind.encode("ascii"), raw))
+
+    offset = _HEADER.size + len(meta_bytes) + _LAYER.size * len(items)
+    offset += _pad(offset)
+    table = []
+    for name, kind, raw in items:
+        table.append((name, kind, offset, raw.nbytes, zlib.crc32(raw) & 0xFFFFFFFF))
+        offset += raw.nbytes + _pad(raw.nbytes)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, int(width), int(height), len(items), len(meta_bytes)))
+        f.write(meta_bytes)
+        for entry in table:
+            f.write(_LAYER.pack(*entry))
+        f.write(b"\x00" * _pad(f.tell()))
+        for (_, _, raw), entry in zip(items, table):
+            f.write(raw)
+            f.write(b"\x00" * _pad(raw.nbytes))
+    os.replace(tmp, path)
+    return path
+
+
+class CQMapFile:
+    """
+    Lector de .cqmap sobre mmap. layer(nombre) retorna un memoryview tipado
+    que apunta directo al archivo mapeado (sin copiar). Con verify=True el
+    checksum de cada capa se valida la primera vez que se accede a ella.
+    """
+    def __init__(self, path, verify: bool = True):
+        self.path = Path(path)
+        self.verify = bool(verify)
+        self._verified = set()
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mm)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self):
+        view = self._view
+        if len(view) < _HEADER.size:
+            raise CQMapError("Archivo .cqmap truncado")
+        magic, fmt, width, height, n_layers, meta_len = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise CQMapError("No es un archivo .cqmap")
+        if fmt != FORMAT_VERSION:
+            raise CQMapError(f"Formato .cqmap {fmt} no soportado")
+        self.width = width
+        self.height = height
+        pos = _HEADER.size
+        self.meta: Dict[str, Any] = json.loads(bytes(view[pos:pos + meta_len]).decode("utf-8"))
+        pos += meta_len
+        self._layers: Dict[str, Tuple[str, int, int, int]] = {}
+        for _ in range(n_layers):
+            name, kind, offset, nbytes, crc = _LAYER.unpack_from(view, pos)
+            pos += _LAYER.size
+            name = name.rstrip(b"\x00").decode("ascii")
+            if offset + nbytes > len(view):
+                raise CQMapError(f"Capa '{name}' fuera de rango")
+            self._layers[name] = (kind.decode("ascii"), offset, nbytes, crc)
+
+    @property
+    def map_version(self) -> str:
+        return str(self.meta.get("version", "1.0"))
+
+    def has_layer(self, name: str) -> bool:
+        return name in self._layers
+
+    def layer_names(self):
+        return list(self._layers.keys())
+
+    def layer(self, name: str) -> Optional[memoryview]:
+        entry = self._layers.get(name)
+        if entry is None:
+            return None
+        kind, offset, nbytes, crc = entry
+        raw = self._view[offset:offset + nbytes]
+        if self.verify and name not in self._verified:
+            if zlib.crc32(raw) & 0xFFFFFFFF != crc:
+                raise CQMapError(f"Checksum inválido en capa '{name}'")
+            self._verified.add(name)
+        return raw.cast(LAYER_TYPES[kind])
+
+    def layer_kind(self, name: str) -> Optional[str]:
+        entry = self._layers.get(name)
+        return entry[0] if entry else None
+
+    def close(self):
+        # Los memoryview exportados deben liberarse antes de cerrar el mmap
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError as e:
+            # Alguien conserva una capa: el mapeo sigue vivo hasta que la suelte
+            print(f"[CQMap] {self.path.name} sigue mapeado (capas en uso): {e}")
+        except Exception as e:
+            print(f"[CQMap] Error al cerrar {self.path.name}: {e}")
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+
+def city_meta(city) -> Dict[str, Any]:
+    return {
+        "version": str(getattr(city, "version", "1.0")),
+        "goal": getattr(city, "goal", 3000),
+        "legend": getattr(city, "legend", {}),
+        "codes": list(getattr(city, "_chars", [])),
+    }
+
+
+def save_city_cqmap(city, path, extra_layers: Iterable[Tuple[str, str, Any]] = ()) -> Path:
+    """Escribe la grilla compacta de un CityMap (y capas extra opcionales)."""
+    grid, blocked = city.grid, city.blocked
+    if hasattr(grid, "tobytes") and not isinstance(grid, (bytes, bytearray, memoryview)):
+        # Capas por chunks (game.core.chunks): se materializan solo para escribir
+        grid, blocked = grid.tobytes(), blocked.tobytes()
+    layers = [("tiles", "B", grid), ("blocked", "B", blocked)]
+    layers.extend(extra_layers)
+    return write_cqmap(path, city.width, city.height, city_meta(city), layers)
@@ -1,33 +1,74 @@
-from typing import List, Optional, Dict, Any
+import itertools
+from bisect import bisect_left
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from game.core.orders import Order
 
 
 class Inventory:
     """
     Modelo de inventario (dominio). Sin responsabilidades de UI.
+    - Mantiene dos órdenes a la vez (prioridad y deadline) con inserción bisect;
+      `orders` apunta al del `sort_mode` activo, así cambiar de modo es O(1).
+    - El peso por estado se lleva en totales acumulados: los pedidos avisan al
+      inventario cuando cambian de estado (ver Order.status).
     """
     def __init__(self, max_weight: float = 10.0):
         self.max_weight = max_weight
-        self.orders: List[Order] = []
         self.current_index = 0
-        self.sort_mode = "priority"  # 'priority' | 'deadline'
+
+        self._seq = itertools.count()
+        self._by_id: Dict[str, Order] = {}
+        self._keys: Dict[str, Tuple[tuple, tuple]] = {}
+        self._priority_keys: List[tuple] = []
+        self._priority_orders: List[Order] = []
+        self._deadline_keys: List[tuple] = []
+        self._deadline_orders: List[Order] = []
+        self._weight_by_status: Dict[str, float] = {}
+        self._count_by_status: Dict[str, int] = {}
+
+        self._sort_mode = "priority"  # 'priority' | 'deadline'
+
+    # ---------- Vistas ----------
+    @property
+    def orders(self) -> List[Order]:
+        """Lista ordenada según sort_mode. Para modificarla usar la API del inventario."""
+        return self._priority_orders if self._sort_mode == "priority" else self._deadline_orders
+
+    @orders.setter
+    def orders(self, items: Iterable[Order]):
+        self.load_orders(items)
+
+    @property
+    def sort_mode(self) -> str:
+        return self._sort_mode
+
+    @sort_mode.setter
+    def sort_mode(self, mode: str):
+        self._sort_mode = "deadline" if mode == "deadline" else "priority"
 
     @property
     def current_weight(self) -> float:
         # SOLO cuenta el peso de pedidos recogidos
-        return sum(float(getattr(order, "weight", 0.0)) for order in self.orders
-                   if getattr(order, "status", "") == "picked_up")
+        self._ensure_consistent()
+        return self._weight_by_status.get("picked_up", 0.0)
+
+    def weight_by_status(self, status: str) -> float:
+        self._ensure_consistent()
+        return self._weight_by_status.get(status, 0.0)
 
     @property
     def can_add_more(self) -> bool:
         return self.current_weight < self.max_weight
 
+    # ---------- Altas / bajas ----------
     def add_order(self, order: Order) -> bool:
         try:
-            # Nota: el peso de in_progress NO debe contar, current_weight ya filtra.
+            # Nota: el peso de in_progress NO debe contar, current_weight solo suma picked_up.
+            if order.id in self._by_id:
+                return False
             if self.current_weight + float(getattr(order, "weight", 0.0)) <= self.max_weight:
                 order.status = "in_progress"
-                self.orders.append(order)
+                self._insert(order)
                 self.sort_orders()
                 return True
             else:
@@ -35,19 +76,66 @@ class Inventory:
         except Exception:
             return False
 
+    def insert_order(self, order: Order) -> bool:
+        """Inserta sin validar peso ni tocar el estado (restauraciones)."""
+        self._ensure_consistent()
+        if order.id in self._by_id:
+            return False
+        self._insert(order)
+        return True
+
+    def load_orders(self, items: Iterable[Order]):
+        """Reemplaza el contenido completo del inventario."""
+        self.clear()
+        for order in list(items):
+            if order.id not in self._by_id:
+                self._insert(order)
+
+    def clear(self):
+        for order in self._by_id.values():
+            self._detach(order)
+        self._by_id.clear()
+        self._keys.clear()
+        self._priority_keys.clear()
+        self._priority_orders.clear()
+        self._deadline_keys.clear()
+        self._deadline_orders.clear()
+        self._weight_by_status.clear()
+        self._count_by_status.clear()
+        self.current_index = 0
+
     def remove_order(self, order_id: str) -> Optional[Order]:
         try:
-            for i, order in enumerate(self.orders):
-                if order.id == order_id:
-                    return self.orders.pop(i)
-            return None
+            self._ensure_consistent()
+            order = self._by_id.pop(order_id, None)
+            if order is None:
+                return None
+            pkey, dkey = self._keys.pop(order_id)
+            i = bisect_left(self._priority_keys, pkey)
+            del self._priority_keys[i]
+            del self._priority_orders[i]
+            i = bisect_left(self._deadline_keys, dkey)
+            del self._deadline_keys[i]
+            del self._deadline_orders[i]
+            self._account(order.status, -float(getattr(order, "weight", 0.0)), -1)
+            self._detach(order)
+            return order
         except Exception:
             return None
 
+    def get_order(self, order_id: str) -> Optional[Order]:
+        self._ensure_consistent()
+        return self._by_id.get(order_id)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    # ---------- Navegación ----------
     def get_current_order(self) -> Optional[Order]:
-        if not self.orders:
+        orders = self.orders
+        if not orders:
             return None
-        return self.orders[self.current_index]
+        return orders[self.current_index]
 
     def next_order(self):
         if not self.orders:
@@ -60,29 +148,17 @@ class Inventory:
         self.current_index = (self.current_index - 1) % len(self.orders)
 
     def sort_by_priority(self):
-        try:
-            self.orders.sort(key=lambda x: x.priority, reverse=True)
-            self.sort_mode = "priority"
-            self.current_index = 0
-        except Exception:
-            pass
+        self.sort_mode = "priority"
+        self.current_index = 0
 
     def sort_by_deadline(self):
-        try:
-            self.orders.sort(key=lambda x: x.deadline)
-            self.sort_mode = "deadline"
-            self.current_index = 0
-        except Exception:
-            pass
+        self.sort_mode = "deadline"
+        self.current_index = 0
 
     def sort_orders(self):
-        try:
-            if self.sort_mode == "priority":
-                self.sort_by_priority()
-            elif self.sort_mode == "deadline":
-                self.sort_by_deadline()
-        except Exception:
-            pass
+        # Las dos vistas ya están ordenadas por _insert; como antes, la selección vuelve al primero
+        self._ensure_consistent()
+        self.current_index = 0
 
     def get_status(self) -> Dict[str, Any]:
         return {
@@ -91,4 +167,70 @@ class Inventory:
             "max_weight": self.max_weight,
             "sort_mode": self.sort_mode,
             "current_index": self.current_index,
-        }
\ No newline at end of file
+        }
+
+    # ---------- Notificación desde Order ----------
+    def _on_order_status(self, order: Order, old: str, new: str):
+        if self._by_id.get(order.id) is not order:
+            return
+        w = float(getattr(order, "weight", 0.0))
+        self._account(old, -w, -1)
+        self._account(new, w, 1)
+
+    # ---------- helpers privados ----------
+    @staticmethod
+    def _deadline_sort_value(order: Order):
+        d = getattr(order, "deadline", None)
+        return (d is None, str(d) if d is not None else "")
+
+    def _insert(self, order: Order):
+        seq = next(self._seq)
+        pkey = (-int(getattr(order, "priority", 0)), seq)
+        dkey = (self._deadline_sort_value(order), seq)
+
+        i = bisect_left(self._priority_keys, pkey)
+        self._priority_keys.insert(i, pkey)
+        self._priority_orders.insert(i, order)
+        i = bisect_left(self._deadline_keys, dkey)
+        self._deadline_keys.insert(i, dkey)
+        self._deadline_orders.insert(i, order)
+
+        self._by_id[order.id] = order
+        self._keys[order.id] = (pkey, dkey)
+        self._account(order.status, float(getattr(order, "weight", 0.0)), 1)
+        try:
+            order._owner = self
+        except AttributeError:
+            pass
+
+    def _detach(self, order: Order):
+        try:
+            if getattr(order, "_owner", None) is self:
+                order._owner = None
+        except AttributeError:
+            pass
+
+    def _account(self, status: str, weight: float, count: int):
+        n = self._count_by_status.get(status, 0) + count
+        if n <= 0:
+            # Sin pedidos en ese estado: reiniciar para no acumular error de redondeo
+            self._count_by_status.pop(status, None)
+            self._weight_by_status.pop(status, None)
+            return
+        self._count_by_status[status] = n
+        self._weight_by_status[status] = self._weight_by_status.get(status, 0.0) + weight
+
+    def _ensure_consistent(self):
+        """
+        Chequeo barato de largos: si alguien agregó o quitó pedidos de la lista
+        `orders` directamente (append/pop/clear), se reconstruyen los índices.
+        No detecta reemplazos en el lugar (orders[i] = x).
+        """
+        active = self.orders
+        if len(active) == len(self._by_id) and len(self._priority_orders) == len(self._deadline_orders):
+            return
+        items = list(active)
+        self._seq = itertools.count()
+        index = self.current_index
+        self.load_orders(items)
+        self.current_index = min(index, max(0, len(self.orders) - 1))
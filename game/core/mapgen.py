@@ -0,0 +1,257 @@
+"""
+Generador procedural de mapas y pedidos sintéticos (pruebas de escala).
+Produce el mismo esquema JSON que consumen CityMap._parse_map_data y
+OrdersManager (ciudad.json / pedidos.json).
+
+Uso:
+    python -m game.core.mapgen --width 200 --height 200 --orders 5000 --seed 7 --out-dir data
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LEGEND = {
+    "C": {"name": "calle", "surface_weight": 1.00},
+    "B": {"name": "edificio", "blocked": True},
+    "P": {"name": "parque", "surface_weight": 0.95},
+}
+
+
+class MapGenerator:
+    """
+    Ciudad en manzanas: una grilla irregular de calles (anchos 1-2), manzanas
+    de edificios con callejones ocasionales y algunas manzanas convertidas en
+    parque. El borde siempre es edificio. Determinista para una misma semilla.
+    """
+    def __init__(self, width: int, height: int, seed: Optional[int] = None,
+                 block_min: int = 3, block_max: int = 7,
+                 park_ratio: float = 0.08, alley_ratio: float = 0.15,
+                 wide_street_ratio: float = 0.1):
+        if width < 5 or height < 5:
+            raise ValueError("El mapa debe ser de al menos 5x5")
+        self.width = int(width)
+        self.height = int(height)
+        self.rng = random.Random(seed)
+        self.block_min = max(1, int(block_min))
+        self.block_max = max(self.block_min, int(block_max))
+        self.park_ratio = float(park_ratio)
+        self.alley_ratio = float(alley_ratio)
+        self.wide_street_ratio = float(wide_street_ratio)
+
+    def generate_tiles(self) -> List[List[str]]:
+        w, h = self.width, self.height
+        street_cols = self._street_lines(w)
+        street_rows = self._street_lines(h)
+
+        tiles = [["B"] * w for _ in range(h)]
+        for y in range(1, h - 1):
+            row = tiles[y]
+            if y in street_rows:
+                for x in range(1, w - 1):
+                    row[x] = "C"
+            else:
+                for x in street_cols:
+                    row[x] = "C"
+
+        # Manzanas: parques y callejones
+        xs = [0] + sorted(street_cols) + [w - 1]
+        ys = [0] + sorted(street_rows) + [h - 1]
+        for y0, y1 in zip(ys, ys[1:]):
+            for x0, x1 in zip(xs, xs[1:]):
+                bx0, bx1, by0, by1 = x0 + 1, x1 - 1, y0 + 1, y1 - 1
+                if bx0 > bx1 or by0 > by1:
+                    continue
+                roll = self.rng.random()
+                if roll < self.park_ratio:
+                    for y in range(by0, by1 + 1):
+                        for x in range(bx0, bx1 + 1):
+                            tiles[y][x] = "P"
+                elif roll < self.park_ratio + self.alley_ratio and (bx1 - bx0) >= 2:
+                    ax = self.rng.randint(bx0 + 1, bx1 - 1)
+                    for y in range(by0, by1 + 1):
+                        tiles[y][ax] = "C"
+        return tiles
+
+    def generate_map(self, goal: int = 3000) -> Dict[str, Any]:
+        return {
+            "version": "1.0",
+            "width": self.width,
+            "height": self.height,
+            "goal": int(goal),
+            "tiles": self.generate_tiles(),
+            "legend": dict(DEFAULT_LEGEND),
+        }
+
+    # --------- helpers privados ---------
+    def _street_lines(self, size: int) -> set:
+        lines = set()
+        pos = 1 + self.rng.randint(0, self.block_min)
+        while pos < size - 1:
+            lines.add(pos)
+            if self.rng.random() < self.wide_street_ratio and pos + 1 < size - 1:
+                pos += 1
+                lines.add(pos)
+            pos += self.rng.randint(self.block_min, self.block_max) + 1
+        if not lines:
+            lines.add(size // 2)
+        return lines
+
+
+class OrderGenerator:
+    """
+    Pedidos sintéticos sobre un mapa ya generado. Pickup y dropoff se ubican
+    en calles junto a una fachada (como los del API); pesos, prioridades y
+    deadlines siguen las distribuciones configuradas.
+    """
+    def __init__(self, tiles: Sequence[Sequence[str]], seed: Optional[int] = None,
+                 weight_range: Tuple[int, int] = (1, 5),
+                 priority_weights: Optional[Dict[int, float]] = None,
+                 deadline_minutes: Tuple[float, float] = (5.0, 20.0),
+                 payout_per_tile: float = 8.0, payout_base: float = 40.0,
+                 release_step: int = 30):
+        self.tiles = tiles
+        self.rng = random.Random(seed)
+        self.weight_range = (int(weight_range[0]), int(weight_range[1]))
+        self.priority_weights = priority_weights or {0: 0.7, 1: 0.2, 2: 0.1}
+        self.deadline_minutes = (float(deadline_minutes[0]), float(deadline_minutes[1]))
+        self.payout_per_tile = float(payout_per_tile)
+        self.payout_base = float(payout_base)
+        self.release_step = int(release_step)
+        self._spots = self._facade_streets()
+        if not self._spots:
+            raise ValueError("El mapa no tiene calles junto a edificios")
+
+    def generate(self, count: int, start: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        start = start or datetime.now(timezone.utc)
+        priorities = list(self.priority_weights.keys())
+        prio_w = list(self.priority_weights.values())
+        orders = []
+        for i in range(int(count)):
+            pickup = self.rng.choice(self._spots)
+            dropoff = self.rng.choice(self._spots)
+            while dropoff == pickup and len(self._spots) > 1:
+                dropoff = self.rng.choice(self._spots)
+            dist = abs(pickup[0] - dropoff[0]) + abs(pickup[1] - dropoff[1])
+            minutes = self.rng.uniform(*self.deadline_minutes)
+            deadline = start + timedelta(minutes=minutes)
+            orders.append({
+                "id": f"GEN-{i:06d}",
+                "pickup": [pickup[0], pickup[1]],
+                "dropoff": [dropoff[0], dropoff[1]],
+                "payout": round(self.payout_base + dist * self.payout_per_tile * self.rng.uniform(0.8, 1.2), 2),
+                "deadline": deadline.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "weight": self.rng.randint(*self.weight_range),
+                "priority": self.rng.choices(priorities, weights=prio_w, k=1)[0],
+                "release_time": i * self.release_step,
+            })
+        return orders
+
+    def _facade_streets(self) -> List[Tuple[int, int]]:
+        tiles = self.tiles
+        h = len(tiles)
+        w = len(tiles[0]) if h else 0
+        spots = []
+        for y in range(1, h - 1):
+            row = tiles[y]
+            for x in range(1, w - 1):
+                if row[x] != "C":
+                    continue
+                if tiles[y - 1][x] == "B" or tiles[y + 1][x] == "B" or row[x - 1] == "B" or row[x + 1] == "B":
+                    spots.append((x, y))
+        return spots
+
+
+def write_city_cqmap(city: Dict[str, Any], path) -> Path:
+    """Escribe el mapa generado en formato .cqmap (ver game.core.cqmap)."""
+    from game.core.cqmap import write_cqmap
+
+    codes = sorted({ch for row in city["tiles"] for ch in row})
+    code_of = {ch: i for i, ch in enumerate(codes)}
+    grid = bytearray(city["width"] * city["height"])
+    blocked = bytearray(len(grid))
+    i = 0
+    for row in city["tiles"]:
+        for ch in row:
+            grid[i] = code_of[ch]
+            blocked[i] = 1 if ch == "B" else 0
+            i += 1
+    meta = {"version": city["version"], "goal": city["goal"], "legend": city["legend"], "codes": codes}
+    return write_cqmap(path, city["width"], city["height"], meta,
+                       [("tiles", "B", grid), ("blocked", "B", blocked)])
+
+
+def _parse_priority_weights(text: str) -> Dict[int, float]:
+    """'0:0.7,1:0.2,2:0.1' -> {0: 0.7, 1: 0.2, 2: 0.1}"""
+    out = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        k, v = part.split(":")
+        out[int(k)] = float(v)
+    return out
+
+
+def _parse_range(text: str, cast=float) -> Tuple[Any, Any]:
+    lo, hi = text.split(",")
+    lo, hi = cast(lo), cast(hi)
+    return (lo, hi) if lo <= hi else (hi, lo)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Genera ciudad.json y pedidos.json sintéticos")
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--height", type=int, default=100)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out-dir", default="data")
+    parser.add_argument("--map-file", default="ciudad.json")
+    parser.add_argument("--orders-file", default="pedidos.json")
+    parser.add_argument("--goal", type=int, default=3000)
+    parser.add_argument("--block-size", default="3,7", help="min,max de la manzana")
+    parser.add_argument("--park-ratio", type=float, default=0.08)
+    parser.add_argument("--alley-ratio", type=float, default=0.15)
+    parser.add_argument("--weights", default="1,5", help="min,max del peso")
+    parser.add_argument("--priorities", default="0:0.7,1:0.2,2:0.1", help="prioridad:probabilidad,...")
+    parser.add_argument("--deadline-minutes", default="5,20", help="min,max en minutos")
+    parser.add_argument("--release-step", type=int, default=30)
+    parser.add_argument("--cqmap", action="store_true", help="escribir también la copia binaria .cqmap")
+    args = parser.parse_args(argv)
+
+    block_min, block_max = _parse_range(args.block_size, int)
+    gen = MapGenerator(args.width, args.height, seed=args.seed,
+                       block_min=block_min, block_max=block_max,
+                       park_ratio=args.park_ratio, alley_ratio=args.alley_ratio)
+    city = gen.generate_map(goal=args.goal)
+
+    order_seed = None if args.seed is None else args.seed + 1
+    orders = OrderGenerator(
+        city["tiles"], seed=order_seed,
+        weight_range=_parse_range(args.weights, int),
+        priority_weights=_parse_priority_weights(args.priorities),
+        deadline_minutes=_parse_range(args.deadline_minutes, float),
+        release_step=args.release_step,
+    ).generate(args.orders)
+
+    out = Path(args.out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    map_path = out / args.map_file
+    orders_path = out / args.orders_file
+    with open(map_path, "w", encoding="utf-8") as f:
+        json.dump({"data": city}, f, ensure_ascii=False)
+    with open(orders_path, "w", encoding="utf-8") as f:
+        json.dump({"data": orders}, f, ensure_ascii=False)
+
+    if args.cqmap:
+        cq_path = write_city_cqmap(city, map_path.with_suffix(".cqmap"))
+        print(f"Copia binaria -> {cq_path}")
+
+    print(f"Mapa {args.width}x{args.height} -> {map_path}")
+    print(f"{len(orders)} pedidos -> {orders_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+from game.core.orders import Order, OrderStatus
+
+
+class OrderDeadlineIndex:
+    """
+    Índice min-heap de vencimientos de pedidos aceptados (tiempo de juego absoluto).
+    - register(): al aceptar un pedido se agrega su vencimiento (accepted_at + time_limit).
+    - discard(): borrado perezoso al entregar/cancelar; la entrada se ignora al salir del heap.
+    - pop_expired(): solo toca los pedidos cuyo vencimiento ya pasó.
+    El costo por frame es O(vencidos · log n), independiente de cuántos pedidos lleve cada repartidor.
+    """
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        # order_id -> (expires_at, order, courier)
+        self._entries: Dict[str, Tuple[float, Order, Any]] = {}
+        self._seq = itertools.count()
+
+    def register(self, order: Order, courier: Any) -> Optional[float]:
+        if order.accepted_at < 0:
+            return None
+        expires_at = float(order.accepted_at) + float(order.time_limit)
+        self._entries[order.id] = (expires_at, order, courier)
+        heapq.heappush(self._heap, (expires_at, next(self._seq), order.id))
+        return expires_at
+
+    def discard(self, order_id: str) -> bool:
+        return self._entries.pop(str(order_id), None) is not None
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+
+    def expires_at(self, order_id: str) -> Optional[float]:
+        entry = self._entries.get(str(order_id))
+        return entry[0] if entry else None
+
+    def remaining(self, order_id: str, now: float) -> Optional[float]:
+        """Tiempo restante calculado a demanda (para UI); None si no está registrado."""
+        at = self.expires_at(order_id)
+        return None if at is None else max(0.0, at - float(now))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def pop_expired(self, now: float) -> List[Tuple[Order, Any]]:
+        """
+        Retorna [(order, courier)] vencidos con at <= now que aún siguen activos
+        en el inventario de su repartidor. Las entradas obsoletas se descartan.
+        """
+        now = float(now)
+        heap = self._heap
+        expired = []
+        while heap and heap[0][0] <= now:
+            at, _, order_id = heapq.heappop(heap)
+            entry = self._entries.get(order_id)
+            # Entrada reemplazada por un registro más reciente o ya descartada
+            if entry is None or entry[0] != at:
+                continue
+            del self._entries[order_id]
+            _, order, courier = entry
+            current = self._find_active(courier, order_id)
+            if current is not None:
+                current.time_remaining = 0.0
+                expired.append((current, courier))
+        return expired
+
+    @staticmethod
+    def _find_active(courier, order_id: str) -> Optional[Order]:
+        inv = getattr(courier, "inventory", None)
+        if inv is None:
+            return None
+        order = inv.get_order(order_id)
+        if order is None:
+            return None
+        if order.status not in (OrderStatus.IN_PROGRESS, OrderStatus.PICKED_UP, OrderStatus.PENDING):
+            return None
+        return order
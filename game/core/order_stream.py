@@ -0,0 +1,325 @@
+import itertools
+import json
+import queue
+import random
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from game.core import utils
+from game.core.orders import Order
+
+# Clave del arreglo de pedidos dentro de un objeto: {"data": [...]} o {"orders": [...]}
+_ARRAY_KEY_RE = re.compile(r'"(data|orders)"\s*:\s*\[')
+_WS = " \t\r\n"
+
+
+def iter_json_array(fp, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Parser incremental: recorre el arreglo de pedidos de un archivo JSON
+    (lista en la raíz o bajo "data"/"orders") sin cargar el documento completo.
+    Cada elemento se decodifica con raw_decode apenas está completo en el buffer.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    eof = False
+
+    def _read() -> bool:
+        nonlocal buf, eof
+        if eof:
+            return False
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf += chunk
+        return True
+
+    # 1) ubicar el inicio del arreglo
+    pos = -1
+    while pos < 0:
+        stripped = buf.lstrip(_WS)
+        if stripped.startswith("["):
+            pos = len(buf) - len(stripped) + 1
+            break
+        m = _ARRAY_KEY_RE.search(buf)
+        if m:
+            pos = m.end()
+            break
+        if not _read():
+            return
+    buf = buf[pos:]
+    pos = 0
+
+    # 2) decodificar elemento por elemento
+    while True:
+        while True:
+            while pos < len(buf) and (buf[pos] in _WS or buf[pos] == ","):
+                pos += 1
+            if pos < len(buf):
+                break
+            buf, pos = "", 0
+            if not _read():
+                return
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Elemento incompleto: pedir más datos
+            buf, pos = buf[pos:], 0
+            if not _read():
+                return
+            continue
+        yield item
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+class OrderBuilder:
+    """
+    Etapa de construcción: valida un item crudo, ajusta pickup/dropoff a calles
+    accesibles y crea el Order. Solo lee el mapa, por lo que puede correr en un hilo.
+    Retorna (order, edificios) donde edificios son las puertas a generar.
+    """
+    def __init__(self, city, skip_ids=None, debug: bool = False):
+        self.city = city
+        self.skip_ids = set(skip_ids or [])
+        self.debug = bool(debug)
+
+    def build(self, it: dict) -> Optional[Tuple[Order, List[Tuple[int, int]]]]:
+        try:
+            oid = str(it.get("id") or f"ORD-{random.randint(1000, 9999)}")
+            if oid in self.skip_ids:
+                return None
+
+            pickup_raw = self._parse_xy(it.get("pickup"))
+            dropoff_raw = self._parse_xy(it.get("dropoff"))
+            if not pickup_raw or not dropoff_raw:
+                if self.debug:
+                    print(f"Saltando pedido {oid}: pickup/dropoff inválidos")
+                return None
+
+            snap_p = self._snap_to_accessible_or_force(pickup_raw)
+            snap_d = self._snap_to_accessible_or_force(dropoff_raw)
+            if not snap_p or not snap_d:
+                if self.debug:
+                    print(f"Forzado fallido para {oid}: no hay calles en el mapa")
+                return None
+
+            (pickup_pos, p_building) = snap_p
+            (dropoff_pos, d_building) = snap_d
+
+            payout = float(it.get("payout", it.get("payment", 0)))
+            deadline = str(it.get("deadline", ""))
+            time_limit = self._time_limit_from_deadline(deadline, 600.0)
+
+            order = Order(
+                order_id=oid,
+                pickup_pos=pickup_pos,
+                dropoff_pos=dropoff_pos,
+                payment=payout,
+                time_limit=time_limit,
+                weight=it.get("weight"),
+                priority=int(it.get("priority", 0)),
+                deadline=deadline,
+                release_time=int(it.get("release_time", 0)),
+            )
+            buildings = [b for b in (p_building, d_building) if b]
+            return order, buildings
+        except Exception as e:
+            if self.debug:
+                print(f"Saltando pedido inválido: {e}")
+            return None
+
+    def build_all(self, items: Iterable[dict], start: int = 0) -> Iterator[Tuple[Order, List[Tuple[int, int]], int]]:
+        """(order, edificios, posición del item crudo); los primeros `start` items se saltan sin construir."""
+        for pos, it in enumerate(itertools.islice(items, start, None), start):
+            built = self.build(it)
+            if built is not None:
+                yield built + (pos,)
+
+    # --------- helpers privados ---------
+    def _in_bounds(self, x, y):
+        return 0 <= x < self.city.width and 0 <= y < self.city.height
+
+    def _is_street(self, x, y):
+        try:
+            return self.city.tiles[y][x] == "C"
+        except Exception:
+            return False
+
+    @staticmethod
+    def _parse_xy(v):
+        if isinstance(v, (list, tuple)) and len(v) == 2:
+            return int(v[0]), int(v[1])
+        return None
+
+    @staticmethod
+    def _time_limit_from_deadline(deadline_str: str, default_sec: float = 600.0) -> float:
+        if not deadline_str:
+            return default_sec
+        try:
+            s = str(deadline_str)
+            if s.endswith("Z"):
+                dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+                now = datetime.now(timezone.utc)
+            else:
+                dt = datetime.fromisoformat(s)
+                now = datetime.now(dt.tzinfo) if dt.tzinfo else datetime.now()
+            return max(60.0, (dt - now).total_seconds())
+        except Exception:
+            return default_sec
+
+    def _nearest_street_from(self, x0, y0, max_radius=64):
+        if self._in_bounds(x0, y0) and self._is_street(x0, y0):
+            return (x0, y0)
+        # Calle más cercana precalculada para el mapa (si está disponible)
+        near = utils.nearest_from_layer(self.city, "near_street", x0, y0)
+        if near is not False:
+            if near and max(abs(near[0] - x0), abs(near[1] - y0)) <= max_radius:
+                return near
+            return None
+        best = None
+        best_d2 = float("inf")
+        for r in range(1, max_radius + 1):
+            for dx in range(-r, r + 1):
+                for dy in (-r, r):
+                    x, y = x0 + dx, y0 + dy
+                    if self._in_bounds(x, y) and self._is_street(x, y):
+                        d2 = (x - x0) * (x - x0) + (y - y0) * (y - y0)
+                        if d2 < best_d2:
+                            best, best_d2 = (x, y), d2
+            for dy in range(-r + 1, r):
+                for dx in (-r, r):
+                    x, y = x0 + dx, y0 + dy
+                    if self._in_bounds(x, y) and self._is_street(x, y):
+                        d2 = (x - x0) * (x - x0) + (y - y0) * (y - y0)
+                        if d2 < best_d2:
+                            best, best_d2 = (x, y), d2
+            if best is not None:
+                return best
+        return None
+
+    def _snap_to_accessible_or_force(self, pos):
+        if not pos:
+            return None
+        city = self.city
+        px, py = pos
+        if self._in_bounds(px, py) and self._is_street(px, py):
+            nb = utils.find_nearest_building(city, px, py)
+            return (px, py), nb
+
+        nb = utils.find_nearest_building(city, px, py)
+        bx, by = nb if nb else (px, py)
+
+        for nx, ny in ((bx + 1, by), (bx - 1, by), (bx, by + 1), (bx, by - 1)):
+            if self._in_bounds(nx, ny) and self._is_street(nx, ny):
+                return (nx, ny), nb
+
+        for nx in (bx - 1, bx, bx + 1):
+            for ny in (by - 1, by, by + 1):
+                if (nx, ny) != (bx, by) and self._in_bounds(nx, ny) and self._is_street(nx, ny):
+                    return (nx, ny), nb
+
+        near_street = self._nearest_street_from(bx, by, max_radius=96)
+        if near_street:
+            return near_street, nb
+        near_street = self._nearest_street_from(px, py, max_radius=96)
+        if near_street:
+            nn_b = utils.find_nearest_building(city, near_street[0], near_street[1])
+            return near_street, nn_b
+        return None
+
+
+class OrderIngestor:
+    """
+    Pipeline de ingesta: items crudos -> OrderBuilder -> cola acotada.
+    - Con hilo: un worker construye pedidos y bloquea cuando la cola está llena,
+      así la memoria en vuelo queda acotada por `max_buffered`.
+    - Sin hilo: take() construye a demanda en el hilo que llama.
+    El consumidor (OrdersManager) toma pedidos con take() solo cuando los necesita.
+    Cada pedido llega con la posición de su item crudo, así el consumidor puede
+    guardar hasta dónde consumió el stream y retomarlo con `start`.
+    """
+    _DONE = object()
+
+    def __init__(self, items: Iterable[dict], builder: OrderBuilder,
+                 max_buffered: int = 64, debug: bool = False, start: int = 0):
+        self._built = builder.build_all(items, start)
+        self.debug = bool(debug)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, int(max_buffered)))
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.exhausted = False
+
+    def start_thread(self):
+        if self._thread is not None or self.exhausted:
+            return
+        self._thread = threading.Thread(target=self._worker, name="OrderIngestor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        # Liberar al worker si está bloqueado en put()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.exhausted = True
+        if self._thread is None:
+            self._close_source()
+
+    def take(self, max_items: int, block: bool = False) -> list:
+        """
+        Hasta max_items pedidos listos. Sin hilo los construye aquí; con hilo
+        solo toma lo ya construido (o espera si block=True).
+        """
+        out = []
+        if self.exhausted or max_items <= 0:
+            return out
+        if self._thread is None:
+            for built in self._built:
+                out.append(built)
+                if len(out) >= max_items:
+                    return out
+            self.exhausted = True
+            return out
+
+        while len(out) < max_items:
+            try:
+                item = self._queue.get(block=block)
+            except queue.Empty:
+                break
+            if item is self._DONE:
+                self.exhausted = True
+                break
+            out.append(item)
+        return out
+
+    # --------- helpers privados ---------
+    def _worker(self):
+        try:
+            for built in self._built:
+                if self._stop.is_set():
+                    return
+                self._queue.put(built)
+        except Exception as e:
+            if self.debug:
+                print(f"[OrderIngestor] Error en worker: {e}")
+        finally:
+            if self._stop.is_set():
+                self._close_source()
+            else:
+                self._queue.put(self._DONE)
+
+    def _close_source(self):
+        """Cierra la cadena de generadores (y el archivo de backup abierto, si lo hay)."""
+        try:
+            self._built.close()
+        except Exception as e:
+            if self.debug:
+                print(f"[OrderIngestor] Error al cerrar la fuente: {e}")
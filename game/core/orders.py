@@ -1,5 +1,7 @@
+import sys
+import time
 from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime, timedelta
+from datetime import datetime
 import random
 
 class OrderStatus:
@@ -11,9 +13,35 @@ class OrderStatus:
     IN_PROGRESS = "in_progress"
 
 
+def _to_ts(value) -> Optional[float]:
+    """Acepta datetime, float (epoch) o None y retorna segundos epoch."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _iso_to_ts(value) -> Optional[float]:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def _ts_to_iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
+
 class Order:
-    accepted_at: float = -1.0
-    time_remaining: float = -1.0
+    """
+    Pedido compacto: __slots__ y tiempos guardados como float (segundos epoch).
+    Los datetime (created_at, expires_at, ...) se materializan solo al leerlos.
+    """
+    __slots__ = (
+        "id", "pickup_pos", "dropoff_pos", "payment", "time_limit", "_status", "_owner",
+        "_created_ts", "_expires_ts", "_picked_up_ts", "_delivered_ts",
+        "weight", "fragile", "description", "priority", "deadline",
+        "release_time", "payout", "accepted_at", "time_remaining",
+        "release_timestamp",
+    )
 
     def __init__(
         self,
@@ -34,18 +62,21 @@ class Order:
         description: str = "",
         fragile: bool = False,
     ) -> None:
-        self.id = order_id
+        self.id = sys.intern(str(order_id))
         self.pickup_pos = pickup_pos
         self.dropoff_pos = dropoff_pos
         self.payment = float(payment)
         self.time_limit = float(time_limit)
 
-        self.status = status
+        self._owner = None  # Inventory que lo contiene (para los totales de peso)
+        self._status = status
 
-        self.created_at = created_at or datetime.now()
-        self.expires_at = expires_at or (self.created_at + timedelta(seconds=self.time_limit))
-        self.picked_up_at = picked_up_at
-        self.delivered_at = delivered_at
+        created_ts = _to_ts(created_at)
+        self._created_ts = time.time() if created_ts is None else created_ts
+        expires_ts = _to_ts(expires_at)
+        self._expires_ts = self._created_ts + self.time_limit if expires_ts is None else expires_ts
+        self._picked_up_ts = _to_ts(picked_up_at)
+        self._delivered_ts = _to_ts(delivered_at)
 
         self.weight = float(weight)
         self.fragile = bool(fragile)
@@ -57,6 +88,63 @@ class Order:
 
         self.accepted_at = -1.0
         self.time_remaining = -1.0
+        self.release_timestamp = None
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @status.setter
+    def status(self, value: str):
+        old = self._status
+        self._status = value
+        owner = self._owner
+        if owner is not None and old != value:
+            owner._on_order_status(self, old, value)
+
+    # ---------- Tiempos (datetime perezoso) ----------
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self._created_ts)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_ts = _to_ts(value) if value is not None else time.time()
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self._expires_ts)
+
+    @expires_at.setter
+    def expires_at(self, value):
+        self._expires_ts = _to_ts(value) if value is not None else self._created_ts + self.time_limit
+
+    @property
+    def picked_up_at(self) -> Optional[datetime]:
+        ts = self._picked_up_ts
+        return datetime.fromtimestamp(ts) if ts is not None else None
+
+    @picked_up_at.setter
+    def picked_up_at(self, value):
+        self._picked_up_ts = _to_ts(value)
+
+    @property
+    def delivered_at(self) -> Optional[datetime]:
+        ts = self._delivered_ts
+        return datetime.fromtimestamp(ts) if ts is not None else None
+
+    @delivered_at.setter
+    def delivered_at(self, value):
+        self._delivered_ts = _to_ts(value)
+
+    @property
+    def picked_up_ts(self) -> Optional[float]:
+        """Marca de recogida en segundos epoch (sin crear datetime)."""
+        return self._picked_up_ts
+
+    @picked_up_ts.setter
+    def picked_up_ts(self, value: Optional[float]):
+        self._picked_up_ts = None if value is None else float(value)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -70,10 +158,10 @@ class Order:
             "deadline": self.deadline,
             "release_time": self.release_time,
             "status": self.status,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "picked_up_at": self.picked_up_at.isoformat() if self.picked_up_at else None,
-            "delivered_at": self.delivered_at.isoformat() if self.delivered_at else None,
+            "created_at": _ts_to_iso(self._created_ts),
+            "expires_at": _ts_to_iso(self._expires_ts),
+            "picked_up_at": _ts_to_iso(self._picked_up_ts),
+            "delivered_at": _ts_to_iso(self._delivered_ts),
             "description": self.description,
             "fragile": self.fragile,
             # Persist per\-order timer state
@@ -94,10 +182,10 @@ class Order:
             deadline=data.get("deadline"),
             release_time=int(data.get("release_time", 0)),
             status=str(data.get("status", OrderStatus.PENDING)),
-            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None,
-            expires_at=datetime.fromisoformat(data["expires_at"]) if data.get("expires_at") else None,
-            picked_up_at=datetime.fromisoformat(data["picked_up_at"]) if data.get("picked_up_at") else None,
-            delivered_at=datetime.fromisoformat(data["delivered_at"]) if data.get("delivered_at") else None,
+            created_at=_iso_to_ts(data.get("created_at")),
+            expires_at=_iso_to_ts(data.get("expires_at")),
+            picked_up_at=_iso_to_ts(data.get("picked_up_at")),
+            delivered_at=_iso_to_ts(data.get("delivered_at")),
             description=str(data.get("description", "")),
             fragile=bool(data.get("fragile", False)),
         )
@@ -111,26 +199,25 @@ class Order:
         try:
             if self.accepted_at >= 0:
                 return self.time_remaining == 0.0
-            return (datetime.now() > self.expires_at) and (self.status in (OrderStatus.PENDING, OrderStatus.IN_PROGRESS))
+            return (time.time() > self._expires_ts) and (self.status in (OrderStatus.PENDING, OrderStatus.IN_PROGRESS))
         except Exception:
             return False
 
     def get_remaining_time(self) -> float:
         try:
-            remaining = (self.expires_at - datetime.now()).total_seconds()
-            return max(0.0, float(remaining))
+            return max(0.0, float(self._expires_ts - time.time()))
         except Exception:
             return 0.0
 
     def pickup(self):
         if self.status in (OrderStatus.IN_PROGRESS, OrderStatus.PENDING):
             self.status = OrderStatus.PICKED_UP
-            self.picked_up_at = datetime.now()
+            self._picked_up_ts = time.time()
 
     def deliver(self):
         if self.status == OrderStatus.PICKED_UP:
             self.status = OrderStatus.DELIVERED
-            self.delivered_at = datetime.now()
+            self._delivered_ts = time.time()
 
     def cancel(self):
         if self.status in [OrderStatus.PENDING, OrderStatus.PICKED_UP, OrderStatus.IN_PROGRESS]:
@@ -145,6 +232,12 @@ class Order:
             return
         self.time_remaining = max(0.0, float(getattr(self, "time_limit", 0.0)) - elapsed_since_accept)
 
+    def remaining_time_at(self, current_play_time: float) -> float:
+        """Tiempo restante a demanda (sin estado por frame). -1 si no se ha aceptado."""
+        if self.accepted_at < 0:
+            return -1.0
+        return max(0.0, self.time_limit - (float(current_play_time) - self.accepted_at))
+
 
 class OrderManager:
     def __init__(self):
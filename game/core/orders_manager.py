@@ -1,11 +1,12 @@
 import os
-import json
-import random
-from datetime import datetime, timezone
 from typing import Optional
 
-from game.core import utils
 from game.core.orders import Order
+from game.core.order_deadlines import OrderDeadlineIndex
+from game.core.order_stream import OrderBuilder, OrderIngestor, iter_json_array
+from game.core.scheduler import EventScheduler
+
+ORDER_RELEASE_EVENT = "order_release"
 
 
 class OrdersManager:
@@ -15,17 +16,103 @@ class OrdersManager:
     """
     def __init__(self):
         self.pending_orders: list[Order] = []
-        self._orders_queue: list[tuple[float, Order]] = []
+        # Pedidos aún no liberados: id -> (unlock_at, Order). La liberación la dispara el scheduler.
+        self._queued_orders: dict[str, tuple[float, Order]] = {}
         self._orders_window = None
         self.order_release_interval: float = 120.0
         self.debug: bool = False
         self.canceled_orders: set[str] = set()  # <-- nuevo
+        self._notify = None
+        self.scheduler: EventScheduler = EventScheduler()
+        self.scheduler.register_handler(ORDER_RELEASE_EVENT, self._on_release_event)
+        # Vencimientos de pedidos aceptados (jugador e IA)
+        self.deadlines = OrderDeadlineIndex()
+        # Ingesta en streaming (ver setup_orders / pump_ingestion)
+        self._ingestor: Optional[OrderIngestor] = None
+        self._ingest_index = 0
+        self._stream_pos = 0  # primer item crudo del stream aún no consumido
+        self._renderer = None
+        self.order_stream_lookahead: int = 32
+        self._use_thread = True
 
     def attach_window(self, orders_window):
         self._orders_window = orders_window
         if self._orders_window:
             self._orders_window.set_pending_orders(self.pending_orders)
 
+    def attach_scheduler(self, scheduler: EventScheduler, notify=None):
+        """Usa la agenda central del juego para liberar pedidos."""
+        self.cancel_ingestion()
+        self.scheduler = scheduler
+        self._notify = notify
+        self.scheduler.register_handler(ORDER_RELEASE_EVENT, self._on_release_event)
+
+    def start_order_timer(self, order: Order, courier, current_play_time: float):
+        """Inicia el timer del pedido aceptado y registra su vencimiento en el índice."""
+        order.start_timer(current_play_time)
+        self.deadlines.register(order, courier)
+
+    def pop_expired_orders(self, current_play_time: float):
+        """[(order, courier)] cuyo vencimiento ya pasó."""
+        return self.deadlines.pop_expired(current_play_time)
+
+    def queued_orders(self) -> list[Order]:
+        """Pedidos programados que aún no se liberan, en orden de liberación."""
+        return [o for _, o in sorted(self._queued_orders.values(), key=lambda x: x[0])]
+
+    def restore_queued_orders(self, items):
+        """
+        Restaura la cola desde el guardado: [{"release_at": t, "order": {...}}].
+        Los eventos de liberación se restauran con el snapshot del scheduler.
+        """
+        self.cancel_ingestion()
+        self._queued_orders = {}
+        for it in items or []:
+            try:
+                order = Order.from_dict(it["order"])
+                if order.id in self.canceled_orders:
+                    continue
+                self._queued_orders[order.id] = (float(it.get("release_at", 0.0)), order)
+            except Exception as e:
+                print(f"Pedido inválido en queued_orders: {it}. Error: {e}")
+
+    def snapshot_queued_orders(self) -> list[dict]:
+        return [{"release_at": t, "order": o.to_dict()}
+                for t, o in sorted(self._queued_orders.values(), key=lambda x: x[0])]
+
+    def snapshot_ingestion(self) -> Optional[dict]:
+        """
+        Punto del stream de pedidos aún sin consumir (None si la ingesta terminó).
+        Lo ya construido en el buffer del worker se descarta: se vuelve a leer al retomar.
+        """
+        if self._ingestor is None:
+            return None
+        return {"position": self._stream_pos, "ingest_index": self._ingest_index}
+
+    def resume_ingestion(self, state, api_client=None, files_conf=None, app_config=None,
+                         city=None, renderer=None, debug=False):
+        """
+        Retoma la ingesta desde snapshot_ingestion(): vuelve a abrir la fuente y
+        salta los items ya consumidos sin construirlos. No admite nada aquí; los
+        pedidos entran por frame en pump_ingestion(). Llamar después de restaurar
+        la cola y el scheduler.
+        """
+        self.cancel_ingestion()
+        if not isinstance(state, dict):
+            return
+        self.debug = bool(debug)
+        self._configure(app_config)
+        self._renderer = renderer
+        skip_ids = set(self.canceled_orders) | set(self._queued_orders)
+        skip_ids |= {o.id for o in self.pending_orders}
+        self._ingest_index = int(state.get("ingest_index", 0))
+        self._start_ingestion(api_client, files_conf, city, skip_ids,
+                              int(state.get("position", 0)))
+        if self._use_thread:
+            self._ingestor.start_thread()
+        if self.debug:
+            print(f"Ingesta de pedidos retomada en el item {self._stream_pos}")
+
     def mark_canceled(self, order_id: str):
         self.canceled_orders.add(str(order_id))
 
@@ -34,190 +121,127 @@ class OrdersManager:
                      skip_ids=None,
                      current_play_time: float = 0.0):
         self.debug = bool(debug)
-        self.order_release_interval = float(app_config.get("game", {}).get("order_release_seconds", 120)) if app_config else 120.0
-        skip_ids = set(skip_ids or [])
-
-        # 1) cargar lista cruda
-        orders_list = self._load_orders_list(api_client, files_conf or {})
-
-        if self.debug:
-            print(f"Total de pedidos cargados: {len(orders_list)}")
-
-        # 2) helpers locales
-        def _in_bounds(x, y):
-            return 0 <= x < city.width and 0 <= y < city.height
+        self._configure(app_config)
+        skip_ids = set(skip_ids or []) | set(self.canceled_orders)
 
-        def _is_street(x, y):
-            try:
-                return city.tiles[y][x] == "C"
-            except Exception:
-                return False
-
-        def _parse_xy(v):
-            if isinstance(v, (list, tuple)) and len(v) == 2:
-                return int(v[0]), int(v[1])
-            return None
-
-        def _time_limit_from_deadline(deadline_str: str, default_sec: float = 600.0) -> float:
-            if not deadline_str:
-                return default_sec
-            try:
-                s = str(deadline_str)
-                if s.endswith("Z"):
-                    dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
-                    now = datetime.now(timezone.utc)
-                else:
-                    dt = datetime.fromisoformat(s)
-                    now = datetime.now(dt.tzinfo) if dt.tzinfo else datetime.now()
-                return max(60.0, (dt - now).total_seconds())
-            except Exception:
-                return default_sec
-
-        def _nearest_street_from(x0, y0, max_radius=64):
-            if _in_bounds(x0, y0) and _is_street(x0, y0):
-                return (x0, y0)
-            best = None
-            best_d2 = float("inf")
-            for r in range(1, max_radius + 1):
-                for dx in range(-r, r + 1):
-                    for dy in (-r, r):
-                        x, y = x0 + dx, y0 + dy
-                        if _in_bounds(x, y) and _is_street(x, y):
-                            d2 = (x - x0) * (x - x0) + (y - y0) * (y - y0)
-                            if d2 < best_d2:
-                                best, best_d2 = (x, y), d2
-                for dy in range(-r + 1, r):
-                    for dx in (-r, r):
-                        x, y = x0 + dx, y0 + dy
-                        if _in_bounds(x, y) and _is_street(x, y):
-                            d2 = (x - x0) * (x - x0) + (y - y0) * (y - y0)
-                            if d2 < best_d2:
-                                best, best_d2 = (x, y), d2
-                if best is not None:
-                    return best
-            return None
-
-        def _snap_to_accessible_or_force(pos):
-            if not pos:
-                return None
-            px, py = pos
-            if _in_bounds(px, py) and _is_street(px, py):
-                nb = utils.find_nearest_building(city, px, py)
-                return (px, py), nb
-
-            nb = utils.find_nearest_building(city, px, py)
-            bx, by = nb if nb else (px, py)
-
-            for nx, ny in ((bx + 1, by), (bx - 1, by), (bx, by + 1), (bx, by - 1)):
-                if _in_bounds(nx, ny) and _is_street(nx, ny):
-                    return (nx, ny), nb
-
-            for nx in (bx - 1, bx, bx + 1):
-                for ny in (by - 1, by, by + 1):
-                    if (nx, ny) != (bx, by) and _in_bounds(nx, ny) and _is_street(nx, ny):
-                        return (nx, ny), nb
-
-            near_street = _nearest_street_from(bx, by, max_radius=96)
-            if near_street:
-                return near_street, nb
-            near_street = _nearest_street_from(px, py, max_radius=96)
-            if near_street:
-                nn_b = utils.find_nearest_building(city, near_street[0], near_street[1])
-                return near_street, nn_b
-            return None
-
-        # 3) parsear y construir Orders
-        orders_objs = []
-        for it in orders_list:
-            try:
-                oid = str(it.get("id") or f"ORD-{random.randint(1000, 9999)}")
-                if oid in skip_ids or oid in self.canceled_orders:
-                    continue
-
-                pickup_raw = _parse_xy(it.get("pickup"))
-                dropoff_raw = _parse_xy(it.get("dropoff"))
-                if not pickup_raw or not dropoff_raw:
-                    if self.debug:
-                        print(f"Saltando pedido {oid}: pickup/dropoff inválidos")
-                    continue
-
-                snap_p = _snap_to_accessible_or_force(pickup_raw)
-                snap_d = _snap_to_accessible_or_force(dropoff_raw)
-                if not snap_p or not snap_d:
-                    if self.debug:
-                        print(f"Forzado fallido para {oid}: no hay calles en el mapa")
-                    continue
+        # 1) reiniciar cola
+        self.cancel_ingestion()
+        self.pending_orders = []
+        self.deadlines.clear()
+        self.scheduler.cancel_kind(ORDER_RELEASE_EVENT)
+        self._queued_orders = {}
+        self._renderer = renderer
 
-                (pickup_pos, p_building) = snap_p
-                (dropoff_pos, d_building) = snap_d
-
-                payout = float(it.get("payout", it.get("payment", 0)))
-                deadline = str(it.get("deadline", ""))
-                time_limit = _time_limit_from_deadline(deadline, 600.0)
-
-                order = Order(
-                    order_id=oid,
-                    pickup_pos=pickup_pos,
-                    dropoff_pos=dropoff_pos,
-                    payment=payout,
-                    time_limit=time_limit,
-                    weight=it.get("weight"),
-                    priority=int(it.get("priority", 0)),
-                    deadline=deadline,
-                    release_time=int(it.get("release_time", 0)),
-                )
-                orders_objs.append(order)
-
-                # Generar puertas si corresponde
-                if renderer and city:
-                    if p_building:
-                        pbx, pby = p_building
-                        if _in_bounds(pbx, pby) and city.tiles[pby][pbx] == "B":
-                            renderer.generate_door_at(pbx, pby)
-                    if d_building:
-                        dbx, dby = d_building
-                        if _in_bounds(dbx, dby) and city.tiles[dby][dbx] == "B":
-                            renderer.generate_door_at(dbx, dby)
+        # 2) pipeline: fuente incremental -> snap/construcción -> cola acotada
+        self._ingest_index = 0
+        self._start_ingestion(api_client, files_conf, city, skip_ids, 0)
 
-            except Exception as e:
-                if self.debug:
-                    print(f"Saltando pedido inválido: {e}")
-
-        # 4) preparar cola según tiempo jugado
-        self.pending_orders = []
-        self._orders_queue = []
-        elapsed = float(current_play_time)
-        for i, order in enumerate(orders_objs):
-            unlock_at = i * float(self.order_release_interval)
-            if unlock_at <= elapsed:
-                self.pending_orders.append(order)
-            else:
-                self._orders_queue.append((unlock_at, order))
-        self._orders_queue.sort(key=lambda x: x[0])
+        # 3) los primeros pedidos se construyen aquí para que estén disponibles de inmediato;
+        #    el resto lo prepara el worker y se admite por frame en pump_ingestion()
+        self.pump_ingestion(current_play_time, initial=True)
+        if self._ingestor is not None and self._use_thread:
+            self._ingestor.start_thread()
 
         if self._orders_window:
             self._orders_window.set_pending_orders(self.pending_orders)
         if self.debug:
             print(f"{len(self.pending_orders)} active orders ready")
 
-    def release_orders(self, total_play_time: float, notify):
-        released = 0
-        while self._orders_queue and self._orders_queue[0][0] <= float(total_play_time):
-            _, order = self._orders_queue.pop(0)
-            if order.id in self.canceled_orders:
-                continue
-            # Marcar timestamp de liberación
-            order.release_timestamp = total_play_time
-
+    def pump_ingestion(self, total_play_time: float, initial: bool = False) -> int:
+        """
+        Admite pedidos ya construidos mientras haya menos de `order_stream_lookahead`
+        en cola. Costo O(1) cuando la ingesta terminó. Retorna cuántos se admitieron.
+        """
+        ing = self._ingestor
+        if ing is None:
+            return 0
+        elapsed = float(total_play_time)
+        admitted = 0
+        while not ing.exhausted:
+            # Pedidos cuya liberación ya pasó + lookahead pedidos futuros
+            due = int(elapsed // max(1e-6, self.order_release_interval)) + 1 - self._ingest_index
+            wanted = max(0, due) + self.order_stream_lookahead - len(self._queued_orders)
+            if wanted <= 0:
+                break
+            batch = ing.take(wanted)
+            if not batch:
+                break
+            for order, buildings, pos in batch:
+                self._stream_pos = pos + 1
+                self._admit_order(order, buildings, elapsed, initial)
+                admitted += 1
+        if ing.exhausted:
+            self._ingestor = None
+            if self.debug:
+                print(f"Total de pedidos cargados: {self._ingest_index}")
+        return admitted
+
+    def cancel_ingestion(self):
+        if self._ingestor is not None:
+            self._ingestor.stop()
+        self._ingestor = None
+
+    def _admit_order(self, order: Order, buildings, elapsed: float, initial: bool):
+        if order.id in self.canceled_orders:
+            return
+        unlock_at = self._ingest_index * float(self.order_release_interval)
+        self._ingest_index += 1
+
+        # Generar puertas si corresponde (en el hilo principal)
+        if self._renderer:
+            for bx, by in buildings:
+                self._renderer.generate_door_at(bx, by)
+
+        if initial and unlock_at <= elapsed:
             self.pending_orders.append(order)
-            released += 1
-            notify(f"Nuevo pedido disponible: {order.id}")
+        else:
+            # Si el worker llegó tarde, el evento vence en el próximo frame y se notifica
+            self._queued_orders[order.id] = (unlock_at, order)
+            self.scheduler.schedule_at(unlock_at, ORDER_RELEASE_EVENT, order.id)
 
-        if released and self._orders_window:
+    def release_orders(self, total_play_time: float, notify):
+        """
+        Compatibilidad: avanza la agenda hasta total_play_time.
+        Con el scheduler central adjunto, CourierGame ya lo avanza cada frame.
+        """
+        self._notify = notify
+        self.scheduler.run_until(total_play_time)
+
+    def _on_release_event(self, order_id, now: float):
+        entry = self._queued_orders.pop(str(order_id), None)
+        if entry is None:
+            return
+        _, order = entry
+        if order.id in self.canceled_orders:
+            return
+        # Marcar timestamp de liberación
+        order.release_timestamp = now
+
+        self.pending_orders.append(order)
+        if self._notify:
+            self._notify(f"Nuevo pedido disponible: {order.id}")
+        if self._orders_window:
             self._orders_window.set_pending_orders(self.pending_orders)
 
     # --------- helpers privados ---------
-    def _load_orders_list(self, api_client, files_conf: dict):
+    def _configure(self, app_config):
+        game_conf = app_config.get("game", {}) if app_config else {}
+        self.order_release_interval = float(game_conf.get("order_release_seconds", 120))
+        self.order_stream_lookahead = int(game_conf.get("order_stream_lookahead", 32))
+        self._use_thread = bool(game_conf.get("order_stream_thread", True))
+
+    def _start_ingestion(self, api_client, files_conf, city, skip_ids, position: int):
+        items = self._iter_orders_source(api_client, files_conf or {})
+        builder = OrderBuilder(city, skip_ids=skip_ids, debug=self.debug)
+        self._stream_pos = position
+        self._ingestor = OrderIngestor(items, builder, max_buffered=self.order_stream_lookahead,
+                                       debug=self.debug, start=position)
+
+    def _iter_orders_source(self, api_client, files_conf: dict):
+        """
+        Genera items crudos de pedidos. La respuesta de la API ya llega decodificada;
+        el backup local se recorre con el parser incremental.
+        """
         data = None
         try:
             data = api_client.get_orders() if api_client else None
@@ -230,24 +254,21 @@ class OrdersManager:
             orders_list = data["data"]
         elif isinstance(data, list):
             orders_list = data
+        data = None
 
-        if not orders_list:
-            try:
-                backup_file = os.path.join(files_conf.get("data_directory", "data"), "pedidos.json")
-                if os.path.exists(backup_file):
-                    with open(backup_file, "r", encoding="utf-8") as f:
-                        local = json.load(f)
-                    if isinstance(local, dict):
-                        if isinstance(local.get("data"), list):
-                            orders_list = local["data"]
-                        elif isinstance(local.get("orders"), list):
-                            orders_list = local["orders"]
-                    elif isinstance(local, list):
-                        orders_list = local
-                    if orders_list and self.debug:
-                        print(f"Pedidos cargados desde backup: {backup_file} ({len(orders_list)})")
-            except Exception as e:
-                if self.debug:
-                    print(f"Error al cargar pedidos desde backup: {e}")
-        return orders_list
+        if orders_list:
+            yield from orders_list
+            return
 
+        try:
+            backup_file = os.path.join(files_conf.get("data_directory", "data"), "pedidos.json")
+            if os.path.exists(backup_file):
+                with open(backup_file, "r", encoding="utf-8") as f:
+                    if self.debug:
+                        print(f"Pedidos en streaming desde backup: {backup_file}")
+                    for it in iter_json_array(f):
+                        if isinstance(it, dict):
+                            yield it
+        except Exception as e:
+            if self.debug:
+                print(f"Error al cargar pedidos desde backup: {e}")
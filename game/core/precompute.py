@@ -0,0 +1,402 @@
+"""
+Caché persistente de datos derivados del mapa.
+
+Cada mapa se identifica por un hash de su contenido (dimensiones, tiles y
+leyenda). Cada artefacto derivado se guarda en su propio .cqmap
+(<hash>.<capa>.cqmap) bajo files.cache_directory/precompute y se lee a
+demanda vía mmap; agregar una capa nunca reemplaza un archivo ya mapeado.
+Las entradas se expulsan por antigüedad y tamaño total, igual que APICache.
+"""
+import atexit
+import hashlib
+import json
+import threading
+import weakref
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from game.core.cqmap import CQMapFile, write_cqmap
+
+
+def map_content_hash(city) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{int(city.width)}x{int(city.height)}".encode("ascii"))
+    h.update(json.dumps(list(getattr(city, "_chars", [])), ensure_ascii=False).encode("utf-8"))
+    h.update(json.dumps(getattr(city, "legend", {}), sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    grid = city.grid
+    if hasattr(grid, "iter_rows"):
+        # Grilla por chunks: se hashea fila por fila sin materializarla
+        for row in grid.iter_rows():
+            h.update(row)
+    else:
+        h.update(grid)
+    return h.hexdigest()
+
+
+# ---------- Transformadas ----------
+def nearest_feature_transform(mask, width: int, height: int) -> array:
+    """
+    Para cada tile, índice (y * width + x) del tile marcado en `mask` más
+    cercano en distancia euclídea exacta; -1 si no hay ninguno.
+    Transformada separable de Felzenszwalb-Huttenlocher: O(ancho · alto).
+    """
+    W, H = int(width), int(height)
+    n = W * H
+    # 1) por columna: fila marcada más cercana
+    col_row = array("i", [-1]) * n
+    for x in range(W):
+        last = -1
+        for y in range(H):
+            i = y * W + x
+            if mask[i]:
+                last = y
+            col_row[i] = last
+        nxt = -1
+        for y in range(H - 1, -1, -1):
+            i = y * W + x
+            if mask[i]:
+                nxt = y
+            if nxt >= 0:
+                prev = col_row[i]
+                if prev < 0 or (nxt - y) < (y - prev):
+                    col_row[i] = nxt
+
+    # 2) por fila: envolvente inferior de parábolas (q - p)^2 + f(p)
+    out = array("i", [-1]) * n
+    neg_inf = float("-inf")
+    for y in range(H):
+        base = y * W
+        rows = col_row[base:base + W]
+        f = [((y - r) * (y - r) if r >= 0 else -1) for r in rows]
+        v = []
+        z = []
+        for q in range(W):
+            fq = f[q]
+            if fq < 0:
+                continue
+            while v:
+                p = v[-1]
+                s = ((fq + q * q) - (f[p] + p * p)) / (2.0 * (q - p))
+                if s <= z[-1]:
+                    v.pop()
+                    z.pop()
+                else:
+                    break
+            z.append(neg_inf if not v else s)
+            v.append(q)
+        if not v:
+            continue
+        k = 0
+        last_k = len(v) - 1
+        for q in range(W):
+            while k < last_k and z[k + 1] < q:
+                k += 1
+            p = v[k]
+            out[base + q] = rows[p] * W + p
+    return out
+
+
+_NEIGHBORS_8 = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def update_nearest_feature(layer, is_feature: Callable[[int], bool], width: int, height: int,
+                           added=(), removed=(), rebuild: Optional[Callable[[], Any]] = None) -> None:
+    """
+    Repara en sitio una transformada de vecino más cercano tras cambios
+    puntuales (is_feature ya refleja el estado nuevo). Solo recorre la celda
+    de Voronoi de cada elemento agregado/quitado, no el mapa completo.
+    `rebuild` se usa solo si la celda quitada no tiene vecinos (cubría todo).
+    """
+    W, H = int(width), int(height)
+
+    def d2(i, j):
+        dx = (i % W) - (j % W)
+        dy = (i // W) - (j // W)
+        return dx * dx + dy * dy
+
+    def neighbors(i):
+        x, y = i % W, i // W
+        for dx, dy in _NEIGHBORS_8:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < W and 0 <= ny < H:
+                yield ny * W + nx
+
+    for f in removed:
+        # Celda del elemento quitado: tiles cuyo vecino más cercano era f
+        cell = {f} if layer[f] == f else set()
+        stack = list(cell) or [f]
+        while stack:
+            i = stack.pop()
+            for n in neighbors(i):
+                if n not in cell and layer[n] == f:
+                    cell.add(n)
+                    stack.append(n)
+        candidates = set()
+        for i in cell:
+            for n in neighbors(i):
+                c = layer[n]
+                if n not in cell and c >= 0 and c != f and is_feature(c):
+                    candidates.add(c)
+        if not candidates:
+            if rebuild is not None:
+                # La celda cubría todo: recalcular completo
+                layer[:] = rebuild()
+                return
+            for i in cell:
+                layer[i] = -1
+            continue
+        for i in cell:
+            layer[i] = min(candidates, key=lambda c: d2(i, c))
+
+    for f in added:
+        if not is_feature(f):
+            continue
+        # Nueva celda: tiles donde f queda más cerca que su vecino actual
+        layer[f] = f
+        stack = [f]
+        seen = {f}
+        while stack:
+            i = stack.pop()
+            for n in neighbors(i):
+                if n in seen:
+                    continue
+                seen.add(n)
+                cur = layer[n]
+                if cur < 0 or d2(n, f) < d2(n, cur):
+                    layer[n] = f
+                    stack.append(n)
+
+
+def is_facade(blocked, width: int, height: int, i: int) -> bool:
+    if not blocked[i]:
+        return False
+    x, y = i % width, i // width
+    return ((x + 1 < width and not blocked[i + 1]) or (x > 0 and not blocked[i - 1]) or
+            (y + 1 < height and not blocked[i + width]) or (y > 0 and not blocked[i - width]))
+
+
+def facade_mask(city) -> bytearray:
+    """Edificios con al menos un vecino 4-conexo que no es edificio (fachadas)."""
+    W, H = city.width, city.height
+    blocked = city.blocked
+    mask = bytearray(W * H)
+    for y in range(H):
+        base = y * W
+        for x in range(W):
+            i = base + x
+            if not blocked[i]:
+                continue
+            if ((x + 1 < W and not blocked[i + 1]) or (x > 0 and not blocked[i - 1]) or
+                    (y + 1 < H and not blocked[i + W]) or (y > 0 and not blocked[i - W])):
+                mask[i] = 1
+    return mask
+
+
+def street_mask(city, tile: str = "C") -> bytearray:
+    code = getattr(city, "_codes", {}).get(tile)
+    if code is None:
+        return bytearray(city.width * city.height)
+    table = bytearray(256)
+    table[code] = 1
+    grid = city.grid if isinstance(city.grid, (bytes, bytearray)) else bytes(city.grid)
+    return bytearray(grid.translate(table))
+
+
+# nombre -> (tipo, constructor(city) -> buffer)
+DERIVED_LAYERS: Dict[str, tuple] = {
+    "near_facade": ("i", lambda city: nearest_feature_transform(facade_mask(city), city.width, city.height)),
+    "near_street": ("i", lambda city: nearest_feature_transform(street_mask(city), city.width, city.height)),
+}
+
+
+# Cachés abiertas: su índice pendiente se escribe al salir
+_OPEN_CACHES: "weakref.WeakSet" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches():
+    for cache in list(_OPEN_CACHES):
+        cache.flush()
+
+
+class PrecomputeCache:
+    """
+    Índice JSON + un archivo .cqmap por capa de cada hash de mapa. get_layer()
+    abre el archivo de la capa con mmap; si falta la construye y la escribe en
+    un archivo nuevo. Los usos (last_used) se anotan en memoria y el índice se
+    escribe al agregar capas, en la limpieza y en close()/flush().
+    """
+    def __init__(self, cache_directory: str = "api_cache/precompute",
+                 max_size_mb: float = 64.0, max_age_days: float = 30.0):
+        self.cache_dir = Path(cache_directory)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_cache_size = int(max_size_mb * 1024 * 1024)
+        self.max_age = timedelta(days=max_age_days)
+        self.index_file = self.cache_dir / "precompute_index.json"
+        self.index = self._load_index()
+        self._open: Dict[Tuple[str, str], CQMapFile] = {}
+        self._index_dirty = False
+        self._lock = threading.RLock()
+        _OPEN_CACHES.add(self)
+
+    def get_layer(self, map_hash: str, name: str, kind: str,
+                  build: Callable[[], Any], width: int, height: int):
+        with self._lock:
+            f = self._open_entry(map_hash, name)
+            if f is not None and f.has_layer(name):
+                try:
+                    layer = f.layer(name)
+                    self._touch(map_hash)
+                    return layer
+                except Exception as e:
+                    print(f"Capa precalculada '{name}' inválida, recalculando: {e}")
+
+            data = build()
+            try:
+                self._append_layer(map_hash, name, kind, data, width, height)
+            except Exception as e:
+                print(f"Error al guardar capa precalculada '{name}': {e}")
+            return data
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "total_entries": len(self.index),
+            "total_size_bytes": sum(e.get("size", 0) for e in self.index.values()),
+            "cache_directory": str(self.cache_dir),
+            "max_size_bytes": self.max_cache_size,
+        }
+
+    def remove(self, map_hash: str) -> bool:
+        with self._lock:
+            for key in [k for k in self._open if k[0] == map_hash]:
+                self._close_entry(key)
+            entry = self.index.pop(map_hash, None)
+            if entry is None:
+                return False
+            self._unlink_files(map_hash, entry)
+            self._save_index()
+            return True
+
+    def flush(self):
+        """Escribe el índice si hay usos anotados sin guardar."""
+        with self._lock:
+            if self._index_dirty:
+                self._save_index()
+
+    def close(self):
+        with self._lock:
+            for key in list(self._open.keys()):
+                self._close_entry(key)
+            self.flush()
+
+    # ---------- helpers privados ----------
+    def _path_for(self, map_hash: str, name: str) -> Path:
+        return self.cache_dir / f"{map_hash}.{name}.cqmap"
+
+    def _open_entry(self, map_hash: str, name: str) -> Optional[CQMapFile]:
+        key = (map_hash, name)
+        f = self._open.get(key)
+        if f is not None:
+            return f
+        path = self._path_for(map_hash, name)
+        if not path.exists():
+            return None
+        try:
+            f = CQMapFile(path)
+        except Exception as e:
+            print(f"Precálculo {map_hash}/{name} ilegible: {e}")
+            return None
+        self._open[key] = f
+        return f
+
+    def _close_entry(self, key: Tuple[str, str]):
+        f = self._open.pop(key, None)
+        if f is not None:
+            f.close()
+
+    def _append_layer(self, map_hash: str, name: str, kind: str, data, width: int, height: int):
+        # Solo se reescribe el archivo de esta capa (p. ej. si estaba corrupta)
+        self._close_entry((map_hash, name))
+        path = write_cqmap(self._path_for(map_hash, name), width, height,
+                           {"map_hash": map_hash}, [(name, kind, data)])
+        now = datetime.now().isoformat()
+        entry = self.index.get(map_hash, {})
+        if "file" in entry:
+            # Formato anterior: todas las capas en <hash>.cqmap
+            self._unlink_files(map_hash, {"file": entry["file"]})
+        layers = dict(entry.get("layers", {}))
+        layers[name] = {"file": str(path), "size": path.stat().st_size}
+        self.index[map_hash] = {
+            "layers": layers,
+            "timestamp": entry.get("timestamp", now),
+            "last_used": now,
+            "size": sum(int(info.get("size", 0)) for info in layers.values()),
+        }
+        self._save_index()
+        self._cleanup_if_needed(keep=map_hash)
+
+    def _touch(self, map_hash: str):
+        entry = self.index.get(map_hash)
+        if entry is not None:
+            entry["last_used"] = datetime.now().isoformat()
+            self._index_dirty = True
+
+    def _unlink_files(self, map_hash: str, entry: Dict[str, Any]):
+        files = [info.get("file") for info in entry.get("layers", {}).values()]
+        files.append(entry.get("file"))
+        for file in files:
+            if not file:
+                continue
+            try:
+                path = Path(file)
+                if path.exists():
+                    path.unlink()
+            except Exception as e:
+                print(f"Error al eliminar precálculo {map_hash}: {e}")
+
+    def _cleanup_if_needed(self, keep: Optional[str] = None):
+        try:
+            now = datetime.now()
+            for key, entry in list(self.index.items()):
+                if key == keep:
+                    continue
+                try:
+                    last = datetime.fromisoformat(entry.get("last_used", entry["timestamp"]))
+                except Exception:
+                    last = datetime.min
+                if now - last > self.max_age:
+                    self.remove(key)
+
+            if self.get_cache_stats()["total_size_bytes"] <= self.max_cache_size:
+                return
+            # Menos usados primero, hasta quedar bajo el 80% del límite
+            for key, _ in sorted(self.index.items(), key=lambda kv: kv[1].get("last_used", "")):
+                if key == keep:
+                    continue
+                self.remove(key)
+                if self.get_cache_stats()["total_size_bytes"] <= self.max_cache_size * 0.8:
+                    break
+        except Exception as e:
+            print(f"Error en limpieza de precálculos: {e}")
+        self.flush()
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            if self.index_file.exists():
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error al cargar índice de precálculos: {e}")
+        return {}
+
+    def _save_index(self) -> bool:
+        try:
+            with open(self.index_file, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=2, ensure_ascii=False)
+            self._index_dirty = False
+            return True
+        except Exception as e:
+            print(f"Error al guardar índice de precálculos: {e}")
+            return False
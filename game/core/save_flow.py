@@ -18,8 +18,17 @@ class SaveFlow:
             player_data = self.save_manager.serialize_player(game.player)
             city_data = self.save_manager.serialize_city(game.city)
 
+            now = float(getattr(game, "total_play_time", 0.0))
+            for courier in [game.player] + list(getattr(game, "ai_players", []) or []):
+                for order in courier.inventory.orders:
+                    # El tiempo restante se calcula a demanda; refrescarlo solo al serializar
+                    if order.accepted_at >= 0:
+                        order.time_remaining = order.remaining_time_at(now)
+
             accepted_orders_payload = [order.to_dict() for order in game.player.inventory.orders]
             pending_orders_payload = [order.to_dict() for order in game.orders_manager.pending_orders]
+            queued_orders_payload = game.orders_manager.snapshot_queued_orders()
+            ingestion_payload = game.orders_manager.snapshot_ingestion()
             canceled_orders_payload = list(getattr(game.orders_manager, "canceled_orders", []))
 
             timer_payload = {
@@ -39,8 +48,11 @@ class SaveFlow:
                 "orders": {
                     "accepted_orders": accepted_orders_payload,
                     "pending_orders": pending_orders_payload,
+                    "queued_orders": queued_orders_payload,
                     "canceled_orders": canceled_orders_payload,
+                    "ingestion": ingestion_payload,
                 },
+                "scheduler": game.scheduler.snapshot_for_save() if getattr(game, "scheduler", None) else None,
                 "game_stats": getattr(game, "game_stats", {}),
                 "timer": timer_payload,
                 "ai_players": ai_data,  # ← NUEVO
@@ -135,12 +147,14 @@ class SaveFlow:
             canceled_ids = {str(i) for i in orders_blob.get("canceled_orders", [])}
 
             # accepted
+            game.orders_manager.deadlines.clear()
             try:
-                game.player.inventory.orders = []
+                game.player.inventory.clear()
                 for it in accepted_orders:
                     try:
                         order = Order.from_dict(it)
-                        game.player.inventory.orders.append(order)
+                        game.player.inventory.insert_order(order)
+                        game.orders_manager.deadlines.register(order, game.player)
                     except Exception as e:
                         print(f"Pedido inválido en accepted_orders: {it}. Error: {e}")
             except Exception:
@@ -160,6 +174,27 @@ class SaveFlow:
             except Exception:
                 pass
 
+            # cola programada + agenda (liberaciones pendientes)
+            try:
+                game.orders_manager.canceled_orders |= canceled_ids
+                game.orders_manager.restore_queued_orders(orders_blob.get("queued_orders", []))
+                scheduler = getattr(game, "scheduler", None)
+                if scheduler:
+                    scheduler.restore(save_data.get("scheduler"))
+                    scheduler.now = max(scheduler.now, float(getattr(game, "total_play_time", 0.0)))
+                    # Reprogramar eventos no persistentes respecto al tiempo restaurado
+                    if getattr(game, "weather_system", None):
+                        game.weather_system.attach_scheduler(scheduler)
+                # Resto del stream de pedidos que no alcanzó a ingerirse antes de guardar
+                game.orders_manager.resume_ingestion(
+                    orders_blob.get("ingestion"), getattr(game, "api_client", None),
+                    getattr(game, "files_conf", None), getattr(game, "app_config", None),
+                    getattr(game, "city", None), getattr(game, "renderer", None),
+                    getattr(game, "debug", False),
+                )
+            except Exception as e:
+                print(f"Error al restaurar la cola de pedidos: {e}")
+
             # reconstruir puertas
             try:
                 self._rebuild_doors_for_orders(game)
@@ -243,11 +278,12 @@ class SaveFlow:
                 ai.orders_cancelled = int(ai_save.get("orders_cancelled", 0))
 
                 # Restaurar inventario
-                ai.inventory.orders = []
+                ai.inventory.clear()
                 for order_dict in ai_save.get("inventory", []):
                     try:
                         order = Order.from_dict(order_dict)
-                        ai.inventory.orders.append(order)
+                        ai.inventory.insert_order(order)
+                        game.orders_manager.deadlines.register(order, ai)
                     except Exception as e:
                         print(f"Error restaurando pedido de IA: {e}")
 
@@ -299,7 +335,9 @@ class SaveFlow:
 
         # limpiar marcadores actuales (los volveremos a crear desde los pedidos)
         try:
-            if hasattr(renderer, "door_positions") and renderer.door_positions is not None:
+            if hasattr(renderer, "clear_doors"):
+                renderer.clear_doors()
+            elif hasattr(renderer, "door_positions") and renderer.door_positions is not None:
                 renderer.door_positions.clear()
         except Exception:
             pass
@@ -318,12 +356,8 @@ class SaveFlow:
         if om:
             for o in getattr(om, "pending_orders", []) or []:
                 add_for_order(o)
-            for item in getattr(om, "_orders_queue", []) or []:
-                try:
-                    _, o = item
-                    add_for_order(o)
-                except Exception:
-                    pass
+            for o in om.queued_orders():
+                add_for_order(o)
 
         player = getattr(game, "player", None)
         inv = getattr(player, "inventory", None) if player else None
@@ -50,7 +50,7 @@ class SaveManager:
                 "version": str(city.version),
                 "goal": float(city.goal),
             },
-            "tiles": city.tiles,
+            "tiles": city.tiles_as_lists() if hasattr(city, "tiles_as_lists") else city.tiles,
             "legend": city.legend,
         }
 
@@ -0,0 +1,180 @@
+import heapq
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class ScheduledEvent:
+    """
+    Evento agendado sobre el tiempo de juego (GameTimer.total_play_time).
+    - kind: nombre del handler registrado que lo procesa.
+    - payload: datos serializables (se guardan junto con la partida).
+    - interval: si es > 0 el evento se repite cada `interval` segundos.
+    - persistent: si es False no se incluye en el guardado (lo recrea su dueño).
+    """
+    __slots__ = ("event_id", "at", "kind", "payload", "interval", "persistent", "cancelled")
+
+    def __init__(self, event_id: int, at: float, kind: str, payload: Any = None,
+                 interval: float = 0.0, persistent: bool = True):
+        self.event_id = event_id
+        self.at = float(at)
+        self.kind = kind
+        self.payload = payload
+        self.interval = float(interval)
+        self.persistent = bool(persistent)
+        self.cancelled = False
+
+
+class EventScheduler:
+    """
+    Agenda central basada en un min-heap (tiempo, secuencia, id).
+    El trabajo por frame es O(eventos vencidos · log n) en lugar de sondear
+    cada temporizador. La cancelación es perezosa: el evento se marca y se
+    descarta al salir del heap.
+    """
+    def __init__(self, debug: bool = False):
+        self.debug = bool(debug)
+        self.now: float = 0.0
+        self._heap: List[Tuple[float, int, int]] = []
+        self._events: Dict[int, ScheduledEvent] = {}
+        self._handlers: Dict[str, Callable[[Any, float], None]] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._cancelled = 0
+
+    # ---------- Handlers ----------
+    def register_handler(self, kind: str, handler: Callable[[Any, float], None]):
+        """handler(payload, now) se invoca cuando vence un evento de tipo `kind`."""
+        self._handlers[str(kind)] = handler
+
+    def unregister_handler(self, kind: str):
+        self._handlers.pop(str(kind), None)
+
+    # ---------- Agenda ----------
+    def schedule_at(self, at: float, kind: str, payload: Any = None,
+                    interval: float = 0.0, persistent: bool = True) -> int:
+        event = ScheduledEvent(next(self._ids), at, str(kind), payload, interval, persistent)
+        self._events[event.event_id] = event
+        heapq.heappush(self._heap, (event.at, next(self._seq), event.event_id))
+        return event.event_id
+
+    def schedule_in(self, delay: float, kind: str, payload: Any = None,
+                    persistent: bool = True) -> int:
+        return self.schedule_at(self.now + max(0.0, float(delay)), kind, payload, persistent=persistent)
+
+    def schedule_every(self, interval: float, kind: str, payload: Any = None,
+                       first_at: Optional[float] = None, persistent: bool = False) -> int:
+        interval = max(1e-3, float(interval))
+        at = self.now + interval if first_at is None else float(first_at)
+        return self.schedule_at(at, kind, payload, interval=interval, persistent=persistent)
+
+    def cancel(self, event_id: Optional[int]) -> bool:
+        event = self._events.pop(event_id, None) if event_id is not None else None
+        if event is None:
+            return False
+        event.cancelled = True
+        self._cancelled += 1
+        if self._cancelled > 64 and self._cancelled > len(self._heap) // 2:
+            self._compact()
+        return True
+
+    def cancel_kind(self, kind: str) -> int:
+        ids = [eid for eid, ev in self._events.items() if ev.kind == kind]
+        for eid in ids:
+            self.cancel(eid)
+        return len(ids)
+
+    def get_event(self, event_id: Optional[int]) -> Optional[ScheduledEvent]:
+        return self._events.get(event_id) if event_id is not None else None
+
+    def next_time(self) -> Optional[float]:
+        self._drop_cancelled_head()
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def clear(self):
+        self._heap.clear()
+        self._events.clear()
+        self._cancelled = 0
+
+    # ---------- Avance ----------
+    def run_until(self, now: float) -> int:
+        """Dispara en orden todos los eventos con at <= now. Retorna cuántos se procesaron."""
+        now = float(now)
+        self.now = now
+        fired = 0
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, event_id = heapq.heappop(heap)
+            event = self._events.get(event_id)
+            if event is None:
+                self._cancelled = max(0, self._cancelled - 1)
+                continue
+
+            if event.interval > 0:
+                # Periódico: reprogramar sin acumular disparos atrasados
+                next_at = event.at + event.interval
+                if next_at <= now:
+                    next_at = now + event.interval
+                event.at = next_at
+                heapq.heappush(heap, (next_at, next(self._seq), event_id))
+            else:
+                del self._events[event_id]
+
+            handler = self._handlers.get(event.kind)
+            if handler is None:
+                if self.debug:
+                    print(f"[Scheduler] Sin handler para evento '{event.kind}', descartado")
+                continue
+            try:
+                handler(event.payload, now)
+            except Exception as e:
+                if self.debug:
+                    print(f"[Scheduler] Error en handler '{event.kind}': {e}")
+            fired += 1
+        return fired
+
+    # ---------- Guardado ----------
+    def snapshot_for_save(self) -> dict:
+        events = sorted(
+            (ev for ev in self._events.values() if ev.persistent),
+            key=lambda ev: ev.at
+        )
+        return {
+            "now": self.now,
+            "events": [
+                {"at": ev.at, "kind": ev.kind, "payload": ev.payload, "interval": ev.interval}
+                for ev in events
+            ],
+        }
+
+    def restore(self, data: Optional[dict]):
+        """
+        Agrega los eventos guardados a la agenda actual. Los eventos no
+        persistentes (clima, undo, etc.) los vuelve a registrar su dueño.
+        """
+        if not data:
+            return
+        self.now = float(data.get("now", self.now))
+        for it in data.get("events", []) or []:
+            try:
+                self.schedule_at(
+                    float(it["at"]), str(it["kind"]), it.get("payload"),
+                    interval=float(it.get("interval", 0.0)), persistent=True
+                )
+            except Exception as e:
+                if self.debug:
+                    print(f"[Scheduler] Evento inválido en guardado: {it}. Error: {e}")
+
+    # ---------- helpers privados ----------
+    def _drop_cancelled_head(self):
+        heap = self._heap
+        while heap and heap[0][2] not in self._events:
+            heapq.heappop(heap)
+            self._cancelled = max(0, self._cancelled - 1)
+
+    def _compact(self):
+        self._heap = [item for item in self._heap if item[2] in self._events]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
@@ -94,31 +94,88 @@ def _is_building_perimeter(city, col, row) -> bool:
                 return True
     return False
 
+def nearest_from_layer(city, name: str, x, y):
+    """
+    Consulta una capa derivada de vecino más cercano (ver CityMap.derived_layer).
+    Retorna (col, row), None si no hay ninguno, o False si la capa no aplica.
+    """
+    if not hasattr(city, "derived_layer"):
+        return False
+    ix, iy = int(x), int(y)
+    if ix != x or iy != y or not (0 <= ix < city.width and 0 <= iy < city.height):
+        return False
+    try:
+        layer = city.derived_layer(name)
+        if layer is None:
+            return False
+        idx = layer[iy * city.width + ix]
+    except Exception:
+        return False
+    if idx < 0:
+        return None
+    return (idx % city.width, idx // city.width)
+
+
 def find_nearest_building(city, x, y):
+    # 1) Fachada más cercana, precalculada por mapa (transformada de distancia)
+    nearest = nearest_from_layer(city, "near_facade", x, y)
+    if nearest:
+        return nearest
+    if nearest is False:
+        if getattr(city, "is_chunked", False):
+            # Mapa por chunks: recorrer todo el mapa cargaría todos los chunks
+            return _ring_nearest_facade(city, x, y)
+        nearest = _scan_nearest_facade(city, x, y)
+        if nearest is not None:
+            return nearest
+
+    # 2) Fallback: cualquier B (por si no hay fachadas)
     min_dist = float("inf")
     nearest = None
     for row in range(city.height):
         for col in range(city.width):
-            if _is_building_perimeter(city, col, row):
+            if city.tiles[row][col] == "B":
                 dist = (col - x) ** 2 + (row - y) ** 2
                 if dist < min_dist:
                     min_dist = dist
                     nearest = (col, row)
-    if nearest is not None:
-        return nearest
+    return nearest
 
-    # 2) Fallback: cualquier B (por si no hay fachadas)
+
+def _scan_nearest_facade(city, x, y):
     min_dist = float("inf")
     nearest = None
     for row in range(city.height):
         for col in range(city.width):
-            if city.tiles[row][col] == "B":
+            if _is_building_perimeter(city, col, row):
                 dist = (col - x) ** 2 + (row - y) ** 2
                 if dist < min_dist:
                     min_dist = dist
                     nearest = (col, row)
     return nearest
 
+def _ring_nearest_facade(city, x, y, max_radius: int = 64):
+    """Búsqueda por anillos crecientes alrededor de (x, y), acotada a max_radius."""
+    x0, y0 = int(x), int(y)
+    best = None
+    best_d2 = float("inf")
+    for r in range(0, max_radius + 1):
+        for dy in range(-r, r + 1):
+            row = y0 + dy
+            if not 0 <= row < city.height:
+                continue
+            cols = range(x0 - r, x0 + r + 1) if abs(dy) == r else (x0 - r, x0 + r)
+            for col in cols:
+                if 0 <= col < city.width and _is_building_perimeter(city, col, row):
+                    d2 = (col - x) ** 2 + (row - y) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = (col, row), d2
+        # Un anillo más lejos ya no puede mejorar lo encontrado
+        if best is not None and r * r >= best_d2:
+            return best
+    return best
+
+
 def get_timestamp() -> str:
     return datetime.now().isoformat()
 
@@ -5,6 +5,7 @@ from game.core.utils import  lerp
 from typing import Dict, Any, Tuple
 from pathlib import Path
 
+WEATHER_TRANSITION_EVENT = "weather_transition"
 
 class WeatherCondition:
     """Condiciones climáticas disponibles"""
@@ -204,6 +205,11 @@ class WeatherSystem:
         self.current_burst_index = 0
         self.debug = bool(config.get("debug", False))
 
+        # Agenda central (opcional): si existe, el cambio de burst lo dispara un evento
+        self._scheduler = None
+        self._transition_event_id = None
+        self.time_in_current_burst = 0.0
+
         # Cargar datos iniciales
         self._load_weather_data()
 
@@ -271,6 +277,28 @@ class WeatherSystem:
         self.burst_duration = random.uniform(self.burst_duration_min, self.burst_duration_max)
         self.time_in_current_burst = 0.0
 
+    def attach_scheduler(self, scheduler):
+        """Programa el fin del burst actual en la agenda en lugar de sondearlo cada frame."""
+        self._scheduler = scheduler
+        scheduler.register_handler(WEATHER_TRANSITION_EVENT, self._on_transition_event)
+        self._schedule_next_transition()
+
+    def _schedule_next_transition(self):
+        if not self._scheduler:
+            return
+        self._scheduler.cancel(self._transition_event_id)
+        burst = float(getattr(self, "burst_duration", self.burst_duration_min))
+        remaining = max(0.0, burst - float(self.time_in_current_burst))
+        # Evento no persistente: el clima no se guarda, se recrea al cargar
+        self._transition_event_id = self._scheduler.schedule_in(
+            remaining, WEATHER_TRANSITION_EVENT, persistent=False
+        )
+
+    def _on_transition_event(self, _payload, _now: float):
+        self._transition_event_id = None
+        self._transition_to_next_weather()
+        self._schedule_next_transition()
+
     def update(self, delta_time: float, player):
         """Actualizar el sistema de clima"""
         # Actualizar transición si está activa
@@ -285,8 +313,8 @@ class WeatherSystem:
         # Actualizar tiempo en burst actual
         self.time_in_current_burst += delta_time
 
-        # Verificar si debe cambiar el clima
-        if self.time_in_current_burst >= self.burst_duration:
+        # Verificar si debe cambiar el clima (sin agenda central)
+        if not self._scheduler and self.time_in_current_burst >= self.burst_duration:
             self._transition_to_next_weather()
             self.time_in_current_burst = 0.0
 
@@ -446,6 +474,7 @@ class WeatherSystem:
             self.transitioning = True
             self.transition_progress = 0.0
             self.time_in_current_burst = 0.0
+            self._schedule_next_transition()
 
             if self.debug:
                 print(f"Clima forzado a: {condition} (intensidad: {self.current_intensity})")
@@ -570,7 +570,7 @@ class AIPlayer(Player):
         try:
             self.inventory.add_order(order)
         except Exception:
-            self.inventory.orders.append(order)
+            self.inventory.insert_order(order)
 
         try:
             if getattr(order, "status", "") not in ("picked_up", "delivered"):
@@ -582,8 +582,8 @@ class AIPlayer(Player):
 
     def update_order_timers(self, current_play_time: float):
         """
-        CRÍTICO: Actualiza timers de todos los pedidos.
-        Debe llamarse cada frame desde game.py.
+        Fallback sin índice de vencimientos (p. ej. AIManager): recorre el inventario.
+        Con CourierGame los vencimientos llegan desde OrdersManager.deadlines.
         """
         if not self.inventory.orders:
             return
@@ -595,25 +595,29 @@ class AIPlayer(Player):
 
                 # Verificar expiración
                 if order.time_remaining <= 0 and order.status != "delivered":
-                    if self.debug:
-                        print(f"[AI-{self.difficulty}] ⏰ Pedido {order.id[:8]} EXPIRÓ")
-
-                    # Penalización idéntica a Player
-                    self.reputation = max(0, self.reputation - 6)
-                    self.orders_cancelled += 1
-                    self.consecutive_on_time = 0
-
-                    # Remover pedido
-                    self.inventory.remove_order(order.id)
-
-                    # Notificar
-                    if self._last_game_ref and hasattr(self._last_game_ref, 'show_notification'):
-                        try:
-                            self._last_game_ref.show_notification(
-                                f"IA perdió {order.id[:8]} (-6 rep)", 2.0
-                            )
-                        except:
-                            pass
+                    self.expire_order(order)
+
+    def expire_order(self, order):
+        """Aplica la penalización por pedido vencido y lo remueve del inventario."""
+        if self.debug:
+            print(f"[AI-{self.difficulty}] ⏰ Pedido {order.id[:8]} EXPIRÓ")
+
+        # Penalización idéntica a Player
+        self.reputation = max(0, self.reputation - 6)
+        self.orders_cancelled += 1
+        self.consecutive_on_time = 0
+
+        # Remover pedido
+        self.inventory.remove_order(order.id)
+
+        # Notificar
+        if self._last_game_ref and hasattr(self._last_game_ref, 'show_notification'):
+            try:
+                self._last_game_ref.show_notification(
+                    f"IA perdió {order.id[:8]} (-6 rep)", 2.0
+                )
+            except:
+                pass
 
     # ==================== ACTUALIZACIÓN ====================
 
@@ -666,7 +670,8 @@ class AIPlayer(Player):
         """
         game._last_delta_time = delta_time
         self.update(delta_time)
-        self.update_order_timers(game.total_play_time)
+        if getattr(getattr(game, "orders_manager", None), "deadlines", None) is None:
+            self.update_order_timers(game.total_play_time)
         self._decision_cooldown -= delta_time
         if self._decision_cooldown <= 0:
             self._decision_cooldown = self._decision_interval
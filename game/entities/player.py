@@ -1,4 +1,5 @@
 import math
+import time
 from typing import Dict, Any, Tuple, Optional
 from collections import deque
 from game.core.utils import clamp, normalize_angle
@@ -116,13 +117,14 @@ class Player:
                     'priority': order.priority,
                     'deadline': order.deadline,
                     'time_limit': order.time_limit,
-                    'picked_up_at': order.picked_up_at.isoformat() if order.picked_up_at else None
+                    'picked_up_ts': order.picked_up_ts,
+                    'accepted_at': order.accepted_at,
                 }
                 for order in self.inventory.orders
             ],
             'inventory_current_index': int(self.inventory.current_index),
             'inventory_sort_mode': str(self.inventory.sort_mode),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': time.time()
         }
 
         self.undo_stack.append(state)
@@ -132,8 +134,11 @@ class Player:
 
     def save_undo_state_if_needed(self, current_time: float):
         if self.should_save_undo_state(current_time):
-            self._save_undo_state()
-            self.last_undo_save_time = current_time
+            self.record_undo_state(current_time)
+
+    def record_undo_state(self, current_time: float):
+        self._save_undo_state()
+        self.last_undo_save_time = current_time
 
     def can_undo(self, current_time: float) -> bool:
         if len(self.undo_stack) < 2:
@@ -182,7 +187,7 @@ class Player:
         self._restore_inventory(state)
 
     def _restore_inventory(self, state: Dict[str, Any]):
-        self.inventory.orders.clear()
+        self.inventory.clear()
 
         for order_data in state['inventory_snapshot']:
             pos_p = order_data.get('pickup_pos', (0, 0))
@@ -205,10 +210,10 @@ class Player:
             )
             order.status = order_data['status']
 
-            if order_data.get('picked_up_at'):
-                order.picked_up_at = datetime.fromisoformat(order_data['picked_up_at'])
+            order.picked_up_ts = order_data.get('picked_up_ts')
+            order.accepted_at = float(order_data.get('accepted_at', -1.0))
 
-            self.inventory.orders.append(order)
+            self.inventory.insert_order(order)
 
         self.inventory.current_index = int(state.get('inventory_current_index', 0))
         self.inventory.sort_mode = state.get('inventory_sort_mode', 'priority')
@@ -222,10 +227,14 @@ class Player:
             'max_undos': self.max_undo_steps,
             'can_undo': self.can_undo(datetime.now().timestamp()),
             'last_undo_time': self.last_undo_time,
-            'oldest_state': self.undo_stack[0]['timestamp'] if self.undo_stack else None,
-            'newest_state': self.undo_stack[-1]['timestamp'] if self.undo_stack else None
+            'oldest_state': self._ts_iso(self.undo_stack[0]['timestamp']) if self.undo_stack else None,
+            'newest_state': self._ts_iso(self.undo_stack[-1]['timestamp']) if self.undo_stack else None
         }
 
+    @staticmethod
+    def _ts_iso(ts: float) -> str:
+        return datetime.fromtimestamp(ts).isoformat()
+
     def add_order_to_inventory(self, order: Order) -> bool:
         success = self.inventory.add_order(order)
         if success:
@@ -294,13 +303,13 @@ class Player:
         self.earnings += amount
 
     def update_reputation_for_delivery(self, order):
-        if not hasattr(order, 'picked_up_at') or order.picked_up_at is None:
+        picked_up_ts = getattr(order, 'picked_up_ts', None)
+        if picked_up_ts is None:
             rep_change = self.rep_changes.get("delivery_on_time", 3)
             if self.debug:
                 print(f"Pedido {order.id} sin timestamp de recogida, usando rep neutral: +{rep_change}")
         else:
-            now = datetime.now(order.picked_up_at.tzinfo) if order.picked_up_at.tzinfo else datetime.now()
-            time_elapsed = (now - order.picked_up_at).total_seconds()
+            time_elapsed = time.time() - picked_up_ts
 
             time_limit = float(getattr(order, 'time_limit', 600.0))
 
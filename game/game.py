@@ -8,6 +8,9 @@ from game.input.handler import InputHandler
 from game.ui.hud import HUDRenderer
 from game.entities.player import Player
 from game.rendering.world_renderer import RayCastRenderer
+from game.rendering.quality import QualityGovernor
+from game.ui.text_cache import TEXT_CACHE
+from game.ui.static_frame import StaticFrame
 from game.ui.minimap import MinimapRenderer
 from game.ui.notifications import NotificationManager
 from game.core.weather import WeatherSystem
@@ -15,6 +18,7 @@ from game.core.gamestate import GameStateManager, GameState
 from game.core.save_manager import SaveManager
 from game.core.audio import AudioManager
 from game.core.timer import GameTimer
+from game.core.scheduler import EventScheduler
 from game.core.orders_manager import OrdersManager
 from game.core.delivery import DeliverySystem
 from game.core.player_controller import PlayerController
@@ -35,6 +39,8 @@ try:
 except Exception:
     AIManager = None
 
+UNDO_SNAPSHOT_EVENT = "undo_snapshot"
+
 
 class CourierGame(arcade.Window):
     def __init__(self, app_config: dict):
@@ -66,6 +72,7 @@ class CourierGame(arcade.Window):
         self.city: Optional[CityMap] = None
         self.player: Optional[Player] = None
         self.renderer: Optional[RayCastRenderer] = None
+        self.quality_governor: Optional[QualityGovernor] = None
         self.weather_system: Optional[WeatherSystem] = None
 
         self.minimap: Optional[MinimapRenderer] = None
@@ -80,6 +87,8 @@ class CourierGame(arcade.Window):
         self.time_remaining = self.time_limit
 
         self.timer = GameTimer(time_limit_seconds=self.time_limit)
+        # Agenda central de eventos sobre total_play_time (liberación de pedidos, clima, undo)
+        self.scheduler = EventScheduler()
 
         self.pickup_radius = self.app_config.get("game", {}).get("pickup_radius", 1.5)
 
@@ -103,7 +112,14 @@ class CourierGame(arcade.Window):
         self.orders_data = {}
         self.game_stats = {}
 
-        self.set_update_rate(1 / 60)
+        self._active_update_rate = 1 / 60
+        self.set_update_rate(self._active_update_rate)
+        # Menús, pausa y ajustes: frame cacheado y tasa de update/draw reducida
+        self.idle_fps = float(display.get("idle_fps", 20))
+        self._idle_rate = False
+        self._input_serial = 0
+        self.static_frame = StaticFrame(enabled=bool(display.get("static_frame_cache", True)),
+                                        debug=bool(app_config.get("debug", False)))
 
         # Textos HUD legacy (HUDRenderer ya maneja, se mantienen por compatibilidad)
         self.hud_fps = arcade.Text("", 10, self.height - 20, arcade.color.WHITE, 12)
@@ -216,8 +232,15 @@ class CourierGame(arcade.Window):
             self._remove_all_ai_players()
         except Exception:
             pass
-        self.city = None
+        if self.renderer is not None and hasattr(self.renderer, "close"):
+            self.renderer.close()
         self.renderer = None
+        # El worker de ingesta retiene la ciudad y el archivo de pedidos hasta que se detiene
+        self.orders_manager.cancel_ingestion()
+        if self.city is not None:
+            self.city.close_precompute()
+        self.city = None
+        self.quality_governor = None
         self.weather_system = None
         if self.api_client:
             self.api_client.__exit__(None, None, None)
@@ -244,11 +267,22 @@ class CourierGame(arcade.Window):
         t1 = time.perf_counter()
         self._perf_accum_game["api"] += (t1 - t0)
 
+        self.scheduler = EventScheduler(debug=self.debug)
+        self.scheduler.register_handler(UNDO_SNAPSHOT_EVENT, self._on_undo_snapshot_event)
+
+        if self.city is not None:
+            self.city.close_precompute()
         self.city = CityMap(self.api_client, self.app_config)
         self.city.load_map()
         sx, sy = self.city.get_spawn_position()
         self.player = Player(sx, sy, self.app_config.get("player", {}))
+        self.scheduler.schedule_every(self.player.undo_save_interval, UNDO_SNAPSHOT_EVENT)
+        if self.renderer is not None and hasattr(self.renderer, "close"):
+            self.renderer.close()
         self.renderer = RayCastRenderer(self.city, self.app_config)
+        quality_conf = dict(self.app_config.get("rendering", {}).get("adaptive_quality", {}) or {})
+        quality_conf.setdefault("debug", self.debug)
+        self.quality_governor = QualityGovernor(self.renderer, quality_conf)
 
         self.minimap = MinimapRenderer(self.city, self.app_config)
         try:
@@ -258,6 +292,7 @@ class CourierGame(arcade.Window):
 
         t0 = time.perf_counter()
         self.weather_system = WeatherSystem(self.api_client, self.app_config)
+        self.weather_system.attach_scheduler(self.scheduler)
         t1 = time.perf_counter()
         self._perf_accum_game["weather"] += (t1 - t0)
 
@@ -265,6 +300,7 @@ class CourierGame(arcade.Window):
         if hasattr(self, 'width') and hasattr(self, 'height'):
             self.orders_window.ensure_initial_position(self.width, self.height)
         self.orders_manager.attach_window(self.orders_window)
+        self.orders_manager.attach_scheduler(self.scheduler, lambda msg: self.show_notification(msg))
 
         if hasattr(self.renderer, "debug"):
             self.renderer.debug = bool(self.app_config.get("debug", False))
@@ -320,8 +356,7 @@ class CourierGame(arcade.Window):
 
         for ai in self.ai_players:
             try:
-                # 1. Actualizar timers de pedidos (CRÍTICO)
-                ai.update_order_timers(self.total_play_time)
+                # 1. Timers de pedidos: los despacha _handle_expired_orders desde el índice
 
                 # 2. Actualizar física y decisiones
                 if hasattr(ai, "update_ai"):
@@ -358,6 +393,16 @@ class CourierGame(arcade.Window):
         if self.ai_enabled:
             self._add_ai_player(self.ai_difficulty)
 
+    def _handle_expired_orders(self):
+        for order, courier in self.orders_manager.pop_expired_orders(self.total_play_time):
+            if courier is self.player:
+                if hasattr(self.player, "cancel_order"):
+                    self.player.cancel_order()
+                self.player.remove_order_from_inventory(order.id)
+                self.show_notification(f"Pedido {order.id} expiró (-4 reputación)")
+            elif hasattr(courier, "expire_order"):
+                courier.expire_order(order)
+
     # ================= Notificaciones / HUD =================
 
     def show_notification(self, message: str, duration: float = 2.0):
@@ -374,7 +419,31 @@ class CourierGame(arcade.Window):
 
     def on_draw(self):
         self.clear()
+        TEXT_CACHE.begin_frame()
         state = self.state_manager.current_state
+        key = self._static_frame_key(state)
+        if key is None:
+            self.static_frame.invalidate()
+            self._draw_state(state)
+        else:
+            self.static_frame.draw(key, lambda: self._draw_state(state), self.background_color)
+        self._draw_notifications()
+
+    def _static_frame_key(self, state):
+        """Clave del frame de una pantalla estática; None si la escena cambia sola (juego en curso)."""
+        sm = self.state_manager
+        if state == GameState.MAIN_MENU and sm.main_menu:
+            screen = sm.main_menu
+        elif state == GameState.PAUSED:
+            screen = self.score_screen if self.game_over_active and self.score_screen else sm.pause_menu
+        elif state == GameState.SETTINGS and sm.settings_menu:
+            screen = sm.settings_menu
+        else:
+            return None
+        token = screen.frame_key() if hasattr(screen, "frame_key") else None
+        return (state, id(screen), token, self.width, self.height, self._input_serial, bool(self.debug))
+
+    def _draw_state(self, state):
         if state == GameState.MAIN_MENU and self.state_manager.main_menu:
             self.state_manager.main_menu.draw()
         elif state == GameState.PLAYING:
@@ -388,7 +457,6 @@ class CourierGame(arcade.Window):
         elif state == GameState.SETTINGS:
             if self.state_manager.settings_menu:
                 self.state_manager.settings_menu.draw()
-        self._draw_notifications()
 
     def _draw_game(self):
         if not self.renderer or not self.player:
@@ -425,6 +493,10 @@ class CourierGame(arcade.Window):
     def _record_timer_undo_snapshot(self):
         self._undo_timer_snapshots.append((self.total_play_time, self.time_remaining))
 
+    def _on_undo_snapshot_event(self, _payload, now: float):
+        if self.player:
+            self.player.record_undo_state(now)
+
     def _restore_timer_undo(self):
         if self._undo_timer_snapshots:
             tp, tr = self._undo_timer_snapshots.pop()
@@ -437,6 +509,7 @@ class CourierGame(arcade.Window):
 
     def on_update(self, delta_time: float):
         self._last_frame_delta = delta_time
+        self._update_idle_rate()
         self.notifications.update(delta_time)
 
         if self.state_manager.current_state == GameState.SETTINGS:
@@ -451,11 +524,12 @@ class CourierGame(arcade.Window):
         self.total_play_time = self.timer.total_play_time
         self.time_remaining = self.timer.time_remaining
 
-        if self.player:
-            self.player.save_undo_state_if_needed(time.time())
-
         self.game_rules.check_and_handle(self)
-        self.orders_manager.release_orders(self.total_play_time, lambda msg: self.show_notification(msg))
+        # Dispara solo los eventos vencidos: liberación de pedidos, cambio de clima, snapshots de undo
+        t0 = time.perf_counter()
+        self.scheduler.run_until(self.total_play_time)
+        self.orders_manager.pump_ingestion(self.total_play_time)
+        self._perf_accum_game["orders"] += (time.perf_counter() - t0)
         self.pending_orders = self.orders_manager.pending_orders
 
         if self.player and hasattr(self.player, 'inventory'):
@@ -470,6 +544,8 @@ class CourierGame(arcade.Window):
         self.frame_times.append(delta_time)
         if len(self.frame_times) > 240:
             self.frame_times.pop(0)
+        if self.quality_governor:
+            self.quality_governor.update(delta_time, self.frame_times)
 
         if not self.player or not self.city:
             return
@@ -482,6 +558,12 @@ class CourierGame(arcade.Window):
 
         self.player.update(delta_time)
 
+        # Mapas por chunks: cargar lo que rodea a jugador e IA antes de que lo pidan
+        if self.city.is_chunked:
+            points = [(self.player.x, self.player.y)]
+            points.extend((ai.x, ai.y) for ai in (getattr(self, "ai_players", None) or []))
+            self.city.prefetch_around(points)
+
         if hasattr(self, 'ai_players') and self.ai_players:
             for ai in self.ai_players:
                 ai.update_ai(delta_time, self)
@@ -503,20 +585,14 @@ class CourierGame(arcade.Window):
             self.renderer.debug = bool(self.debug)
         if getattr(self, "minimap", None) and hasattr(self.minimap, "set_debug"):
             self.minimap.set_debug(bool(self.debug))
+        TEXT_CACHE.debug = bool(self.debug)
 
+        # Vencimientos: solo se tocan los pedidos cuyo deadline ya pasó (jugador e IA)
         try:
-            if self.player and getattr(self.player, "inventory", None):
-                for o in list(self.player.inventory.orders):
-                    if getattr(o, "accepted_at", -1.0) >= 0:
-                        elapsed = max(0.0, self.total_play_time - o.accepted_at)
-                        o.update_time_remaining(elapsed)
-                        if o.is_expired():
-                            if hasattr(self.player, "cancel_order"):
-                                self.player.cancel_order()
-                            self.player.remove_order_from_inventory(o.id)
-                            self.show_notification(f"Pedido {o.id} expiró (-4 reputación)")
-        except Exception:
-            pass
+            self._handle_expired_orders()
+        except Exception as e:
+            if self.debug:
+                print(f"Error procesando vencimientos: {e}")
 
         if self.ai_enabled:
             self._update_ai_players(delta_time)
@@ -524,9 +600,23 @@ class CourierGame(arcade.Window):
         if self.debug:
             self._log_ai_stats()
 
+    def _update_idle_rate(self):
+        """En menús, pausa y ajustes nada se anima: update y draw bajan a idle_fps."""
+        idle = self.state_manager.current_state in (GameState.MAIN_MENU, GameState.PAUSED, GameState.SETTINGS)
+        if idle == self._idle_rate or self.idle_fps <= 0:
+            return
+        self._idle_rate = idle
+        rate = 1.0 / self.idle_fps if idle else self._active_update_rate
+        self.set_update_rate(rate)
+        if hasattr(self, "set_draw_rate"):
+            self.set_draw_rate(rate)
+        if self.debug:
+            print(f"[Game] Tasa de update/draw: {1.0 / rate:.0f} Hz")
+
     # ================= Input =================
 
     def on_key_press(self, symbol: int, modifiers: int):
+        self._input_serial += 1
         if symbol == arcade.key.ESCAPE:
             if self.state_manager.current_state == GameState.PAUSED and self.game_over_active and self.score_screen:
                 if self.score_screen.handle_key_press(symbol, modifiers):
@@ -157,6 +157,13 @@ class InputHandler:
                 game.show_notification(f"IA {status}", 1.5)
                 return True
 
+                # F6: Alternar render inmediato / framebuffer por software (comparar en el overlay)
+            elif symbol == arcade.key.F6:
+                if getattr(game, "renderer", None) and hasattr(game.renderer, "toggle_render_mode"):
+                    mode = game.renderer.toggle_render_mode()
+                    game.show_notification(f"Render: {mode}", 1.5)
+                return True
+
         return False
 
     def on_key_release(self, symbol: int, modifiers: int) -> bool:
@@ -7,8 +7,17 @@ from pathlib import Path
 class AISpriteRenderer:
     """
     Renderiza sprites de AI considerando la perspectiva del jugador.
+
+    Las 8 direcciones se cargan una sola vez como texturas compartidas (en el
+    atlas del SpriteList) y hay un único SpriteList con un sprite por AI al
+    que solo se le cambia la textura. Con el depth buffer de paredes del
+    raycaster se descartan las AIs ocultas y se recortan (scissor) las que
+    quedan parcialmente detrás de una pared.
     """
 
+    DIRECTIONS = ("down", "down_right", "right", "up_right",
+                  "up", "up_left", "left", "down_left")
+
     def __init__(self, app_config: dict):
         self.debug = bool(app_config.get("debug", False))
 
@@ -16,58 +25,70 @@ class AISpriteRenderer:
         self.sprite_scale_base = 200.0
         self.min_sprite_size = 30
 
-        self.sprite_pool = self._create_sprite_pool()
+        self.textures = self._load_textures()
+        self.sprite_list = arcade.SpriteList()
+        self._sprites: List[Any] = []
+        self._preload_atlas()
 
-    def _create_sprite_pool(self) -> dict:
-        """Carga sprites con fallback a 4 direcciones"""
-        pool = {}
-
-        directions_8 = ["down", "down_right", "right", "up_right",
-                        "up", "up_left", "left", "down_left"]
+        # Estadísticas del último frame
+        self.last_draw_calls = 0
+        self.last_culled = 0
+        self.last_clipped = 0
 
+    def _load_textures(self) -> dict:
+        """Carga texturas con fallback a 4 direcciones (cada archivo una sola vez)"""
         fallback_map = {
             "down_right": "right",
             "up_right": "right",
             "up_left": "left",
             "down_left": "left"
         }
-
-        for direction in directions_8:
+        loaded = {}
+        textures = {}
+        for direction in self.DIRECTIONS:
             path = f"assets/images/ai_cyclist_{direction}.png"
+            if not Path(path).exists() and direction in fallback_map:
+                path = f"assets/images/ai_cyclist_{fallback_map[direction]}.png"
+            if not Path(path).exists():
+                textures[direction] = None
+                continue
+            if path not in loaded:
+                try:
+                    loaded[path] = arcade.load_texture(path)
+                    if self.debug:
+                        tex = loaded[path]
+                        print(f"[AI Sprites]  {direction}: {tex.width}x{tex.height}px")
+                except Exception as e:
+                    if self.debug:
+                        print(f"[AI Sprites]  {direction}: {e}")
+                    loaded[path] = None
+            textures[direction] = loaded[path]
 
-            if Path(path).exists():
-                pool[direction] = self._load_sprite_data(path, direction)
-            elif direction in fallback_map:
-                fallback_dir = fallback_map[direction]
-                fallback_path = f"assets/images/ai_cyclist_{fallback_dir}.png"
-                if Path(fallback_path).exists():
-                    pool[direction] = self._load_sprite_data(fallback_path, direction)
-                else:
-                    pool[direction] = None
-            else:
-                pool[direction] = None
-
-        loaded = sum(1 for v in pool.values() if v is not None)
         if self.debug:
-            print(f"[AI Sprites] Cargados: {loaded}/8 direcciones")
-
-        return pool
+            count = sum(1 for v in textures.values() if v is not None)
+            print(f"[AI Sprites] Cargados: {count}/8 direcciones ({len(loaded)} texturas)")
+        return textures
 
-    def _load_sprite_data(self, path: str, direction: str) -> dict:
-        """Carga sprite"""
+    def _preload_atlas(self):
+        """Sube todas las direcciones al atlas ahora y no cuando aparecen por primera vez."""
         try:
-            sprite_list = arcade.SpriteList()
-            sprites = [arcade.Sprite(path) for _ in range(10)]
-
-            if self.debug:
-                test = arcade.Sprite(path)
-                print(f"[AI Sprites]  {direction}: {test.width}x{test.height}px")
-
-            return {'sprites': sprites, 'list': sprite_list, 'index': 0}
+            self.sprite_list.initialize()
+            atlas = self.sprite_list.atlas
+            for tex in {id(t): t for t in self.textures.values() if t is not None}.values():
+                atlas.add(tex)
         except Exception as e:
             if self.debug:
-                print(f"[AI Sprites]  {direction}: {e}")
-            return None
+                print(f"[AI Sprites] Atlas diferido: {e}")
+
+    def _sprite(self, index: int, texture) -> Any:
+        while len(self._sprites) <= index:
+            sprite = arcade.Sprite(texture)
+            self._sprites.append(sprite)
+            self.sprite_list.append(sprite)
+        sprite = self._sprites[index]
+        if sprite.texture is not texture:
+            sprite.texture = texture
+        return sprite
 
     def render_ai_in_world(self,
                            ai_players: List[Any],
@@ -77,16 +98,18 @@ class AISpriteRenderer:
                            screen_width: int,
                            screen_height: int,
                            fov: float,
-                           delta_time: float = 0.016):
-        """Renderiza AIs visibles desde perspectiva del jugador"""
-
-        # Reset
-        for data in self.sprite_pool.values():
-            if data:
-                data['list'].clear()
-                data['index'] = 0
-
+                           delta_time: float = 0.016,
+                           depth: Optional[Any] = None):
+        """
+        Renderiza AIs visibles desde perspectiva del jugador.
+        depth: raycast.DepthBuffer del frame (sin él no hay oclusión).
+        """
+        self.last_draw_calls = 0
+        self.last_culled = 0
+        self.last_clipped = 0
         if not ai_players:
+            for sprite in self._sprites:
+                sprite.visible = False
             return
 
         # Calcular visibles
@@ -105,23 +128,65 @@ class AISpriteRenderer:
             if abs(rel_angle) <= fov / 2 + 0.4:
                 visible.append((dist, ai, rel_angle, angle_to_ai))
 
-        # Ordenar por distancia
+        # Ordenar por distancia (lejos primero: el orden del SpriteList es el de dibujo)
         visible.sort(key=lambda x: x[0], reverse=True)
 
-        # Configurar sprites
+        # Configurar sprites; entries = (sprite, tramos visibles o None si se ve entero)
+        entries = []
         for dist, ai, rel_angle, angle_to_ai in visible:
-            self._setup_sprite(ai, dist, rel_angle, angle_to_ai, player_angle,
-                               screen_width, screen_height, fov)
+            entry = self._setup_sprite(len(entries), ai, dist, rel_angle, angle_to_ai, player_angle,
+                                       screen_width, screen_height, fov, depth)
+            if entry is not None:
+                entries.append(entry)
+        for sprite in self._sprites[len(entries):]:
+            sprite.visible = False
 
         # Dibujar
-        for data in self.sprite_pool.values():
-            if data and data['list']:
-                data['list'].draw()
+        if not entries:
+            return
+        if all(runs is None for _, runs in entries):
+            self.sprite_list.draw()
+            self.last_draw_calls = 1
+            return
+        self._draw_clipped(entries, screen_height)
 
-    def _setup_sprite(self, ai: Any, distance: float, relative_angle: float,
+    def _draw_clipped(self, entries, screen_height: int):
+        """
+        Dibuja en orden grupos consecutivos: los sprites enteros juntos en una
+        llamada y cada sprite recortado una vez por tramo visible (scissor).
+        """
+        ctx = arcade.get_window().ctx
+        groups = []
+        for sprite, runs in entries:
+            if runs is None and groups and groups[-1][1] is None:
+                groups[-1][0].append(sprite)
+            else:
+                groups.append(([sprite], runs))
+        try:
+            for members, runs in groups:
+                for sprite, _ in entries:
+                    sprite.visible = False
+                for sprite in members:
+                    sprite.visible = True
+                if runs is None:
+                    self.sprite_list.draw()
+                    self.last_draw_calls += 1
+                    continue
+                for left, right in runs:
+                    ctx.scissor = (left, 0, right - left, screen_height)
+                    self.sprite_list.draw()
+                    self.last_draw_calls += 1
+                ctx.scissor = None
+        finally:
+            ctx.scissor = None
+            for sprite, _ in entries:
+                sprite.visible = True
+
+    def _setup_sprite(self, index: int, ai: Any, distance: float, relative_angle: float,
                       angle_to_ai: float, player_angle: float,
-                      screen_width: int, screen_height: int, fov: float):
-        """Configura sprite con dirección relativa al jugador"""
+                      screen_width: int, screen_height: int, fov: float,
+                      depth: Optional[Any] = None):
+        """Configura el sprite `index`; retorna (sprite, tramos) o None si no se ve"""
 
         # Calcular qué dirección del sprite mostrar basado en:
         # 1. Dirección de movimiento del AI
@@ -130,16 +195,9 @@ class AISpriteRenderer:
             ai, angle_to_ai, player_angle
         )
 
-        data = self.sprite_pool.get(direction)
-        if not data:
-            return
-
-        idx = data['index']
-        if idx >= len(data['sprites']):
-            return
-
-        sprite = data['sprites'][idx]
-        data['index'] = idx + 1
+        texture = self.textures.get(direction)
+        if texture is None:
+            return None
 
         # Posición X
         norm_angle = relative_angle / fov
@@ -150,19 +208,36 @@ class AISpriteRenderer:
         height = max(self.min_sprite_size, min(int(height), screen_height // 3))
 
         # Escala
-        scale = height / sprite.texture.height if sprite.texture else 1.0
+        scale = height / texture.height if texture.height else 1.0
+
+        # Oclusión por columnas contra las paredes
+        runs = None
+        if depth is not None:
+            half_w = texture.width * scale * 0.5
+            x0 = max(0, int(screen_x - half_w))
+            x1 = min(screen_width, int(math.ceil(screen_x + half_w)))
+            if x1 <= x0:
+                return None
+            runs = depth.visible_runs(x0, x1, distance)
+            if not runs:
+                self.last_culled += 1
+                return None
+            if runs == [(x0, x1)]:
+                runs = None
+            else:
+                self.last_clipped += 1
 
         # Posición Y (horizonte)
         screen_y = screen_height // 2
 
         # Configurar
+        sprite = self._sprite(index, texture)
         sprite.center_x = screen_x
         sprite.center_y = screen_y
         sprite.scale = scale
         sprite.color = (255, 255, 255)
         sprite.alpha = int(255 * max(0.5, 1.0 - distance / self.max_render_distance))
-
-        data['list'].append(sprite)
+        sprite.visible = True
 
         # Debug
         if self.debug:
@@ -170,6 +245,8 @@ class AISpriteRenderer:
             diff = getattr(ai, 'difficulty', 'easy')
             arcade.draw_circle_filled(screen_x, screen_y + height // 2 + 5, 3, colors.get(diff, arcade.color.WHITE))
 
+        return sprite, runs
+
     def _calculate_sprite_direction_relative_to_player(self, ai: Any,
                                                        angle_to_ai: float,
                                                        player_angle: float) -> str:
@@ -0,0 +1,114 @@
+import math
+from typing import List, Sequence, Tuple
+
+import arcade
+
+
+def _rgba(color: Sequence[int]) -> Tuple[int, int, int, int]:
+    if len(color) >= 4:
+        return (int(color[0]), int(color[1]), int(color[2]), int(color[3]))
+    return (int(color[0]), int(color[1]), int(color[2]), 255)
+
+
+class GeometryBatch:
+    """
+    Geometría de una capa del frame (rectángulos, elipses, líneas) acumulada
+    como triángulos con color por vértice. draw() la sube como una sola Shape
+    a un ShapeElementList reutilizado: una llamada de dibujo por capa. Si no
+    se agregó nada desde el último draw(), se vuelve a dibujar lo ya subido.
+    """
+    def __init__(self, ellipse_segments: int = 16):
+        self._points: List[Tuple[float, float]] = []
+        self._colors: List[Tuple[int, int, int, int]] = []
+        self._shapes = arcade.shape_list.ShapeElementList()
+        self._create = arcade.shape_list.create_triangles_filled_with_colors
+        n = max(6, int(ellipse_segments))
+        self._circle = [(math.cos(2 * math.pi * i / n), math.sin(2 * math.pi * i / n)) for i in range(n + 1)]
+        self._rgba_cache = {}
+        self._dirty = True
+        self.primitives = 0
+
+    def reset(self):
+        self._points.clear()
+        self._colors.clear()
+        self._dirty = True
+        self.primitives = 0
+
+    def rect(self, left: float, right: float, bottom: float, top: float, color):
+        c = self._color(color)
+        self._points.extend(((left, bottom), (right, bottom), (right, top),
+                             (left, bottom), (right, top), (left, top)))
+        self._colors.extend((c, c, c, c, c, c))
+        self._dirty = True
+        self.primitives += 1
+
+    def rect_outline(self, left: float, right: float, bottom: float, top: float, color, border: float = 1):
+        """Como arcade.draw_lrbt_rectangle_outline: el borde queda centrado en el contorno."""
+        h = border * 0.5
+        self.rect(left - h, right + h, bottom - h, bottom + h, color)
+        self.rect(left - h, right + h, top - h, top + h, color)
+        self.rect(left - h, left + h, bottom + h, top - h, color)
+        self.rect(right - h, right + h, bottom + h, top - h, color)
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, color, width: float = 1):
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length <= 0:
+            return
+        nx = -(y2 - y1) / length * width * 0.5
+        ny = (x2 - x1) / length * width * 0.5
+        self.triangle(x1 + nx, y1 + ny, x2 + nx, y2 + ny, x2 - nx, y2 - ny, color)
+        self.triangle(x1 + nx, y1 + ny, x2 - nx, y2 - ny, x1 - nx, y1 - ny, color)
+
+    def triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float, color):
+        c = self._color(color)
+        self._points.extend(((x1, y1), (x2, y2), (x3, y3)))
+        self._colors.extend((c, c, c))
+        self._dirty = True
+        self.primitives += 1
+
+    def circle(self, cx: float, cy: float, radius: float, color):
+        self.ellipse(cx, cy, radius * 2, radius * 2, color)
+
+    def arc_outline(self, cx: float, cy: float, width: float, height: float, color,
+                    start_angle: float, end_angle: float, border: float = 1, segments: int = 12):
+        """Como arcade.draw_arc_outline (ángulos en grados), con `segments` tramos rectos."""
+        rx, ry = width * 0.5, height * 0.5
+        prev = None
+        for i in range(segments + 1):
+            a = math.radians(start_angle + (end_angle - start_angle) * i / segments)
+            p = (cx + rx * math.cos(a), cy + ry * math.sin(a))
+            if prev is not None:
+                self.line(prev[0], prev[1], p[0], p[1], color, border)
+            prev = p
+
+    def ellipse(self, cx: float, cy: float, width: float, height: float, color):
+        """Como arcade.draw_ellipse_filled: width/height son el tamaño total."""
+        c = self._color(color)
+        rx, ry = width * 0.5, height * 0.5
+        ring = [(cx + rx * ux, cy + ry * uy) for ux, uy in self._circle]
+        center = (cx, cy)
+        points = self._points
+        for i in range(len(ring) - 1):
+            points.extend((center, ring[i], ring[i + 1]))
+        self._colors.extend((c,) * (3 * (len(ring) - 1)))
+        self._dirty = True
+        self.primitives += 1
+
+    def draw(self) -> int:
+        """Dibuja lo acumulado; retorna cuántas llamadas de dibujo hizo (0 o 1)."""
+        shapes = self._shapes
+        if self._dirty:
+            shapes.clear()
+            if self._points:
+                shapes.append(self._create(self._points, self._colors))
+            self._dirty = False
+        if not self._points:
+            return 0
+        shapes.draw()
+        return 1
+
+    def _color(self, color):
+        c = self._rgba_cache.get(color)
+        if c is None:
+            c = self._rgba_cache[color] = _rgba(color)
+        return c
@@ -0,0 +1,196 @@
+"""
+Capa de nubes pre-renderizada: los puffs se rasterizan una vez en una franja
+panorámica (máscara de 360° indexada por rumbo) vista desde un punto de
+referencia. Cada frame solo se muestrea la ventana angular visible, con un
+corrimiento de paralaje según cuánto se movió el jugador desde ese punto; en
+GL es un único quad texturizado teñido con el color de nubes del clima.
+"""
+import math
+from typing import List, Optional, Sequence, Tuple
+
+from game.rendering import raycast
+
+np = raycast.np
+
+TWO_PI = 2.0 * math.pi
+
+# Radio de nubes visibles y umbrales de descarte por distancia (los de siempre)
+MAX_CLOUD_DIST = 140.0
+_SKIP_STEPS = ((100.0, 0.75), (70.0, 0.5), (50.0, 0.25))
+
+_VERTEX_SHADER = """
+#version 330
+uniform vec4 rect;
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(mix(rect.xy, rect.zw, in_uv), 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+
+_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D mask;
+uniform vec2 window;
+uniform vec4 tint;
+in vec2 uv;
+out vec4 color;
+void main() {
+    float a = texture(mask, vec2(window.x + uv.x * window.y, uv.y)).r;
+    if (a <= 0.0) discard;
+    color = vec4(tint.rgb, tint.a * a);
+}
+"""
+
+
+def cloud_skip(dist: float) -> float:
+    """Fracción de puffs que se omiten a esa distancia."""
+    for limit, skip in _SKIP_STEPS:
+        if dist > limit:
+            return skip
+    return 0.0
+
+
+def puff_rank(group: int, index: int) -> float:
+    """Valor fijo en [0, 1) por puff: se omite si es menor que cloud_skip(dist) (sin parpadeo)."""
+    return ((group * 14 + index) * 0.6180339887) % 1.0
+
+
+def puff_size(dist: float, scale: float) -> Tuple[int, int]:
+    """(ancho, alto) base de un puff a esa distancia, como en el render por elipses."""
+    size_base = max(8, int(260 / (18 + dist)))
+    return int(size_base * 0.4 * (1 + scale)), int(size_base * 0.18 * (1 + scale))
+
+
+class CloudPanorama:
+    """
+    Máscara (alto x ancho, fila 0 = abajo) de los puffs alrededor de ref. El
+    ancho cubre 360° a screen_width / fov columnas por radián (acotado a max_width).
+    Se vuelve a hornear cuando cambia el tamaño de destino o el jugador se
+    aleja más de rebake_distance tiles de la referencia.
+    """
+    def __init__(self, cloud_groups: Sequence, fov: float, max_width: int = 4096,
+                 rebake_distance: float = 16.0):
+        self.cloud_groups = cloud_groups
+        self.fov = float(fov)
+        self.max_width = max(256, int(max_width))
+        self.rebake_distance = float(rebake_distance)
+        self.mask = None
+        self.ref: Tuple[float, float] = (0.0, 0.0)
+        self.depth = 60.0
+        self.band_half = 0
+        self.version = 0
+        self._key = None
+
+    def ensure(self, px: float, py: float, screen_width: int, pixel_scale: float = 1.0,
+               detail: float = 1.0) -> bool:
+        """Hornea si hace falta; retorna True si la máscara cambió."""
+        key = (int(screen_width), round(float(pixel_scale), 4), round(float(detail), 3))
+        rx, ry = self.ref
+        moved = math.hypot(px - rx, py - ry) > self.rebake_distance
+        if self.mask is not None and key == self._key and not moved:
+            return False
+        self.bake(px, py, key[0], key[1], key[2])
+        self._key = key
+        return True
+
+    def bake(self, px: float, py: float, screen_width: int, pixel_scale: float = 1.0,
+             detail: float = 1.0):
+        per_rad = screen_width / self.fov
+        width = int(min(self.max_width, math.ceil(TWO_PI * per_rad)))
+        sx = width / (TWO_PI * per_rad)  # < 1 si se acotó el ancho
+        ps = float(pixel_scale)
+
+        ellipses: List[Tuple[float, float, float, float]] = []
+        dists = []
+        for g, (cx, cy, puffs) in enumerate(self.cloud_groups):
+            dist = math.hypot(cx - px, cy - py)
+            if dist > MAX_CLOUD_DIST:
+                continue
+            dists.append(dist)
+            x0 = (math.atan2(cy - py, cx - px) % TWO_PI) * per_rad * sx
+            skip = max(cloud_skip(dist), 1.0 - detail)
+            for i, (jx, jy, s) in enumerate(puffs):
+                if skip and puff_rank(g, i) < skip:
+                    continue
+                w, h = puff_size(dist, s)
+                if w < 2 or h < 2:
+                    continue
+                ellipses.append((x0 + jx * ps * sx, jy * ps, w * 2 * ps * sx, h * ps))
+
+        half = int(math.ceil(max([abs(y) + h * 0.5 for _, y, _, h in ellipses] or [0]))) + 1
+        mask = np.zeros((2 * half, width), dtype=np.uint8)
+        for cx, cy, w, h in ellipses:
+            for off in (-width, 0, width):  # puffs que cruzan el borde de 360°
+                _fill_ellipse(mask, cx + off, cy + half, w, h)
+
+        self.mask = mask
+        self.band_half = half
+        self.ref = (float(px), float(py))
+        self.depth = max(20.0, sum(dists) / len(dists)) if dists else 60.0
+        self.version += 1
+
+    def window(self, px: float, py: float, pang: float) -> Tuple[float, float]:
+        """
+        (inicio, ancho) de la ventana visible en coordenadas normalizadas de la
+        panorámica (1.0 = 360°). El paralaje desplaza la ventana por el
+        movimiento lateral desde ref, a la distancia media de las nubes.
+        """
+        rx, ry = self.ref
+        lateral = (px - rx) * -math.sin(pang) + (py - ry) * math.cos(pang)
+        start = (pang - self.fov * 0.5 + lateral / self.depth) / TWO_PI
+        return start % 1.0, self.fov / TWO_PI
+
+    def columns(self, n: int, px: float, py: float, pang: float) -> "np.ndarray":
+        """Columnas de la máscara que caen en cada una de las n columnas de pantalla."""
+        start, span = self.window(px, py, pang)
+        width = self.mask.shape[1]
+        u = start + (np.arange(n) + 0.5) * (span / n)
+        return (u * width).astype(np.int64) % width
+
+
+def _fill_ellipse(mask, cx: float, cy: float, width: float, height: float):
+    rx, ry = width * 0.5, height * 0.5
+    H, W = mask.shape
+    x0, x1 = max(0, int(cx - rx)), min(W, int(cx + rx) + 1)
+    y0, y1 = max(0, int(cy - ry)), min(H, int(cy + ry) + 1)
+    if x0 >= x1 or y0 >= y1 or rx < 0.5 or ry < 0.5:
+        return
+    ys, xs = np.ogrid[y0:y1, x0:x1]
+    inside = ((xs + 0.5 - cx) / rx) ** 2 + ((ys + 0.5 - cy) / ry) ** 2 <= 1.0
+    mask[y0:y1, x0:x1][inside] = 255
+
+
+class PanoramaBlitter:
+    """Máscara en una textura (repetida en horizontal) y un quad con la ventana visible."""
+    def __init__(self, ctx):
+        from arcade.gl import geometry
+
+        self.ctx = ctx
+        self.program = ctx.program(vertex_shader=_VERTEX_SHADER, fragment_shader=_FRAGMENT_SHADER)
+        self.program["mask"] = 0
+        self.quad = geometry.quad_2d_fs()
+        self.texture = None
+        self._version: Optional[Tuple[int, int]] = None
+
+    def draw(self, pano: CloudPanorama, left: float, bottom: float, right: float, top: float,
+             viewport: Tuple[int, int], window: Tuple[float, float], color: Sequence[int]):
+        key = (id(pano), pano.version)
+        if self._version != key:
+            h, w = pano.mask.shape
+            if self.texture is None or self.texture.size != (w, h):
+                self.texture = self.ctx.texture((w, h), components=1, wrap_x=self.ctx.REPEAT,
+                                                wrap_y=self.ctx.CLAMP_TO_EDGE)
+                self.texture.filter = (self.ctx.LINEAR, self.ctx.LINEAR)
+            self.texture.write(pano.mask.tobytes())
+            self._version = key
+        vw, vh = max(1, viewport[0]), max(1, viewport[1])
+        self.program["rect"] = (left / vw * 2 - 1, bottom / vh * 2 - 1, right / vw * 2 - 1, top / vh * 2 - 1)
+        self.program["window"] = window
+        alpha = color[3] if len(color) > 3 else 255
+        self.program["tint"] = (color[0] / 255.0, color[1] / 255.0, color[2] / 255.0, alpha / 255.0)
+        self.ctx.enable(self.ctx.BLEND)
+        self.texture.use(0)
+        self.quad.render(self.program)
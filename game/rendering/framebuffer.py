@@ -0,0 +1,242 @@
+"""
+Modo de render por software: cielo, nubes, piso y columnas de pared se
+rasterizan en un framebuffer RGBA de NumPy a resolución interna fija y se
+suben como una sola textura por frame, escalada a la ventana. El costo
+depende de la resolución interna y no de la complejidad de la escena.
+"""
+from typing import Optional, Sequence, Tuple
+
+from game.rendering import raycast
+
+np = raycast.np
+
+_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+
+_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D frame;
+in vec2 uv;
+out vec4 color;
+void main() {
+    color = texture(frame, uv);
+}
+"""
+
+_RECT_VERTEX_SHADER = """
+#version 330
+uniform vec4 rect;
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(mix(rect.xy, rect.zw, in_uv), 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+
+
+def pack_rgba(colors) -> "np.ndarray":
+    """Colores (..., 3) -> uint32 con el mismo orden de bytes que el buffer RGBA."""
+    c = np.asarray(colors, dtype=np.uint32)
+    return c[..., 0] | (c[..., 1] << 8) | (c[..., 2] << 16) | np.uint32(0xFF000000)
+
+
+class SoftwareFramebuffer:
+    """
+    Framebuffer (alto x ancho x RGBA), fila 0 = borde inferior de la pantalla
+    (mismo sentido que arcade y que las texturas de OpenGL). Se escribe a
+    través de `packed`, una vista uint32 (un elemento por píxel).
+    """
+    def __init__(self, width: int, height: int):
+        self.width = 0
+        self.height = 0
+        self.pixels = None
+        self.packed = None
+        self.resize(width, height)
+
+    def resize(self, width: int, height: int):
+        width, height = max(16, int(width)), max(16, int(height))
+        if (width, height) == (self.width, self.height):
+            return
+        self.width, self.height = width, height
+        self.pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        self.pixels[..., 3] = 255
+        self.packed = self.pixels.view(np.uint32).reshape(height, width)
+        self._rows = np.arange(height, dtype=np.int32)[:, None]
+
+    # ---------- Primitivas ----------
+    def fill_rows(self, y0: int, y1: int, color: Sequence[int]):
+        y0, y1 = max(0, int(y0)), min(self.height, int(y1))
+        if y0 < y1:
+            self.packed[y0:y1] = pack_rgba(color[:3])
+
+    def ellipse(self, cx: float, cy: float, width: float, height: float, color: Sequence[int]):
+        """Como arcade.draw_ellipse_filled (width/height totales), en píxeles internos."""
+        rx, ry = width * 0.5, height * 0.5
+        if rx < 0.5 or ry < 0.5:
+            return
+        x0, x1 = max(0, int(cx - rx)), min(self.width, int(cx + rx) + 1)
+        y0, y1 = max(0, int(cy - ry)), min(self.height, int(cy + ry) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        ys, xs = np.ogrid[y0:y1, x0:x1]
+        mask = ((xs + 0.5 - cx) / rx) ** 2 + ((ys + 0.5 - cy) / ry) ** 2 <= 1.0
+        self.packed[y0:y1, x0:x1][mask] = pack_rgba(color[:3])
+
+    # ---------- Piso ----------
+    def floor(self, codes, color_lut, palette, city_w: int, city_h: int,
+              px: float, py: float, dir_x, dir_y, horizon: int, max_dist: float):
+        """
+        Piso por píxel: distancia por fila x dirección por columna, un solo
+        gather de tiles. palette: índice de color -> uint32 (ver pack_rgba).
+        """
+        rows = np.arange(0, min(horizon, self.height))
+        if rows.size == 0:
+            return
+        dist = (self.height * 0.5) / (horizon - (rows + 0.5))
+        if max_dist:
+            dist = np.minimum(dist, max_dist)
+        dist = dist[:, None]
+        tx = (px + dist * dir_x[None, :]).astype(np.int64)
+        ty = (py + dist * dir_y[None, :]).astype(np.int64)
+        inside = (tx >= 0) & (tx < city_w) & (ty >= 0) & (ty < city_h)
+        idx = color_lut[codes[np.where(inside, ty * city_w + tx, 0)]]
+        idx[~inside] = 0
+        painted = idx != 0
+        if painted.any():
+            np.copyto(self.packed[:rows.size], palette[idx], where=painted)
+
+    # ---------- Paredes ----------
+    def walls(self, dist, side, hit, door, wall_u, horizon: int, colors,
+              fog_color: Optional[Sequence[int]] = None, fog_distance: float = 0.0,
+              textured: bool = True):
+        """
+        Columnas de pared (una por columna interna). colors: (pared, pared oscura,
+        puerta). Con fog_distance > 0 mezcla hacia fog_color según la distancia;
+        con textured aplica un patrón de ladrillo (no en puertas).
+        """
+        H = self.height
+        ok = hit & (dist > 0)
+        if not ok.any():
+            return
+        d = np.maximum(dist, 0.0001)
+        line_h = np.where(ok, (H / d).astype(np.int64), 0).astype(np.int32)
+        half = line_h // 2
+        top = np.minimum(H, horizon + half)
+        bottom = np.maximum(0, horizon - half)
+        rows = self._rows
+        mask = (rows >= bottom[None, :]) & (rows < top[None, :]) & ok[None, :]
+        if not mask.any():
+            return
+
+        # Color por columna (con niebla) y su variante de junta; por píxel solo se elige entre ambos
+        palette = np.asarray(colors, dtype=np.float32)[:, :3]
+        code = np.where(door, 2, np.where(side != 0, 1, 0))
+        col = palette[code]  # (W, 3)
+        joint_col = col * 0.78
+        if fog_distance and fog_distance > 0 and fog_color is not None:
+            f = np.clip(1.0 - d / float(fog_distance), 0.0, 1.0).astype(np.float32)[:, None]
+            fog = np.asarray(fog_color[:3], dtype=np.float32) * (1.0 - f)
+            col = col * f + fog
+            joint_col = joint_col * f + fog
+        col = pack_rgba(col.astype(np.uint8))[None, :]
+        if textured:
+            # Aritmética entera en 1/256: v = 4 hiladas de ladrillo por pared
+            v = ((rows - (horizon - half)[None, :]) * 1024) // np.maximum(line_h, 1)[None, :]
+            course = v >> 8
+            joint = (v & 255) < 20
+            u = (wall_u * 512).astype(np.int32)[None, :]
+            joint |= ((u + ((course & 1) << 7)) & 255) < 15
+            joint &= ~door[None, :]
+            out = np.where(joint, pack_rgba(joint_col.astype(np.uint8))[None, :], col)
+        else:
+            out = np.broadcast_to(col, mask.shape)
+        np.copyto(self.packed, out, where=mask)
+
+
+class TextureBlitter:
+    """Sube el framebuffer a una textura reutilizada y la dibuja escalada a toda la ventana."""
+    def __init__(self, ctx):
+        from arcade.gl import geometry
+
+        self.ctx = ctx
+        self.program = ctx.program(vertex_shader=_VERTEX_SHADER, fragment_shader=_FRAGMENT_SHADER)
+        self.program["frame"] = 0
+        self.quad = geometry.quad_2d_fs()
+        self.texture = None
+        self._size: Tuple[int, int] = (0, 0)
+
+    def blit(self, fb: SoftwareFramebuffer, smooth: bool = False):
+        size = (fb.width, fb.height)
+        if self.texture is None or self._size != size:
+            self.texture = self.ctx.texture(size, components=4)
+            self._size = size
+        filt = self.ctx.LINEAR if smooth else self.ctx.NEAREST
+        self.texture.filter = (filt, filt)
+        self.texture.write(fb.pixels)
+        self.texture.use(0)
+        self.quad.render(self.program)
+
+
+class TextureRect:
+    """
+    Textura RGBA propia (fuera del atlas de arcade) dibujada en un rectángulo
+    de pantalla. Admite escrituras parciales para reparar solo lo que cambió.
+    """
+    def __init__(self, ctx):
+        from arcade.gl import geometry
+
+        self.ctx = ctx
+        self.program = ctx.program(vertex_shader=_RECT_VERTEX_SHADER, fragment_shader=_FRAGMENT_SHADER)
+        self.program["frame"] = 0
+        self.quad = geometry.quad_2d_fs()
+        self.texture = None
+        self.size: Tuple[int, int] = (0, 0)
+
+    def allocate(self, size: Tuple[int, int]):
+        """Textura del tamaño pedido (la misma si no cambió); sirve también como destino de un framebuffer."""
+        if self.texture is None or self.size != tuple(size):
+            self.texture = self.ctx.texture(tuple(size), components=4)
+            self.size = tuple(size)
+        return self.texture
+
+    def upload(self, data, size: Tuple[int, int], region: Optional[Tuple[int, int, int, int]] = None):
+        """data: bytes RGBA fila mayor, fila 0 = abajo. region (x, y, ancho, alto) para una escritura parcial."""
+        if region is None:
+            self.allocate(size).write(data)
+        elif self.texture is not None:
+            self.texture.write(data, viewport=region)
+
+    def draw(self, left: float, bottom: float, width: float, height: float,
+             viewport: Tuple[int, int], smooth: bool = False, blend: bool = True):
+        """Con blend=False copia los píxeles tal cual (alpha incluido)."""
+        if self.texture is None:
+            return
+        vw, vh = max(1, viewport[0]), max(1, viewport[1])
+        filt = self.ctx.LINEAR if smooth else self.ctx.NEAREST
+        self.texture.filter = (filt, filt)
+        self.program["rect"] = (left / vw * 2 - 1, bottom / vh * 2 - 1,
+                                (left + width) / vw * 2 - 1, (bottom + height) / vh * 2 - 1)
+        if blend:
+            self.ctx.enable(self.ctx.BLEND)
+        else:
+            self.ctx.disable(self.ctx.BLEND)
+        self.texture.use(0)
+        self.quad.render(self.program)
+        if not blend:
+            self.ctx.enable(self.ctx.BLEND)
+
+
+def wall_u(px: float, py: float, dir_x, dir_y, dist, side):
+    """Coordenada horizontal de textura (0..1) del punto de impacto de cada columna."""
+    hit_pos = np.where(side == 0, py + dist * dir_y, px + dist * dir_x)
+    return hit_pos - np.floor(hit_pos)
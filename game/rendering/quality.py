@@ -0,0 +1,162 @@
+"""
+Gobernador de calidad: cada `interval` segundos compara el tiempo de frame
+medido (CourierGame.frame_times) y el costo del render del mundo
+(RayCastRenderer._perf_accum) con el objetivo, y baja o sube un escalón de
+calidad: filas de piso muestreadas, cantidad de rayos y detalle de nubes.
+"""
+from typing import Dict, List, Optional
+
+
+class QualityGovernor:
+    """
+    Ajuste adaptativo con histéresis. Baja calidad si el frame supera
+    target * (1 + hysteresis); la sube si queda por debajo de
+    target * (1 - hysteresis) o si, con vsync, el render usa menos de
+    headroom del presupuesto. Una subida que obliga a bajar enseguida
+    duplica la espera antes de volver a intentarlo.
+
+    Nunca supera la calidad preferida (rayos y paso de piso de la config o
+    del menú de ajustes); solo baja hasta los mínimos configurados.
+    """
+    CLOUD_LEVELS = (0.0, 0.5, 1.0)
+
+    def __init__(self, renderer, config: Optional[dict] = None):
+        cfg = config or {}
+        self.renderer = renderer
+        self.enabled: bool = bool(cfg.get("enabled", True))
+        self.target_ms: float = 1000.0 / max(1.0, float(cfg.get("target_fps", 60)))
+        self.hysteresis: float = max(0.0, float(cfg.get("hysteresis", 0.12)))
+        self.headroom: float = float(cfg.get("headroom", 0.5))
+        self.interval: float = max(0.1, float(cfg.get("interval", 1.0)))
+        self.min_rays: int = max(8, int(cfg.get("min_rays", 30)))
+        self.max_floor_step: int = max(1, int(cfg.get("max_floor_step", 4)))
+        self.ray_factor: float = min(0.95, max(0.5, float(cfg.get("ray_factor", 0.8))))
+        self.debug: bool = bool(cfg.get("debug", False))
+
+        self.preferred_rays: int = int(getattr(renderer, "num_rays", 120))
+        self.preferred_floor_step: int = max(1, int(getattr(renderer, "floor_row_step", 2)))
+
+        self._elapsed = 0.0
+        self._last_frames = 0
+        self._last_render_s = 0.0
+        self._upgrade_wait = self.interval
+        self._since_change = 0.0
+        self._last_action = None
+        self.last_frame_ms = 0.0
+        self.last_render_ms = 0.0
+        self.changes = 0
+
+    # ---------- Preferencias ----------
+    def set_preferred(self, num_rays: Optional[int] = None, floor_row_step: Optional[int] = None):
+        """Nueva calidad máxima (p. ej. desde el menú de ajustes); se aplica de inmediato."""
+        if num_rays is not None:
+            self.preferred_rays = max(self.min_rays, int(num_rays))
+        if floor_row_step is not None:
+            self.preferred_floor_step = max(1, int(floor_row_step))
+        self.renderer.set_quality(num_rays=self.preferred_rays, floor_row_step=self.preferred_floor_step,
+                                  cloud_detail=1.0)
+        self._upgrade_wait = self.interval
+        self._since_change = 0.0
+
+    # ---------- Actualización ----------
+    def update(self, delta_time: float, frame_times: List[float]) -> bool:
+        """Llamar una vez por frame; retorna True si cambió la calidad."""
+        if not self.enabled or self.renderer is None:
+            return False
+        self._elapsed += delta_time
+        self._since_change += delta_time
+        if self._elapsed < self.interval:
+            return False
+        window = self._elapsed
+        self._elapsed = 0.0
+
+        # Frames del último intervalo
+        n, acc = 0, 0.0
+        for dt in reversed(frame_times):
+            if acc >= window:
+                break
+            acc += dt
+            n += 1
+        if n == 0:
+            return False
+        self.last_frame_ms = acc / n * 1000.0
+        self.last_render_ms = self._render_ms()
+
+        # El modo software cuesta según su resolución interna, no según estas perillas
+        if getattr(self.renderer, "render_mode", "immediate") == "software":
+            return False
+
+        hi = self.target_ms * (1.0 + self.hysteresis)
+        lo = self.target_ms * (1.0 - self.hysteresis)
+        if self.last_frame_ms > hi:
+            if self._last_action == "up" and self._since_change <= 2 * self.interval:
+                self._upgrade_wait = min(16.0 * self.interval, self._upgrade_wait * 2)
+            return self._step(down=True)
+        spare = self.last_frame_ms < lo or (
+            0.0 < self.last_render_ms < self.target_ms * self.headroom)
+        if spare and self._since_change >= self._upgrade_wait:
+            return self._step(down=False)
+        return False
+
+    def snapshot(self) -> Dict[str, float]:
+        r = self.renderer
+        return {
+            "frame_ms": self.last_frame_ms,
+            "render_ms": self.last_render_ms,
+            "target_ms": self.target_ms,
+            "num_rays": getattr(r, "num_rays", 0),
+            "floor_row_step": getattr(r, "floor_row_step", 0),
+            "cloud_detail": getattr(r, "cloud_detail", 1.0),
+            "changes": self.changes,
+        }
+
+    # ---------- helpers privados ----------
+    def _render_ms(self) -> float:
+        """Costo medio del render del mundo desde la última lectura (el renderer reinicia su acumulador)."""
+        acc = getattr(self.renderer, "_perf_accum", None) or {}
+        frames = int(acc.get("frames", 0))
+        total = sum(v for k, v in acc.items() if k != "frames")
+        if frames < self._last_frames:
+            self._last_frames, self._last_render_s = 0, 0.0
+        df = frames - self._last_frames
+        ds = total - self._last_render_s
+        self._last_frames, self._last_render_s = frames, total
+        return ds / df * 1000.0 if df > 0 else 0.0
+
+    def _step(self, down: bool) -> bool:
+        """Un escalón. Bajando: piso, rayos, nubes; subiendo, en orden inverso."""
+        r = self.renderer
+        rays = int(r.num_rays)
+        step = int(r.floor_row_step)
+        clouds = float(getattr(r, "cloud_detail", 1.0))
+        levels = self.CLOUD_LEVELS
+        lvl = max(i for i, v in enumerate(levels) if v <= clouds + 1e-6)
+        min_rays = min(self.min_rays, self.preferred_rays)
+
+        if down:
+            if step < self.max_floor_step:
+                step += 1
+            elif rays > min_rays:
+                rays = max(min_rays, int(rays * self.ray_factor))
+            elif lvl > 0:
+                clouds = levels[lvl - 1]
+            else:
+                return False
+        else:
+            if lvl < len(levels) - 1:
+                clouds = levels[lvl + 1]
+            elif rays < self.preferred_rays:
+                rays = min(self.preferred_rays, int(rays / self.ray_factor) + 1)
+            elif step > self.preferred_floor_step:
+                step -= 1
+            else:
+                return False
+
+        r.set_quality(num_rays=rays, floor_row_step=step, cloud_detail=clouds)
+        self._last_action = "down" if down else "up"
+        self._since_change = 0.0
+        self.changes += 1
+        if self.debug:
+            print(f"[Quality] {'-' if down else '+'} frame:{self.last_frame_ms:.1f}ms "
+                  f"render:{self.last_render_ms:.1f}ms -> rays:{rays} floor_step:{step} clouds:{clouds}")
+        return True
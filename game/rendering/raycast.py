@@ -0,0 +1,302 @@
+"""
+Raycasting vectorizado con NumPy: DDA de paredes que avanza todos los rayos
+a la vez sobre la grilla `blocked` y muestreo del piso en bloque. NumPy es
+opcional; sin él (o con mapas por chunks) RayCastRenderer usa los bucles
+por rayo de siempre.
+"""
+import bisect
+import math
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# Códigos de color de un tramo de pared
+WALL, WALL_DARK, DOOR = 0, 1, 2
+
+
+def available() -> bool:
+    return np is not None
+
+
+# Valor del borde agregado alrededor del mapa: el rayo sale sin chocar
+OUTSIDE = 2
+
+
+def blocked_array(city):
+    """
+    Grilla `blocked` con un borde de OUTSIDE, forma (alto + 2) x (ancho + 2)
+    aplanada; así el DDA no revisa límites en cada paso. None si no aplica.
+    """
+    if np is None or getattr(city, "is_chunked", False):
+        return None
+    W, H = city.width, city.height
+    try:
+        flat = np.frombuffer(city.blocked, dtype=np.uint8)
+    except (TypeError, ValueError):
+        return None
+    if flat.size != W * H:
+        return None
+    padded = np.full((H + 2, W + 2), OUTSIDE, dtype=np.uint8)
+    padded[1:-1, 1:-1] = flat.reshape(H, W)
+    return padded.ravel()
+
+
+def cast_rays(blocked, width: int, height: int, px: float, py: float,
+              dir_x, dir_y, max_iter: int):
+    """
+    DDA de todos los rayos juntos sobre la grilla de blocked_array(). El
+    estado se guarda compacto (solo rayos activos) y se reduce cuando algún
+    rayo termina, así cada paso cuesta unas pocas operaciones de NumPy.
+    Retorna (dist, side, map_x, map_y, hit) como arreglos de largo num_rays.
+    """
+    W2 = int(width) + 2
+    dx = np.asarray(dir_x, dtype=np.float64)
+    dy = np.asarray(dir_y, dtype=np.float64)
+    n = dx.size
+    mx0, my0 = int(px), int(py)
+    if not (0 <= mx0 < int(width) and 0 <= my0 < int(height)):
+        z = np.zeros(n, dtype=np.int64)
+        return np.zeros(n), np.zeros(n, dtype=np.int8), z, z, np.zeros(n, dtype=bool)
+
+    with np.errstate(divide="ignore"):
+        all_ddx = np.where(dx == 0.0, 1e30, np.abs(1.0 / dx))
+        all_ddy = np.where(dy == 0.0, 1e30, np.abs(1.0 / dy))
+    all_stx = np.where(dx < 0, -1, 1)
+    all_sty = np.where(dy < 0, -1, 1)
+
+    # Salidas
+    out_x = np.full(n, mx0, dtype=np.int64)
+    out_y = np.full(n, my0, dtype=np.int64)
+    out_side = np.zeros(n, dtype=bool)
+    hit = np.zeros(n, dtype=bool)
+
+    # Estado compacto de los rayos activos; la celda se lleva como índice plano
+    idx = np.arange(n)
+    ddx, ddy = all_ddx, all_ddy
+    sdx = np.where(dx < 0, (px - mx0) * ddx, (mx0 + 1.0 - px) * ddx)
+    sdy = np.where(dy < 0, (py - my0) * ddy, (my0 + 1.0 - py) * ddy)
+    stx, sty_flat = all_stx, all_sty * W2
+    cell = np.full(n, (my0 + 1) * W2 + mx0 + 1, dtype=np.int64)
+    side = np.zeros(n, dtype=bool)
+
+    for _ in range(int(max_iter)):
+        val = blocked[cell]
+        done = val != 0
+        if done.any():
+            fin = idx[done]
+            c = cell[done]
+            hit[fin] = val[done] == 1
+            out_y[fin] = c // W2 - 1
+            out_x[fin] = c % W2 - 1
+            out_side[fin] = side[done]
+            keep = ~done
+            idx, cell, side = idx[keep], cell[keep], side[keep]
+            if idx.size == 0:
+                break
+            ddx, ddy, sdx, sdy = ddx[keep], ddy[keep], sdx[keep], sdy[keep]
+            stx, sty_flat = stx[keep], sty_flat[keep]
+        side = sdx >= sdy
+        go_x = ~side
+        np.add(sdx, ddx, out=sdx, where=go_x)
+        np.add(sdy, ddy, out=sdy, where=side)
+        cell += np.where(go_x, stx, sty_flat)
+
+    safe_dx = np.where(dx != 0.0, dx, 1e-6)
+    safe_dy = np.where(dy != 0.0, dy, 1e-6)
+    perp = np.where(out_side,
+                    (out_y - py + (1 - all_sty) * 0.5) / safe_dy,
+                    (out_x - px + (1 - all_stx) * 0.5) / safe_dx)
+    return np.abs(perp), out_side.astype(np.int8), out_x, out_y, hit
+
+
+def door_flags(map_x, map_y, hit, doors) -> "np.ndarray":
+    """Marca los rayos que chocaron contra una puerta (solo revisa los que chocaron)."""
+    flags = np.zeros(hit.size, dtype=bool)
+    if doors and hit.any():
+        cells = zip(map_x[hit].tolist(), map_y[hit].tolist())
+        flags[hit] = [c in doors for c in cells]
+    return flags
+
+
+def wall_slices(dist, side, door, hit, col_left, col_right,
+                height: int, horizon: int) -> List[Tuple[int, int, int, int, int]]:
+    """
+    Tramos de pared (left, right, bottom, top, código de color), ya fusionados
+    cuando columnas contiguas comparten altura y color.
+    """
+    left = np.asarray(col_left)
+    right = np.asarray(col_right)
+    ok = hit & (dist > 0) & (right > left)
+    if not ok.any():
+        return []
+    d = np.maximum(dist[ok], 0.0001)
+    line_h = (height / d).astype(np.int64)
+    half = line_h // 2
+    top = np.minimum(height, horizon + half)
+    bottom = np.maximum(0, horizon - half)
+    color = np.where(door[ok], DOOR, np.where(side[ok] != 0, WALL_DARK, WALL))
+    l, r = left[ok], right[ok]
+
+    vis = bottom < top
+    l, r, bottom, top, color = l[vis], r[vis], bottom[vis], top[vis], color[vis]
+    if l.size == 0:
+        return []
+
+    # Un tramo nuevo empieza donde cambia la altura/color o hay un hueco
+    new = np.ones(l.size, dtype=bool)
+    new[1:] = ((bottom[1:] != bottom[:-1]) | (top[1:] != top[:-1]) |
+               (color[1:] != color[:-1]) | (l[1:] != r[:-1]))
+    starts = np.flatnonzero(new)
+    ends = np.append(starts[1:] - 1, l.size - 1)
+    return list(zip(l[starts].tolist(), r[ends].tolist(), bottom[starts].tolist(),
+                    top[starts].tolist(), color[starts].tolist()))
+
+
+def grid_array(city):
+    """Vista uint8 plana (sin copia) de los códigos de tile; None si no aplica."""
+    if np is None or getattr(city, "is_chunked", False):
+        return None
+    try:
+        flat = np.frombuffer(city.grid, dtype=np.uint8)
+    except (TypeError, ValueError):
+        return None
+    return flat if flat.size == city.width * city.height else None
+
+
+def floor_spans(codes, color_lut, width: int, height: int, px: float, py: float,
+                dir_x, dir_y, row_dist) -> List[Tuple[int, int, int, int]]:
+    """
+    Muestrea el piso de todas las filas y rayos de una vez (producto externo
+    de distancias y direcciones) y extrae los tramos contiguos del mismo
+    color. color_lut: código de tile -> índice de color (0 = sin pintar).
+    Retorna [(fila, rayo_inicial, rayo_final, índice_color)].
+    """
+    return color_spans(floor_colors(codes, color_lut, width, height, px, py, dir_x, dir_y, row_dist))
+
+
+def floor_colors(codes, color_lut, width: int, height: int, px: float, py: float,
+                 dir_x, dir_y, row_dist) -> "np.ndarray":
+    """Índice de color del piso por (fila muestreada, rayo)."""
+    W, H = int(width), int(height)
+    dist = np.asarray(row_dist, dtype=np.float64)[:, None]
+    tx = (px + dist * np.asarray(dir_x)[None, :]).astype(np.int64)
+    ty = (py + dist * np.asarray(dir_y)[None, :]).astype(np.int64)
+    inside = (tx >= 0) & (tx < W) & (ty >= 0) & (ty < H)
+    cells = np.where(inside, ty * W + tx, 0)
+    return np.where(inside, color_lut[codes[cells]], 0)
+
+
+def color_spans(colors) -> List[Tuple[int, int, int, int]]:
+    """Tramos contiguos del mismo color por fila: [(fila, rayo_inicial, rayo_final, índice_color)]."""
+    # Una columna separadora en 0 al final de cada fila evita tramos entre filas
+    rows, n = colors.shape
+    flat = np.zeros((rows, n + 1), dtype=colors.dtype)
+    flat[:, :n] = colors
+    flat = flat.ravel()
+    bounds = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.append(bounds, flat.size)
+    painted = flat[starts] != 0
+    starts, ends = starts[painted], ends[painted] - 1
+    stride = n + 1
+    return list(zip((starts // stride).tolist(), (starts % stride).tolist(),
+                    (ends % stride).tolist(), flat[starts].tolist()))
+
+
+class AngularCache:
+    """
+    Resultados por columna indexados por ángulo absoluto (rayo j en j * paso)
+    para una clave fija (posición, versión del mapa, ...). Al rotar, la
+    ventana [j0, j0 + n) se solapa con la anterior: solo se calculan las
+    columnas nuevas y el resto se reutiliza corriendo los índices.
+    """
+    def __init__(self):
+        self.key = None
+        self.j0 = 0
+        self.data = None
+        self.computed = 0  # columnas calculadas en la última llamada
+
+    def columns(self, key, j0: int, n: int, compute):
+        """
+        Arreglos (última dimensión = columna) para [j0, j0 + n). compute(a, m)
+        retorna la tupla de arreglos de las columnas [a, a + m).
+        """
+        data = self.data
+        if key != self.key or data is None:
+            c0 = c1 = j0
+        else:
+            c0 = self.j0
+            c1 = c0 + data[0].shape[-1]
+        lo, hi = max(j0, c0), min(j0 + n, c1)
+        if lo >= hi:
+            out = compute(j0, n)
+            self.computed = n
+        else:
+            parts = []
+            if j0 < lo:
+                parts.append(compute(j0, lo - j0))
+            parts.append(tuple(a[..., lo - c0:hi - c0] for a in data))
+            if hi < j0 + n:
+                parts.append(compute(hi, j0 + n - hi))
+            self.computed = n - (hi - lo)
+            out = parts[0] if len(parts) == 1 else tuple(
+                np.concatenate(arrays, axis=-1) for arrays in zip(*parts))
+        self.key, self.j0, self.data = key, j0, out
+        return out
+
+
+class DepthBuffer:
+    """
+    Distancia a la pared por columna de pantalla del último frame (inf donde
+    el rayo no chocó). Acepta listas o arreglos; se pasan a listas solo
+    cuando alguien consulta.
+    """
+    def __init__(self):
+        self.version = 0
+        self._raw = None
+        self._cols = None
+
+    def set(self, col_left, col_right, dist, hit=None):
+        raw = (col_left, col_right, dist, hit)
+        if self._raw is not None and all(a is b for a, b in zip(raw, self._raw)):
+            return
+        self._raw = raw
+        self._cols = None
+        self.version += 1
+
+    def clear(self):
+        self.set([], [], [])
+
+    def _columns(self):
+        if self._cols is None:
+            if self._raw is None:
+                return [], [], []
+            left, right, dist, hit = self._raw
+            tolist = lambda a: a.tolist() if hasattr(a, "tolist") else list(a)
+            dist = tolist(dist)
+            if hit is not None:
+                inf = float("inf")
+                dist = [d if h and d > 0 else inf for d, h in zip(dist, tolist(hit))]
+            self._cols = (tolist(left), tolist(right), dist)
+        return self._cols
+
+    def visible_runs(self, x0: float, x1: float, depth: float) -> List[Tuple[int, int]]:
+        """Tramos [izq, der) de pantalla dentro de [x0, x1) donde la pared está más lejos que depth."""
+        left, right, dist = self._columns()
+        if not left:
+            return [(int(x0), int(x1))] if x1 > x0 else []
+        runs: List[Tuple[int, int]] = []
+        i = bisect.bisect_right(right, x0)
+        n = len(left)
+        while i < n and left[i] < x1:
+            if right[i] > left[i] and dist[i] > depth:
+                a, b = max(left[i], int(x0)), min(right[i], int(math.ceil(x1)))
+                if runs and runs[-1][1] >= a:
+                    runs[-1] = (runs[-1][0], b)
+                elif b > a:
+                    runs.append((a, b))
+            i += 1
+        return runs
@@ -0,0 +1,105 @@
+"""
+Preparación del render en un hilo: el raycasting de paredes y los tramos de
+piso solo leen el mapa y la pose del jugador, así que se calculan en un
+worker (los kernels de NumPy sueltan el GIL) mientras el hilo principal
+dibuja. Solo el dibujo necesita el contexto GL.
+
+Con latencia 0 el trabajo del frame se pide al inicio del render y se espera
+antes de dibujar piso y paredes (se solapa con cielo y nubes). Con latencia 1
+se dibuja el resultado del frame anterior y el del actual se calcula durante
+todo el frame.
+"""
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+
+class RenderPrep:
+    """Geometría lista para dibujar de una pose."""
+    __slots__ = ("pose", "floor", "walls", "depth", "rays_cast", "floor_s", "walls_s")
+
+    def __init__(self, pose: Tuple, floor, walls, depth, rays_cast: int, floor_s: float, walls_s: float):
+        self.pose = pose
+        self.floor = floor
+        self.walls = walls
+        self.depth = depth
+        self.rays_cast = rays_cast
+        self.floor_s = floor_s
+        self.walls_s = walls_s
+
+    @property
+    def compute_s(self) -> float:
+        return self.floor_s + self.walls_s
+
+
+class PrepWorker:
+    """
+    Hilo con a lo sumo un trabajo en vuelo: submit() deja la pose pedida
+    (reemplaza a una pendiente que no empezó) y wait() bloquea hasta que no
+    quede nada por calcular. Si compute lanza una excepción, el worker se
+    detiene y `error` la guarda (el renderer vuelve al modo síncrono).
+    """
+    def __init__(self, compute: Callable[[Tuple], RenderPrep], debug: bool = False):
+        self._compute = compute
+        self.debug = bool(debug)
+        self._cond = threading.Condition()
+        self._pending: Optional[Tuple] = None
+        self._busy = False
+        self._stop = False
+        self.result: Optional[RenderPrep] = None
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._worker, name="RenderPrep", daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self.error is None and not self._stop
+
+    def submit(self, pose: Tuple):
+        with self._cond:
+            self._pending = pose
+            self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[RenderPrep]:
+        """Espera a que termine lo pedido; retorna el último resultado."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._cond:
+            while (self._pending is not None or self._busy) and self.error is None and not self._stop:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return self.result
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._pending = None
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    # --------- helpers privados ---------
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                pose, self._pending = self._pending, None
+                self._busy = True
+            try:
+                result = self._compute(pose)
+            except Exception as e:
+                if self.debug:
+                    print(f"[RenderPrep] Error en worker: {e}")
+                with self._cond:
+                    self.error = e
+                    self._busy = False
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self.result = result
+                self._busy = False
+                self._cond.notify_all()
@@ -5,6 +5,8 @@ from typing import Any, Tuple, List
 import arcade
 from game.core.city import CityMap
 from game.core.utils import normalize_angle
+from game.rendering import raycast
+from game.rendering.render_prep import PrepWorker, RenderPrep
 
 
 class RayCastRenderer:
@@ -21,6 +23,54 @@ class RayCastRenderer:
         self.fov: float = float(rendering.get("fov", math.pi / 3))
         self.num_rays: int = int(rendering.get("num_rays", 120))
         self.floor_row_step: int = int(rendering.get("floor_row_step", 2))
+        # DDA vectorizado (NumPy); sin NumPy se usa el DDA por rayo
+        self.vectorized_walls: bool = bool(rendering.get("vectorized_walls", True)) and raycast.available()
+        self.vectorized_floor: bool = bool(rendering.get("vectorized_floor", True)) and raycast.available()
+        # Geometría por capa en un solo buffer: una llamada de dibujo por capa (cielo, piso, paredes)
+        self.batched_geometry: bool = bool(rendering.get("batched_geometry", True))
+        self._batches = {}
+        self._draw_calls = {"sky": 0, "floor": 0, "walls": 0, "ai": 0}
+        self._last_draw_calls = dict(self._draw_calls)
+
+        # Modo de render: "immediate" (primitivas de arcade) o "software" (framebuffer NumPy + 1 textura)
+        self.render_mode: str = str(rendering.get("mode", "immediate"))
+        res = rendering.get("software_resolution", [320, 200])
+        self.software_resolution: Tuple[int, int] = (int(res[0]), int(res[1]))
+        self.software_fog_distance: float = float(rendering.get("fog_distance", 0.0))
+        self.software_wall_texture: bool = bool(rendering.get("wall_texture", True))
+        self.software_smooth: bool = bool(rendering.get("software_smooth", False))
+        # Nubes horneadas en una panorámica (NumPy); sin ella, una elipse por puff
+        self.cloud_panorama: bool = bool(rendering.get("cloud_panorama", True)) and raycast.available()
+        self.cloud_rebake_distance: float = float(rendering.get("cloud_rebake_distance", 16.0))
+        # Fracción de puffs dibujados (la baja el gobernador de calidad)
+        self.cloud_detail: float = 1.0
+        self._cloud_panos = {}
+        self._cloud_blitter = None
+        # Coherencia temporal: reusar paredes/piso del frame anterior si nada cambió y,
+        # al rotar, los impactos de las columnas que siguen en pantalla (retícula angular)
+        self.temporal_reuse: bool = bool(rendering.get("temporal_reuse", True))
+        self._static_walls = (None, [], None)
+        self._static_floor = (None, [])
+        self._lattice_key = None
+        self._lattice = None
+        self._wall_hits = raycast.AngularCache() if raycast.available() else None
+        self._floor_cols = raycast.AngularCache() if raycast.available() else None
+        self._rays_cast = 0
+        self._last_rays_cast = 0
+        # Distancia a la pared por columna de pantalla (oclusión de sprites)
+        self.depth_buffer = raycast.DepthBuffer()
+        self._cast_depth = ([], [], [])
+        # Paredes y piso calculados en un hilo mientras se dibuja (ver render_prep);
+        # latencia 1 dibuja la geometría del frame anterior
+        self.async_prep: bool = bool(rendering.get("async_prep", False)) and raycast.available()
+        self.prep_latency: int = 1 if int(rendering.get("prep_latency_frames", 0)) >= 1 else 0
+        self._prep_worker = None
+        self._prep_compute = 0.0
+        self._framebuffer = None
+        self._blitter = None
+        self._sw_dirs_key = None
+        self._sw_dx = None
+        self._sw_dy = None
 
         # Colors
         self.col_street = tuple(colors.get("street", (105, 105, 105)))
@@ -49,6 +99,9 @@ class RayCastRenderer:
 
         # Doors
         self.door_positions = set()
+        self._doors_version = 0
+        if hasattr(self.city, "subscribe_edits"):
+            self.city.subscribe_edits(self._on_map_edit)
 
         # Floor precomputation
         self._cached_floor_height = None
@@ -60,10 +113,19 @@ class RayCastRenderer:
         self._ray_dirs: List[Tuple[float, float]] = []
         self._ray_last_angle = None
         self._ray_last_num = None
+        self._ray_dx = None
+        self._ray_dy = None
+        self._col_bounds_key = None
+        self._col_bounds = ([], [])
+        self._blocked_pad = None
+        self._blocked_pad_key = None
+        self._floor_lut = None
+        self._floor_palette: List[Tuple[int, int, int]] = []
+        self._floor_lut_key = None
 
         # Perf
         self.debug = bool(app_config.get("debug", False))
-        self._perf_accum = {"clouds": 0.0, "walls": 0.0, "floor": 0.0, "frames": 0}
+        self._perf_accum = {"clouds": 0.0, "walls": 0.0, "floor": 0.0, "software": 0.0, "frames": 0}
         self._last_perf_report = time.perf_counter()
 
         # limits
@@ -86,6 +148,9 @@ class RayCastRenderer:
                 ang = start + (i / (self.num_rays - 1)) * fov
                 dirs.append((math.cos(ang), math.sin(ang)))
         self._ray_dirs = dirs
+        if self.vectorized_walls or self.vectorized_floor:
+            self._ray_dx = raycast.np.array([d[0] for d in dirs])
+            self._ray_dy = raycast.np.array([d[1] for d in dirs])
         self._ray_last_angle = pang
         self._ray_last_num = self.num_rays
 
@@ -113,56 +178,151 @@ class RayCastRenderer:
         self._cached_floor_height = (height, horizon)
         self._cached_floor_step = self.floor_row_step
 
+    def set_quality(self, num_rays: int = None, floor_row_step: int = None, cloud_detail: float = None):
+        """Cambia las perillas de calidad e invalida los cachés que dependen de ellas."""
+        self._quiesce_prep()
+        if num_rays is not None and int(num_rays) != self.num_rays:
+            self.num_rays = max(1, int(num_rays))
+            self._ray_last_num = None
+            self._col_bounds_key = None
+        if floor_row_step is not None and int(floor_row_step) != self.floor_row_step:
+            self.floor_row_step = max(1, int(floor_row_step))
+            self._cached_floor_step = None
+        if cloud_detail is not None:
+            self.cloud_detail = min(1.0, max(0.0, float(cloud_detail)))
+
     def set_horizon_ratio(self, ratio: float):
         ratio = max(0.1, min(0.9, float(ratio)))
         if abs(ratio - getattr(self, 'horizon_ratio', 0.5)) > 1e-4:
+            self._quiesce_prep()
             self.horizon_ratio = ratio
             self._cached_floor_height = None
 
+    # ---------- Batches ----------
+    def _begin_layer(self, layer: str):
+        """
+        (draw_rect, draw_ellipse) de la capa: acumulan en su GeometryBatch o,
+        sin batching, dibujan en modo inmediato contando cada llamada.
+        """
+        batch = self._get_batch(layer)
+        if batch is not None:
+            batch.reset()
+            return batch.rect, batch.ellipse
+        calls = self._draw_calls
+
+        def draw_rect(l, r, b, t, c):
+            calls[layer] += 1
+            arcade.draw_lrbt_rectangle_filled(l, r, b, t, c)
+
+        def draw_ellipse(x, y, w, h, c):
+            calls[layer] += 1
+            arcade.draw_ellipse_filled(x, y, w, h, c)
+
+        return draw_rect, draw_ellipse
+
+    def _end_layer(self, layer: str):
+        batch = self._batches.get(layer)
+        if batch is not None and self.batched_geometry:
+            self._draw_calls[layer] += batch.draw()
+
+    def _get_batch(self, layer: str):
+        if not self.batched_geometry:
+            return None
+        batch = self._batches.get(layer)
+        if batch is None:
+            try:
+                from game.rendering.batch import GeometryBatch
+                batch = self._batches[layer] = GeometryBatch()
+            except Exception as e:
+                print(f"[WorldRenderer] Batching deshabilitado: {e}")
+                self.batched_geometry = False
+                return None
+        return batch
+
     # ---------- Sky ----------
-    def _render_sky(self, width: int, height: int, horizon: int, weather_system):
+    def _render_sky(self, width: int, height: int, horizon: int, weather_system, draw_rect=None):
         col = self.col_sky
         if weather_system:
             col = weather_system.sky_color
-        arcade.draw_lrbt_rectangle_filled(0, width, horizon, height, col)
+        (draw_rect or arcade.draw_lrbt_rectangle_filled)(0, width, horizon, height, col)
 
     # ---------- Clouds ----------
-    def _render_clouds(self, width: int, height: int, px: float, py: float, pang: float, weather_system):
+    def _render_clouds(self, width: int, height: int, px: float, py: float, pang: float, weather_system,
+                       draw_ellipse=None, pixel_scale: float = 1.0):
+        from game.rendering.clouds import MAX_CLOUD_DIST, cloud_skip, puff_rank, puff_size
+
         col_cloud = self.col_cloud
         if weather_system:
             col_cloud = weather_system.cloud_color
         cloud_y = int(height * 0.75)
         half_fov = self.fov * 0.5
-        draw_ellipse = arcade.draw_ellipse_filled
-        for (cx, cy, puffs) in self.cloud_groups:
+        draw_ellipse = draw_ellipse or arcade.draw_ellipse_filled
+        for g, (cx, cy, puffs) in enumerate(self.cloud_groups):
             dx = cx - px
             dy = cy - py
             dist = math.hypot(dx, dy)
-            if dist > 140:
+            if dist > MAX_CLOUD_DIST:
                 continue
             bearing = math.atan2(dy, dx)
             delta = normalize_angle(bearing - pang)
             if abs(delta) > (half_fov + 0.2):
                 continue
             sx = int(((delta / self.fov) + 0.5) * width)
-            size_base = max(8, int(260 / (18 + dist)))
-            if dist > 100:
-                skip = 0.75
-            elif dist > 70:
-                skip = 0.5
-            elif dist > 50:
-                skip = 0.25
-            else:
-                skip = 0.0
-            for (jx, jy, s) in puffs:
-                if skip and random.random() < skip:
+            skip = max(cloud_skip(dist), 1.0 - self.cloud_detail)
+            for i, (jx, jy, s) in enumerate(puffs):
+                # Descarte fijo por puff (antes era aleatorio por frame y parpadeaba)
+                if skip and puff_rank(g, i) < skip:
                     continue
-                w = int(size_base * 0.4 * (1 + s))
-                h = int(size_base * 0.18 * (1 + s))
+                w, h = puff_size(dist, s)
                 if w < 2 or h < 2:
                     continue
+                if pixel_scale != 1.0:
+                    draw_ellipse(sx + jx * pixel_scale, cloud_y + jy * pixel_scale,
+                                 w * 2 * pixel_scale, h * pixel_scale, col_cloud)
+                    continue
                 draw_ellipse(sx + jx, cloud_y + jy, w * 2, h, col_cloud)
 
+    def _cloud_pano(self, target: str, px: float, py: float, screen_width: int, pixel_scale: float = 1.0):
+        """Panorámica de nubes del destino ("immediate" o "software"), horneada si hace falta."""
+        pano = self._cloud_panos.get(target)
+        if pano is None:
+            from game.rendering.clouds import CloudPanorama
+            pano = self._cloud_panos[target] = CloudPanorama(
+                self.cloud_groups, self.fov, rebake_distance=self.cloud_rebake_distance)
+        if pano.ensure(px, py, screen_width, pixel_scale, self.cloud_detail) and self.debug:
+            print(f"[WorldRenderer] Nubes horneadas ({target}): {pano.mask.shape[1]}x{pano.mask.shape[0]}")
+        return pano
+
+    def _render_clouds_panorama(self, width: int, height: int, px: float, py: float, pang: float,
+                                weather_system) -> bool:
+        """Nubes como un quad con la ventana visible de la panorámica; False si no se pudo."""
+        try:
+            pano = self._cloud_pano("immediate", px, py, width)
+            if self._cloud_blitter is None:
+                from game.rendering.clouds import PanoramaBlitter
+                self._cloud_blitter = PanoramaBlitter(arcade.get_window().ctx)
+        except Exception as e:
+            print(f"[WorldRenderer] Panorámica de nubes deshabilitada: {e}")
+            self.cloud_panorama = False
+            return False
+        color = weather_system.cloud_color if weather_system else self.col_cloud
+        cloud_y = int(height * 0.75)
+        self._cloud_blitter.draw(pano, 0, cloud_y - pano.band_half, width, cloud_y + pano.band_half,
+                                 (width, height), pano.window(px, py, pang), color)
+        self._draw_calls["sky"] += 1
+        return True
+
+    def _render_clouds_software(self, fb, px: float, py: float, pang: float, color, pixel_scale: float):
+        """Copia la ventana visible de la panorámica en el framebuffer (una máscara, un color)."""
+        from game.rendering.framebuffer import pack_rgba
+
+        pano = self._cloud_pano("software", px, py, fb.width, pixel_scale)
+        mask = pano.mask[:, pano.columns(fb.width, px, py, pang)] != 0
+        y0 = int(fb.height * 0.75) - pano.band_half
+        r0, r1 = max(0, -y0), min(mask.shape[0], fb.height - y0)
+        if r0 < r1:
+            raycast.np.copyto(fb.packed[y0 + r0:y0 + r1], pack_rgba(color[:3]), where=mask[r0:r1])
+
     # ---------- Walls ----------
     def _cast_wall_dda(self, pos_x: float, pos_y: float, dir_x: float, dir_y: float):
         map_x, map_y = int(pos_x), int(pos_y)
@@ -181,11 +341,13 @@ class RayCastRenderer:
             step_y = 1
             side_dist_y = (map_y + 1.0 - pos_y) * delta_dist_y
         side = 0
-        max_iter = (self.city.width + self.city.height) * 4
+        W = self.city.width
+        H = self.city.height
+        blocked = self.city.blocked
+        max_iter = (W + H) * 4
         it = 0
-        while 0 <= map_x < self.city.width and 0 <= map_y < self.city.height and it < max_iter:
-            tile = self.city.tiles[map_y][map_x]
-            if tile == "B":
+        while 0 <= map_x < W and 0 <= map_y < H and it < max_iter:
+            if blocked[map_y * W + map_x]:
                 if side == 0:
                     perp = (map_x - pos_x + (1 - step_x) * 0.5) / (dir_x if dir_x != 0 else 1e-6)
                 else:
@@ -202,17 +364,136 @@ class RayCastRenderer:
             it += 1
         return None, None, False
 
+    def _column_bounds(self, width: int):
+        key = (width, self.num_rays)
+        if self._col_bounds_key != key:
+            column_width_f = width / float(self.num_rays)
+            self._col_bounds = (
+                [int(i * column_width_f) for i in range(self.num_rays)],
+                [int((i + 1) * column_width_f) for i in range(self.num_rays)],
+            )
+            self._col_bounds_key = key
+        return self._col_bounds
+
+    # ---------- Coherencia temporal ----------
+    def _lattice_window(self, width: int):
+        """
+        Columnas visibles de la retícula angular: (j0, n, left, right). El rayo j
+        apunta a j * fov / num_rays y su columna se centra en ese ángulo, así
+        una rotación solo corre los índices.
+        """
+        key = (self._ray_last_angle, width, self.num_rays)
+        if self._lattice_key != key:
+            np = raycast.np
+            pang = self._ray_last_angle
+            step = self.fov / self.num_rays
+            j0 = int(math.floor((pang - self.fov * 0.5) / step))
+            n = self.num_rays + 2
+            cw = width / float(self.num_rays)
+            x0 = ((j0 * step - pang) / self.fov + 0.5) * width - cw * 0.5
+            edges = np.clip(np.floor(x0 + np.arange(n + 1) * cw), 0, width).astype(np.int64)
+            self._lattice = (j0, n, edges[:-1], edges[1:])
+            self._lattice_key = key
+        return self._lattice
+
+    def _lattice_dirs(self, first: int, count: int):
+        np = raycast.np
+        ang = np.arange(first, first + count) * (self.fov / self.num_rays)
+        return np.cos(ang), np.sin(ang)
+
+    def _gather_walls_lattice(self, blocked, width: int, height: int, horizon: int, px: float, py: float):
+        j0, n, col_left, col_right = self._lattice_window(width)
+        W, H = self.city.width, self.city.height
+
+        def cast(first, count):
+            dx, dy = self._lattice_dirs(first, count)
+            dist, side, map_x, map_y, hit = raycast.cast_rays(blocked, W, H, px, py, dx, dy, (W + H) * 4)
+            return dist, side, hit, raycast.door_flags(map_x, map_y, hit, self.door_positions)
+
+        key = (px, py, self.num_rays, self._blocked_pad_key, self._doors_version)
+        dist, side, hit, door = self._wall_hits.columns(key, j0, n, cast)
+        self._rays_cast += self._wall_hits.computed
+        self._cast_depth = (col_left, col_right, dist, hit)
+        colors = (self.col_wall, self.col_wall_dark, self.col_door)
+        return [(l, r, b, t, colors[c]) for l, r, b, t, c in
+                raycast.wall_slices(dist, side, door, hit, col_left, col_right, height, horizon)]
+
+    def _render_floor_lattice(self, codes, width: int, horizon: int, px: float, py: float, draw_rect):
+        lut = self._floor_color_lut()
+        if len(self._floor_palette) <= 1:
+            return
+        j0, n, col_left, col_right = self._lattice_window(width)
+        W, H = self.city.width, self.city.height
+        row_dist = self._floor_row_dist
+
+        def sample(first, count):
+            dx, dy = self._lattice_dirs(first, count)
+            return (raycast.floor_colors(codes, lut, W, H, px, py, dx, dy, row_dist),)
+
+        key = (px, py, self.num_rays, self._cached_floor_height, self._cached_floor_step,
+               getattr(self.city, "map_version", 0), self._floor_lut_key)
+        colors, = self._floor_cols.columns(key, j0, n, sample)
+        step = max(1, self.floor_row_step)
+        rows = self._floor_sample_rows
+        palette = self._floor_palette
+        for row, first, last, color in raycast.color_spans(colors):
+            y = rows[row]
+            bottom = max(0, y)
+            top = min(horizon, y + step)
+            left, right = int(col_left[first]), int(col_right[last])
+            if bottom < top and right > left:
+                draw_rect(left, right, bottom, top, palette[color])
+
+    def _gather_walls_vectorized(self, blocked, width: int, height: int, horizon: int, px: float, py: float):
+        W, H = self.city.width, self.city.height
+        dist, side, map_x, map_y, hit = raycast.cast_rays(
+            blocked, W, H, px, py, self._ray_dx, self._ray_dy, (W + H) * 4)
+        door = raycast.door_flags(map_x, map_y, hit, self.door_positions)
+        col_left, col_right = self._column_bounds(width)
+        self._cast_depth = (col_left, col_right, dist, hit)
+        colors = (self.col_wall, self.col_wall_dark, self.col_door)
+        return [(l, r, b, t, colors[c]) for l, r, b, t, c in
+                raycast.wall_slices(dist, side, door, hit, col_left, col_right, height, horizon)]
+
     def _gather_walls(self, width: int, height: int, horizon: int, px: float, py: float):
+        """
+        (tramos de pared, profundidad por columna); con el mismo punto de vista
+        que el frame anterior se reutilizan.
+        """
+        key = (px, py, self._ray_last_angle, width, height, horizon, self.num_rays,
+               getattr(self.city, "map_version", 0), self._doors_version)
+        if self.temporal_reuse and self._static_walls[0] == key:
+            return self._static_walls[1], self._static_walls[2]
+        slices = self._cast_walls(width, height, horizon, px, py)
+        self._static_walls = (key, slices, self._cast_depth)
+        return slices, self._cast_depth
+
+    def _cast_walls(self, width: int, height: int, horizon: int, px: float, py: float):
+        if self.vectorized_walls and self._ray_dx is not None:
+            key = (id(self.city.blocked), getattr(self.city, "map_version", 0))
+            if self._blocked_pad_key != key:
+                self._blocked_pad = raycast.blocked_array(self.city)
+                self._blocked_pad_key = key
+            blocked = self._blocked_pad
+            if blocked is not None:
+                if self.temporal_reuse:
+                    return self._gather_walls_lattice(blocked, width, height, horizon, px, py)
+                self._rays_cast += self.num_rays
+                return self._gather_walls_vectorized(blocked, width, height, horizon, px, py)
+        self._rays_cast += self.num_rays
         wall_slices = []
-        column_width_f = width / float(self.num_rays)
+        col_left, col_right = self._column_bounds(width)
+        depth = [0.0] * len(col_left)
         for ray, (dir_x, dir_y) in enumerate(self._ray_dirs):
-            left = int(ray * column_width_f)
-            right = int((ray + 1) * column_width_f)
+            left = col_left[ray]
+            right = col_right[ray]
             if right <= left:
                 continue
             dist, side, is_door = self._cast_wall_dda(px, py, dir_x, dir_y)
             if dist is None or dist <= 0:
+                depth[ray] = float("inf")
                 continue
+            depth[ray] = dist
             line_h = int(height / max(0.0001, dist))
             half = line_h // 2
             top = min(height, horizon + half)
@@ -220,6 +501,7 @@ class RayCastRenderer:
             if bottom < top:
                 col = self.col_door if is_door else (self.col_wall_dark if side else self.col_wall)
                 wall_slices.append((left, right, bottom, top, col))
+        self._cast_depth = (col_left, col_right, depth)
 
         # Merge horizontal
         merged = []
@@ -235,14 +517,80 @@ class RayCastRenderer:
         return merged
 
     def _draw_walls(self, wall_slices):
-        draw_rect = arcade.draw_lrbt_rectangle_filled
+        draw_rect, _ = self._begin_layer("walls")
         for l, r, b, t, c in wall_slices:
             draw_rect(l, r, b, t, c)
+        self._end_layer("walls")
 
     # ---------- Floor ----------
-    def _render_floor(self, width: int, height: int, horizon: int, px: float, py: float):
+    def _floor_color_lut(self):
+        """
+        Código de tile -> índice en _floor_palette (0 = sin pintar). Parques con
+        colors.park; otros tiles con "floor_color" en la leyenda también se pintan.
+        """
+        city = self.city
+        key = (tuple(city._chars), id(city.legend))
+        if self._floor_lut_key == key:
+            return self._floor_lut
+        np = raycast.np
+        lut = np.zeros(256, dtype=np.uint8)
+        palette = [None]
+        for code, ch in enumerate(city._chars):
+            color = self.col_park if ch == "P" else (city.legend.get(ch) or {}).get("floor_color")
+            if not color or ch == "B":
+                continue
+            color = tuple(color)
+            if color not in palette:
+                palette.append(color)
+            lut[code] = palette.index(color)
+        self._floor_lut = lut
+        self._floor_palette = palette
+        self._floor_lut_key = key
+        return lut
+
+    def _render_floor_vectorized(self, codes, width: int, horizon: int, px: float, py: float, draw_rect):
+        lut = self._floor_color_lut()
+        if len(self._floor_palette) <= 1:
+            return
+        step = max(1, self.floor_row_step)
+        col_left, col_right = self._column_bounds(width)
+        rows = self._floor_sample_rows
+        palette = self._floor_palette
+        spans = raycast.floor_spans(codes, lut, self.city.width, self.city.height, px, py,
+                                    self._ray_dx, self._ray_dy, self._floor_row_dist)
+        for row, first, last, color in spans:
+            y = rows[row]
+            bottom = max(0, y)
+            top = min(horizon, y + step)
+            left, right = col_left[first], col_right[last]
+            if bottom < top and right > left:
+                draw_rect(left, right, bottom, top, palette[color])
+
+    def _floor_rects(self, width: int, height: int, horizon: int, px: float, py: float):
+        """Rectángulos del piso; con el mismo punto de vista que el frame anterior se reutilizan."""
+        key = (px, py, self._ray_last_angle, width, height, horizon, self.num_rays,
+               self.floor_row_step, getattr(self.city, "map_version", 0))
+        if self.temporal_reuse and self._static_floor[0] == key:
+            return self._static_floor[1]
+        rects = []
+
+        def record(l, r, b, t, c):
+            rects.append((l, r, b, t, c))
+
+        self._render_floor_spans(record, width, height, horizon, px, py)
+        self._static_floor = (key, rects)
+        return rects
+
+    def _render_floor(self, rects):
+        draw_rect, _ = self._begin_layer("floor")
+        try:
+            for rect in rects:
+                draw_rect(*rect)
+        finally:
+            self._end_layer("floor")
+
+    def _render_floor_spans(self, draw_rect, width: int, height: int, horizon: int, px: float, py: float):
         # Fill base street once
-        draw_rect = arcade.draw_lrbt_rectangle_filled
         draw_rect(0, width, 0, horizon, self.col_street)
 
         # Prepare rows and rays
@@ -250,6 +598,15 @@ class RayCastRenderer:
         if not self._floor_sample_rows or not self._ray_dirs:
             return
 
+        if self.vectorized_floor and self._ray_dx is not None:
+            codes = raycast.grid_array(self.city)
+            if codes is not None:
+                if self.temporal_reuse:
+                    self._render_floor_lattice(codes, width, horizon, px, py, draw_rect)
+                else:
+                    self._render_floor_vectorized(codes, width, horizon, px, py, draw_rect)
+                return
+
         # Local refs for speed
         tiles = self.city.tiles
         W = self.city.width
@@ -303,6 +660,86 @@ class RayCastRenderer:
             if in_span and last_right > span_left_px:
                 draw_rect(span_left_px, last_right, bottom, top, park_col)
 
+    # ---------- Software ----------
+    def set_render_mode(self, mode: str) -> str:
+        self._quiesce_prep()
+        self.render_mode = "software" if mode == "software" else "immediate"
+        return self.render_mode
+
+    def toggle_render_mode(self) -> str:
+        return self.set_render_mode("immediate" if self.render_mode == "software" else "software")
+
+    def _software_dirs(self, pang: float, columns: int):
+        key = (pang, columns, self.fov)
+        if self._sw_dirs_key != key:
+            np = raycast.np
+            start = pang - self.fov * 0.5
+            ang = start + (np.arange(columns) / max(1, columns - 1)) * self.fov
+            self._sw_dx, self._sw_dy = np.cos(ang), np.sin(ang)
+            self._sw_dirs_key = key
+        return self._sw_dx, self._sw_dy
+
+    def _render_software(self, win, width: int, height: int, px: float, py: float, pang: float,
+                         weather_system) -> bool:
+        """Cielo, nubes, piso y paredes en el framebuffer; False si el modo no está disponible."""
+        if not raycast.available():
+            return False
+        self._quiesce_prep()
+        codes = raycast.grid_array(self.city)
+        key = (id(self.city.blocked), getattr(self.city, "map_version", 0))
+        if self._blocked_pad_key != key:
+            self._blocked_pad = raycast.blocked_array(self.city)
+            self._blocked_pad_key = key
+        if codes is None or self._blocked_pad is None:
+            return False
+        try:
+            from game.rendering.framebuffer import SoftwareFramebuffer, TextureBlitter, pack_rgba, wall_u
+            if self._blitter is None:
+                self._blitter = TextureBlitter(win.ctx)
+        except Exception as e:
+            print(f"[WorldRenderer] Modo software no disponible: {e}")
+            return False
+
+        np = raycast.np
+        fw, fh = self.software_resolution
+        if self._framebuffer is None:
+            self._framebuffer = SoftwareFramebuffer(fw, fh)
+        fb = self._framebuffer
+        fb.resize(fw, fh)
+        horizon = int(fb.height * 0.5)
+        sky = weather_system.sky_color if weather_system else self.col_sky
+
+        fb.fill_rows(horizon, fb.height, sky)
+        pixel_scale = fb.height / float(max(1, height))
+        if self.cloud_detail > 0.0:
+            if self.cloud_panorama:
+                cloud = weather_system.cloud_color if weather_system else self.col_cloud
+                self._render_clouds_software(fb, px, py, pang, cloud, pixel_scale)
+            else:
+                self._render_clouds(fb.width, fb.height, px, py, pang, weather_system,
+                                    draw_ellipse=fb.ellipse, pixel_scale=pixel_scale)
+
+        fb.fill_rows(0, horizon, self.col_street)
+        dx, dy = self._software_dirs(pang, fb.width)
+        lut = self._floor_color_lut()
+        palette = pack_rgba(np.array([(0, 0, 0)] + [c[:3] for c in self._floor_palette[1:]], dtype=np.uint8))
+        fb.floor(codes, lut, palette, self.city.width, self.city.height,
+                 px, py, dx, dy, horizon, self.MAX_FLOOR_DIST)
+
+        W, H = self.city.width, self.city.height
+        dist, side, map_x, map_y, hit = raycast.cast_rays(self._blocked_pad, W, H, px, py, dx, dy, (W + H) * 4)
+        door = raycast.door_flags(map_x, map_y, hit, self.door_positions)
+        cols = np.arange(fb.width + 1) * width // fb.width
+        self.depth_buffer.set(cols[:-1], cols[1:], dist, hit)
+        fb.walls(dist, side, hit, door, wall_u(px, py, dx, dy, dist, side), horizon,
+                 (self.col_wall, self.col_wall_dark, self.col_door),
+                 fog_color=sky, fog_distance=self.software_fog_distance,
+                 textured=self.software_wall_texture)
+
+        self._blitter.blit(fb, smooth=self.software_smooth)
+        self._draw_calls["sky"] += 1
+        return True
+
     # ---------- Public world render ----------
     def render_world(self, player, weather_system=None, delta_time=0.016):
         """
@@ -321,30 +758,145 @@ class RayCastRenderer:
         horizon = int(height * 0.5)
         px, py, pang = self._get_player(player)
 
-        self._prepare_rays(pang)
+        for k in self._draw_calls:
+            self._draw_calls[k] = 0
+        self._last_rays_cast = 0
 
-        # Sky first
-        self._render_sky(width, height, horizon, weather_system)
+        # Modo software: todo el mundo en una textura
+        if self.render_mode == "software":
+            t0 = time.perf_counter()
+            if self._render_software(win, width, height, px, py, pang, weather_system):
+                self._perf_accum["software"] = self._perf_accum.get("software", 0.0) + (time.perf_counter() - t0)
+            else:
+                self.render_mode = "immediate"
+        if self.render_mode != "software":
+            self._render_immediate(width, height, horizon, px, py, pang, weather_system)
 
-        # Clouds
+        self._render_ai_sprites(win, px, py, pang, width, height, delta_time)
+
+        self._last_draw_calls = dict(self._draw_calls)
+        self._perf_accum["frames"] += 1
+        now = time.perf_counter()
+        if now - self._last_perf_report > 2.0 and self.debug:
+            f = max(1, self._perf_accum["frames"])
+            clouds_ms = (self._perf_accum["clouds"] / f) * 1000
+            walls_ms = (self._perf_accum["walls"] / f) * 1000
+            floor_ms = (self._perf_accum["floor"] / f) * 1000
+            software_ms = (self._perf_accum.get("software", 0.0) / f) * 1000
+            ai_ms = (self._perf_accum.get("ai", 0.0) / f) * 1000
+            wait_ms = (self._perf_accum.get("prep_wait", 0.0) / f) * 1000
+            prep_ms = (self._prep_compute / f) * 1000
+            total_ms = clouds_ms + walls_ms + floor_ms + software_ms + ai_ms + wait_ms
+            draw_calls = sum(self._last_draw_calls.values())
+            print(
+                f"[WorldRenderer] mode:{self.render_mode} clouds:{clouds_ms:.2f}ms floor:{floor_ms:.2f}ms walls:{walls_ms:.2f}ms software:{software_ms:.2f}ms ai:{ai_ms:.2f}ms prep:{prep_ms:.2f}ms wait:{wait_ms:.2f}ms total:{total_ms:.2f}ms draw_calls:{draw_calls}")
+            self._perf_accum = {"clouds": 0.0, "walls": 0.0, "floor": 0.0, "software": 0.0, "ai": 0.0, "frames": 0}
+            self._prep_compute = 0.0
+            self._last_perf_report = now
+
+    def _render_immediate(self, width: int, height: int, horizon: int, px: float, py: float, pang: float,
+                          weather_system):
+        # Con el worker activo, paredes y piso se calculan mientras se dibujan cielo y nubes
+        pose = (width, height, horizon, px, py, pang)
+        previous = self._begin_prep(pose)
+
+        # Sky first (cielo y nubes comparten capa)
+        draw_rect, draw_ellipse = self._begin_layer("sky")
+        self._render_sky(width, height, horizon, weather_system, draw_rect)
+
+        # Clouds: panorámica pre-renderizada (un quad) o una elipse por puff
         t0 = time.perf_counter()
-        self._render_clouds(width, height, px, py, pang, weather_system)
+        if self.cloud_detail <= 0.0:
+            self._end_layer("sky")
+        elif self.cloud_panorama:
+            self._end_layer("sky")
+            if not self._render_clouds_panorama(width, height, px, py, pang, weather_system):
+                draw_rect, draw_ellipse = self._begin_layer("sky")
+                self._render_clouds(width, height, px, py, pang, weather_system, draw_ellipse)
+                self._end_layer("sky")
+        else:
+            self._render_clouds(width, height, px, py, pang, weather_system, draw_ellipse)
+            self._end_layer("sky")
         t_clouds = time.perf_counter()
         self._perf_accum["clouds"] += (t_clouds - t0)
 
+        # Geometría de piso y paredes (calculada en el worker o aquí mismo)
+        prep = self._finish_prep(pose, previous)
+        self.depth_buffer.set(*prep.depth)
+        self._last_rays_cast = prep.rays_cast
+
         # Floor - BEFORE walls to avoid overlaps
         t0 = time.perf_counter()
-        self._render_floor(width, height, horizon, px, py)
+        self._render_floor(prep.floor)
         t_floor = time.perf_counter()
         self._perf_accum["floor"] += (t_floor - t0)
 
         # Walls - AFTER floor
         t0 = time.perf_counter()
-        wall_slices = self._gather_walls(width, height, horizon, px, py)
-        self._draw_walls(wall_slices)
+        self._draw_walls(prep.walls)
         t_walls = time.perf_counter()
         self._perf_accum["walls"] += (t_walls - t0)
 
+    # ---------- Preparación (paredes y piso) ----------
+    def _compute_prep(self, pose) -> RenderPrep:
+        """Paredes, piso y profundidad de una pose. Corre en el worker o en el hilo principal."""
+        width, height, horizon, px, py, pang = pose
+        self._prepare_rays(pang)
+        self._rays_cast = 0
+        t0 = time.perf_counter()
+        floor = self._floor_rects(width, height, horizon, px, py)
+        t1 = time.perf_counter()
+        walls, depth = self._gather_walls(width, height, horizon, px, py)
+        t2 = time.perf_counter()
+        return RenderPrep(pose, floor, walls, depth, self._rays_cast, t1 - t0, t2 - t1)
+
+    def _begin_prep(self, pose):
+        """Pide al worker la pose del frame; con latencia 1 retorna el resultado del frame anterior."""
+        if not self.async_prep:
+            return None
+        worker = self._prep_worker
+        if worker is None:
+            worker = self._prep_worker = PrepWorker(self._compute_prep, debug=self.debug)
+        previous = None
+        if self.prep_latency:
+            t0 = time.perf_counter()
+            previous = worker.wait()
+            self._perf_accum["prep_wait"] = self._perf_accum.get("prep_wait", 0.0) + (time.perf_counter() - t0)
+        worker.submit(pose)
+        return previous
+
+    def _finish_prep(self, pose, previous) -> RenderPrep:
+        worker = self._prep_worker
+        if self.async_prep and worker is not None:
+            # La geometría del frame anterior solo sirve si no cambió el tamaño de pantalla
+            prep = previous if previous is not None and previous.pose[:3] == pose[:3] else None
+            if prep is None:
+                t0 = time.perf_counter()
+                prep = worker.wait()
+                self._perf_accum["prep_wait"] = self._perf_accum.get("prep_wait", 0.0) + (time.perf_counter() - t0)
+            if worker.error is None and prep is not None:
+                self._prep_compute += prep.compute_s
+                return prep
+            print(f"[WorldRenderer] Preparación asíncrona deshabilitada: {worker.error}")
+            self.close()
+            self.async_prep = False
+        prep = self._compute_prep(pose)
+        self._perf_accum["floor"] += prep.floor_s
+        self._perf_accum["walls"] += prep.walls_s
+        return prep
+
+    def _quiesce_prep(self):
+        """Espera al worker antes de tocar el estado que lee (calidad, puertas, modo)."""
+        if self._prep_worker is not None:
+            self._prep_worker.wait()
+
+    def close(self):
+        """Detiene el worker de preparación (fin de partida)."""
+        worker, self._prep_worker = self._prep_worker, None
+        if worker is not None:
+            worker.stop()
+
+    def _render_ai_sprites(self, win, px: float, py: float, pang: float, width: int, height: int, delta_time):
         # ============ RENDERIZAR AI PLAYERS ============
         t0 = time.perf_counter()
         if hasattr(win, 'ai_players') and win.ai_players:
@@ -368,8 +920,10 @@ class RayCastRenderer:
                         px, py, pang,
                         width, height,
                         self.fov,
-                        delta_time
+                        delta_time,
+                        depth=self.depth_buffer
                     )
+                    self._draw_calls["ai"] = self.ai_sprite_renderer.last_draw_calls
                 except Exception as e:
                     if self.debug:
                         print(f"[WorldRenderer] Error renderizando AIs: {e}")
@@ -380,20 +934,6 @@ class RayCastRenderer:
         self._perf_accum["ai"] += (t_ai - t0)
         # ===============================================
 
-        self._perf_accum["frames"] += 1
-        now = time.perf_counter()
-        if now - self._last_perf_report > 2.0 and self.debug:
-            f = max(1, self._perf_accum["frames"])
-            clouds_ms = (self._perf_accum["clouds"] / f) * 1000
-            walls_ms = (self._perf_accum["walls"] / f) * 1000
-            floor_ms = (self._perf_accum["floor"] / f) * 1000
-            ai_ms = (self._perf_accum.get("ai", 0.0) / f) * 1000
-            total_ms = clouds_ms + walls_ms + floor_ms + ai_ms
-            print(
-                f"[WorldRenderer] clouds:{clouds_ms:.2f}ms floor:{floor_ms:.2f}ms walls:{walls_ms:.2f}ms ai:{ai_ms:.2f}ms total:{total_ms:.2f}ms")
-            self._perf_accum = {"clouds": 0.0, "walls": 0.0, "floor": 0.0, "ai": 0.0, "frames": 0}
-            self._last_perf_report = now
-
     def get_perf_snapshot(self):
         f = max(1, self._perf_accum.get("frames", 0))
         if f <= 0:
@@ -401,14 +941,45 @@ class RayCastRenderer:
         clouds_ms = (self._perf_accum["clouds"] / f) * 1000.0
         floor_ms = (self._perf_accum["floor"] / f) * 1000.0
         walls_ms = (self._perf_accum["walls"] / f) * 1000.0
+        software_ms = (self._perf_accum.get("software", 0.0) / f) * 1000.0
+        # Preparación asíncrona: cálculo en el worker, espera del hilo principal y lo solapado
+        prep_ms = (self._prep_compute / f) * 1000.0
+        wait_ms = (self._perf_accum.get("prep_wait", 0.0) / f) * 1000.0
         return {
+            "mode": self.render_mode,
             "clouds_ms": clouds_ms,
             "floor_ms": floor_ms,
             "walls_ms": walls_ms,
-            "total_ms": clouds_ms + floor_ms + walls_ms,
+            "software_ms": software_ms,
+            "total_ms": clouds_ms + floor_ms + walls_ms + software_ms + wait_ms,
+            "async_prep": bool(self.async_prep),
+            "prep_ms": prep_ms,
+            "prep_wait_ms": wait_ms,
+            "overlap_ms": max(0.0, prep_ms - wait_ms),
+            # Llamadas de dibujo del último frame, por capa
+            "draw_calls": dict(self._last_draw_calls),
+            "draw_calls_total": sum(self._last_draw_calls.values()),
+            # Rayos de pared lanzados en el último frame (0 si se reutilizó todo)
+            "rays_cast": self._last_rays_cast,
         }
 
     # ---------- Content ----------
+    def _on_map_edit(self, rect, map_version: int):
+        """Quita solo las puertas del rectángulo editado que ya no están sobre un edificio."""
+        x0, y0, x1, y1 = rect
+        self._quiesce_prep()
+        stale = [(x, y) for (x, y) in self.door_positions
+                 if x0 <= x <= x1 and y0 <= y <= y1 and self.city.get_tile_at(x, y) != "B"]
+        for pos in stale:
+            self.door_positions.discard(pos)
+        if stale:
+            self._doors_version += 1
+
+    def clear_doors(self):
+        self._quiesce_prep()
+        self.door_positions.clear()
+        self._doors_version += 1
+
     def generate_door_at(self, tile_x: int, tile_y: int):
         if not self.city:
             return
@@ -416,4 +987,7 @@ class RayCastRenderer:
             return
         if self.city.tiles[tile_y][tile_x] != "B":
             return
-        self.door_positions.add((tile_x, tile_y))
\ No newline at end of file
+        if (tile_x, tile_y) not in self.door_positions:
+            self._quiesce_prep()
+            self.door_positions.add((tile_x, tile_y))
+            self._doors_version += 1
\ No newline at end of file
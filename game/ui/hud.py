@@ -1,8 +1,11 @@
 import math
 import random
+import time
 import arcade
+from game.rendering.batch import GeometryBatch
 from game.core.utils import format_time
 from game.ui.inventory_panel import InventoryPanel
+from game.ui.text_cache import TEXT_CACHE, draw_text, text_batch
 
 
 class HUDRenderer:
@@ -10,11 +13,27 @@ class HUDRenderer:
     Dibuja el HUD completo (earnings, tiempo, stamina, reputación, velocímetro, icono del clima,
     textos de ayuda y métricas de debug). Mantiene posiciones originales.
     """
+    SPEEDO_START = 135
+    SPEEDO_END = 405
+    STATE_COLORS = {
+        "normal": arcade.color.GREEN,
+        "tired": arcade.color.YELLOW,
+        "exhausted": arcade.color.RED
+    }
+
     def __init__(self, app_config: dict, debug: bool = False):
         self.app_config = app_config
         self.debug = bool(debug)
         self._inv_panel = None
         self._last_game = None
+        # Capas cacheadas (una llamada de dibujo cada una)
+        self._layer_under = GeometryBatch(ellipse_segments=32)
+        self._layer_dynamic = GeometryBatch(ellipse_segments=16)
+        self._layer_over = GeometryBatch(ellipse_segments=16)
+        self._layer_weather = GeometryBatch(ellipse_segments=24)
+        self._static_key = None
+        self._dynamic_key = None
+        self._weather_key = None
 
     # --------- Public ---------
     def draw(self, game):
@@ -25,18 +44,24 @@ class HUDRenderer:
             avg_dt = (sum(dt_list) / len(dt_list)) if dt_list else 0.0
             avg_fps = (1.0 / avg_dt) if avg_dt > 0 else 0.0
             rays = getattr(game.renderer, "num_rays", 0)
-            arcade.draw_text(f"FPS: {avg_fps:.1f} | Rays: {rays}", 10, game.height - 20, arcade.color.YELLOW, 12)
+            draw_text(f"FPS: {avg_fps:.1f} | Rays: {rays}", 10, game.height - 20, arcade.color.YELLOW, 12)
 
             # Perf renderer y minimapa
             rx = 10
             ry = game.height - 40
             if getattr(game, "renderer", None) and hasattr(game.renderer, "get_perf_snapshot"):
                 snap = game.renderer.get_perf_snapshot()
-                arcade.draw_text(f"World ms - clouds:{snap['clouds_ms']:.2f} floor:{snap['floor_ms']:.2f} walls:{snap['walls_ms']:.2f} total:{snap['total_ms']:.2f}",
-                                 rx, ry - 16, arcade.color.LIGHT_GRAY, 10)
+                draw_text(f"World ms [{snap.get('mode', 'immediate')}] - clouds:{snap['clouds_ms']:.2f} floor:{snap['floor_ms']:.2f} walls:{snap['walls_ms']:.2f} software:{snap.get('software_ms', 0.0):.2f} total:{snap['total_ms']:.2f} draws:{snap.get('draw_calls_total', 0)}",
+                          rx, ry - 16, arcade.color.LIGHT_GRAY, 10)
+                if snap.get("async_prep"):
+                    draw_text(f"Prep ms (worker) - compute:{snap['prep_ms']:.2f} wait:{snap['prep_wait_ms']:.2f} overlap:{snap['overlap_ms']:.2f}",
+                              rx, ry - 64, arcade.color.LIGHT_GRAY, 10)
             if getattr(game, "minimap", None) and hasattr(game.minimap, "get_perf_snapshot"):
                 ms = game.minimap.get_perf_snapshot().get("render_ms", 0.0)
-                arcade.draw_text(f"Minimap ms:{ms:.2f}", rx, ry - 32, arcade.color.LIGHT_GRAY, 10)
+                draw_text(f"Minimap ms:{ms:.2f}", rx, ry - 32, arcade.color.LIGHT_GRAY, 10)
+            text = TEXT_CACHE.last_stats
+            draw_text(f"Text ms:{text['ms']:.2f} draws:{text['draws']} layouts:{text['layouts']} cached:{text['texts']}",
+                      rx, ry - 48, arcade.color.LIGHT_GRAY, 10)
 
         self._last_game = game
         self.ensure_inventory_panel(game)
@@ -54,11 +79,11 @@ class HUDRenderer:
             avg_dt = (sum(dt_list) / len(dt_list)) if dt_list else 0.0
             avg_fps = (1.0 / avg_dt) if avg_dt > 0 else 0.0
             rays = game.renderer.num_rays if game.renderer else 0
-            arcade.draw_text(f"FPS: {avg_fps:.1f} | Rays: {rays}", 10, game.height - 60, arcade.color.YELLOW, 10)
+            draw_text(f"FPS: {avg_fps:.1f} | Rays: {rays}", 10, game.height - 60, arcade.color.YELLOW, 10)
 
         # Posición del jugador (solo debug)
         if self.debug and game.player:
-            arcade.draw_text(
+            draw_text(
                 f"Pos: ({game.player.x:.1f}, {game.player.y:.1f}) Angle: {game.player.angle:.2f} rad",
                 10, game.height - 80, arcade.color.WHITE, 12
             )
@@ -73,105 +98,216 @@ class HUDRenderer:
         elif game.time_remaining < 300:
             time_color = arcade.color.YELLOW
 
-        self._draw_earnings_progress_top(game, earnings, goal_earnings)
-        self._draw_time_countdown_bottom(game, time_str, time_color)
-
-        # Barras: stamina y reputación
-        if game.player:
-            self._draw_stamina_bar(game)
-            self._draw_reputation_bar(game)
+        # Barras, tiempo, velocímetro y campana de pedidos (capas cacheadas)
+        self._draw_layers(game, earnings, goal_earnings, time_str, time_color)
 
-        # Velocímetro + icono de clima
+        # Icono de clima
         if game.player:
-            self._draw_bike_speedometer(game)
             self._draw_weather_icon_right_of_speedometer(game)
 
         # Atajos
         _y = game.height - 350
         _h = 18
-        arcade.draw_text("ESC - Pausa", game.width - 100, game.height - 30, arcade.color.WHITE, 12, anchor_x="center")
-        arcade.draw_text(" I - Inventario", game.width - 60, _y - _h, arcade.color.WHITE, 12, anchor_x="center")
-        arcade.draw_text(" O - Pedidos", game.width - 60, _y - 2 * _h, arcade.color.WHITE, 12, anchor_x="center")
-        arcade.draw_text(" U - Devolverse", game.width - 60, _y - 3 * _h, arcade.color.WHITE, 12, anchor_x="center")
-
-        self._draw_pending_bell(game)
+        with text_batch("hud_shortcuts"):
+            draw_text("ESC - Pausa", game.width - 100, game.height - 30, arcade.color.WHITE, 12, anchor_x="center")
+            draw_text(" I - Inventario", game.width - 60, _y - _h, arcade.color.WHITE, 12, anchor_x="center")
+            draw_text(" O - Pedidos", game.width - 60, _y - 2 * _h, arcade.color.WHITE, 12, anchor_x="center")
+            draw_text(" U - Devolverse", game.width - 60, _y - 3 * _h, arcade.color.WHITE, 12, anchor_x="center")
+
+    # --------- Capas ---------
+    def _draw_layers(self, game, earnings: float, goal_earnings: float, time_str: str, time_color):
+        """
+        Capas del HUD: estática de fondo (paneles, dial, campana), dinámica
+        (rellenos, aguja, badge) y estática de frente (bordes y marcas). Las
+        estáticas se reconstruyen al cambiar el tamaño de ventana; la dinámica
+        solo cuando sus valores cambian a la precisión en que se muestran.
+        """
+        bell = self._bell_visible()
+        static_key = (game.width, game.height, bool(game.player), bell)
+        if static_key != self._static_key:
+            self._build_static(game, bell)
+            self._static_key = static_key
+
+        dyn = self._dynamic_values(game, earnings, goal_earnings, bell)
+        dyn_key = (static_key,) + tuple(v for k, v in sorted(dyn.items()) if not k.startswith("_"))
+        if dyn_key != self._dynamic_key:
+            self._build_dynamic(game, dyn)
+            self._dynamic_key = dyn_key
+
+        self._layer_under.draw()
+        self._layer_dynamic.draw()
+        self._layer_over.draw()
+        self._draw_layer_texts(game, earnings, goal_earnings, time_str, time_color, dyn)
+
+    def _build_static(self, game, bell: bool):
+        under, over = self._layer_under, self._layer_over
+        under.reset()
+        over.reset()
+
+        x1, x2, y1, y2 = self._earnings_geom(game)
+        under.rect(x1, x2, y1, y2, (0, 0, 0, 180))
+        over.rect_outline(x1, x2, y1, y2, arcade.color.WHITE, 2)
+
+        x1, x2, y1, y2 = self._time_geom(game)
+        under.rect(x1, x2, y1, y2, (0, 0, 0, 160))
+        over.rect_outline(x1, x2, y1, y2, arcade.color.WHITE, 2)
 
-    # --------- Private (helpers) ---------
-    def _draw_earnings_progress_top(self, game, earnings: float, goal_earnings: float):
+        if game.player:
+            for x1, x2, y1, y2 in (self._stamina_geom(game), self._reputation_geom(game)):
+                under.rect(x1, x2, y1, y2, arcade.color.BLACK)
+                over.rect_outline(x1, x2, y1, y2, arcade.color.WHITE, 2)
+
+            cx, cy, radius = self._speedo_geom(game)
+            under.circle(cx, cy, radius + 3, (40, 40, 40))
+            under.arc_outline(cx, cy, (radius + 3) * 2, (radius + 3) * 2, arcade.color.WHITE, 0, 360, 2, 48)
+            for angle in range(self.SPEEDO_START, self.SPEEDO_END, 3):
+                under.line(*self._speedo_tick(cx, cy, radius, angle, 6, 2), (80, 80, 80), 2)
+            for i in range(5):
+                angle = self.SPEEDO_START + (self.SPEEDO_END - self.SPEEDO_START) * i / 4.0
+                over.line(*self._speedo_tick(cx, cy, radius, angle, 4, 1), arcade.color.WHITE, 2)
+            over.circle(cx, cy, 3, arcade.color.WHITE)
+
+        if bell:
+            box_x, box_y, box_w, box_h = self._bell_geom(game)
+            under.rect(box_x, box_x + box_w, box_y, box_y + box_h, (161, 130, 98, 220))
+            under.rect_outline(box_x, box_x + box_w, box_y, box_y + box_h, arcade.color.WHITE, 2)
+            # Campana simple (gris/blanca): cuerpo y badajo
+            cx = box_x + box_w // 2
+            cy = box_y + box_h // 2
+            under.triangle(cx - 10, cy - 4, cx + 10, cy - 4, cx, cy + 10, arcade.color.LIGHT_GRAY)
+            under.circle(cx, cy - 8, 3, arcade.color.SILVER)
+
+    def _dynamic_values(self, game, earnings: float, goal_earnings: float, bell: bool) -> dict:
+        """Valores de la capa dinámica ya redondeados a lo que se ve en pantalla."""
+        x1, x2, _, _ = self._earnings_geom(game)
+        progress = max(0.0, min(1.0, (earnings / goal_earnings) if goal_earnings > 0 else 0.0))
+        if progress < 0.33:
+            earn_color = arcade.color.DARK_RED
+        elif progress < 0.66:
+            earn_color = arcade.color.YELLOW
+        else:
+            earn_color = arcade.color.GREEN
+        values = {"earn_w": int((x2 - x1 - 2) * progress), "earn_color": earn_color,
+                  "pending": bell and bool(getattr(game, "pending_orders", None))}
+        player = game.player
+        if not player:
+            return values
+
+        max_stamina = getattr(player, 'max_stamina', 100)
+        values["stamina_w"] = int(200 * max(0.0, min(1.0, player.stamina / max_stamina)))
+        rep_percent = max(0.0, min(1.0, player.reputation / 100))
+        values["rep_w"] = int(200 * rep_percent)
+        values["rep_color"] = arcade.color.YELLOW if rep_percent < 0.7 else arcade.color.PINK
+
+        # Velocímetro: el temblor de la aguja se mantiene, pero en grados enteros
+        speed = game.displayed_speed
+        max_speed = player.base_speed * 1.2
+        jitter_units = 1.5 / 10.0
+        if speed > 0.05:
+            variation_intensity = min(1.0, speed / max(0.001, player.base_speed))
+            speed = max(0.0, speed + random.uniform(-jitter_units, jitter_units) * variation_intensity)
+        pct = min(1.0, speed / max_speed)
+        if pct < 0.3:
+            values["speed_color"] = arcade.color.GREEN
+        elif pct < 0.7:
+            values["speed_color"] = arcade.color.YELLOW
+        else:
+            values["speed_color"] = arcade.color.RED
+        values["speed_range"] = int((self.SPEEDO_END - self.SPEEDO_START) * pct)
+        values["needle"] = int(round(self.SPEEDO_START + (self.SPEEDO_END - self.SPEEDO_START) * pct))
+        values["state_color"] = self.STATE_COLORS.get(player.state, arcade.color.WHITE)
+        values["_speed_kmh"] = speed * 10.0
+        return values
+
+    def _build_dynamic(self, game, dyn: dict):
+        g = self._layer_dynamic
+        g.reset()
+        x1, _, y1, y2 = self._earnings_geom(game)
+        if dyn["earn_w"] > 0:
+            g.rect(x1 + 1, x1 + 1 + dyn["earn_w"], y1 + 1, y2 - 1, dyn["earn_color"])
+        if game.player:
+            x1, _, y1, y2 = self._stamina_geom(game)
+            if dyn["stamina_w"] > 0:
+                g.rect(x1, x1 + dyn["stamina_w"], y1, y2, arcade.color.GREEN)
+            x1, _, y1, y2 = self._reputation_geom(game)
+            if dyn["rep_w"] > 0:
+                g.rect(x1, x1 + dyn["rep_w"], y1, y2, dyn["rep_color"])
+
+            cx, cy, radius = self._speedo_geom(game)
+            for angle in range(self.SPEEDO_START, self.SPEEDO_START + dyn["speed_range"], 3):
+                g.line(*self._speedo_tick(cx, cy, radius, angle, 6, 2), dyn["speed_color"], 3)
+            rad = math.radians(dyn["needle"])
+            g.line(cx, cy, cx + math.cos(rad) * (radius - 8), cy + math.sin(rad) * (radius - 8),
+                   arcade.color.WHITE, 2)
+            g.circle(cx, cy + 18, 4, dyn["state_color"])
+        if dyn["pending"]:
+            bx, by = self._bell_badge(game)
+            g.circle(bx, by, 10, arcade.color.RED)
+
+    def _draw_layer_texts(self, game, earnings: float, goal_earnings: float, time_str: str, time_color, dyn: dict):
+        x1, x2, y1, _ = self._earnings_geom(game)
+        pct = max(0.0, min(1.0, (earnings / goal_earnings) if goal_earnings > 0 else 0.0)) * 100.0
+        draw_text(f"${earnings:.0f} / ${goal_earnings:.0f} ({pct:.1f}%)", x1 + (x2 - x1) // 2, y1 + 2,
+                  arcade.color.WHITE, 12, anchor_x="center")
+        x1, x2, y1, _ = self._time_geom(game)
+        draw_text(f"Remaining: {time_str}", (x1 + x2) // 2, y1 + 5, time_color, 14, anchor_x="center")
+
+        player = game.player
+        if player:
+            max_stamina = getattr(player, 'max_stamina', 100)
+            _, x2, y1, y2 = self._stamina_geom(game)
+            draw_text(f"{player.stamina:.0f}/{max_stamina:.0f}", x2 + 10, y1 + (y2 - y1) // 2 - 6,
+                      arcade.color.WHITE, 12)
+            _, x2, y1, y2 = self._reputation_geom(game)
+            draw_text(f"{player.reputation:.0f}/100", x2 + 10, y1 + (y2 - y1) // 2 - 6, arcade.color.WHITE, 12)
+            cx, cy, _ = self._speedo_geom(game)
+            draw_text(f"{dyn['_speed_kmh']:.0f}", cx, cy - 10, arcade.color.WHITE, 14, anchor_x="center")
+            draw_text("km/h", cx, cy - 22, arcade.color.LIGHT_GRAY, 8, anchor_x="center")
+
+        if dyn["pending"]:
+            bx, by = self._bell_badge(game)
+            draw_text(str(len(game.pending_orders)), bx, by - 6, arcade.color.WHITE, 12, anchor_x="center")
+
+    # --------- Geometría (posiciones originales) ---------
+    def _earnings_geom(self, game):
         bar_width = 260
-        bar_height = 18
-        center_x = game.width // 2
-        bar_x1 = center_x - bar_width // 2 - 10
-        bar_x2 = bar_x1 + bar_width
+        bar_x1 = game.width // 2 - bar_width // 2 - 10
         bar_y1 = game.height - 44
-        bar_y2 = bar_y1 + bar_height
+        return bar_x1, bar_x1 + bar_width, bar_y1, bar_y1 + 18
 
-        arcade.draw_lrbt_rectangle_filled(bar_x1, bar_x2, bar_y1, bar_y2, (0, 0, 0, 180))
-        arcade.draw_lrbt_rectangle_outline(bar_x1, bar_x2, bar_y1, bar_y2, arcade.color.WHITE, 2)
-
-        progress = max(0.0, min(1.0, (earnings / goal_earnings) if goal_earnings > 0 else 0.0))
-        fill_w = int((bar_x2 - bar_x1 - 2) * progress)
-        if fill_w > 0:
-            if progress < 0.33:
-                fill_color = arcade.color.DARK_RED
-            elif progress < 0.66:
-                fill_color = arcade.color.YELLOW
-            else:
-                fill_color = arcade.color.GREEN
-            arcade.draw_lrbt_rectangle_filled(bar_x1 + 1, bar_x1 + 1 + fill_w, bar_y1 + 1, bar_y2 - 1, fill_color)
-
-        pct = progress * 100.0
-        label = f"${earnings:.0f} / ${goal_earnings:.0f} ({pct:.1f}%)"
-        label_x = bar_x1 + (bar_x2 - bar_x1) // 2
-        label_y = bar_y1 + 2
-        arcade.draw_text(label, label_x, label_y, arcade.color.WHITE, 12, anchor_x="center")
-
-    def _draw_time_countdown_bottom(self, game, time_str: str, time_color: tuple):
-        pill_width = 220
-        pill_height = 26
+    def _time_geom(self, game):
         cx = game.width // 2
-        y_bottom = 10
-        x1 = cx - pill_width // 2
-        x2 = cx + pill_width // 2
-        y1 = y_bottom
-        y2 = y_bottom + pill_height
-
-        arcade.draw_lrbt_rectangle_filled(x1, x2, y1, y2, (0, 0, 0, 160))
-        arcade.draw_lrbt_rectangle_outline(x1, x2, y1, y2, arcade.color.WHITE, 2)
-        arcade.draw_text(f"Remaining: {time_str}", cx, y1 + 5, time_color, 14, anchor_x="center")
-
-    def _draw_stamina_bar(self, game):
-        bar_width = 200
-        bar_height = 20
-        bar_x = game.width - bar_width - 80
-        bar_y = 30
-        stamina = game.player.stamina
-        max_stamina = getattr(game.player, 'max_stamina', 100)
-        stamina_percent = max(0.0, min(1.0, stamina / max_stamina))
-        arcade.draw_lrbt_rectangle_filled(bar_x, bar_x + bar_width, bar_y, bar_y + bar_height, arcade.color.BLACK)
-        if stamina_percent > 0:
-            green_width = int(bar_width * stamina_percent)
-            arcade.draw_lrbt_rectangle_filled(bar_x, bar_x + green_width, bar_y, bar_y + bar_height, arcade.color.GREEN)
-        arcade.draw_lrbt_rectangle_outline(bar_x, bar_x + bar_width, bar_y, bar_y + bar_height, arcade.color.WHITE, 2)
-        stamina_text = f"{stamina:.0f}/{max_stamina:.0f}"
-        arcade.draw_text(stamina_text, bar_x + bar_width + 10, bar_y + (bar_height // 2) - 6, arcade.color.WHITE, 12)
-
-    def _draw_reputation_bar(self, game):
-        rep_bar_width = 200
-        rep_bar_height = 20
-        rep_bar_x = game.width - rep_bar_width - 80
-        rep_bar_y = 60
-        reputation = game.player.reputation
-        max_reputation = 100
-        rep_percent = max(0.0, min(1.0, reputation / max_reputation))
-        arcade.draw_lrbt_rectangle_filled(rep_bar_x, rep_bar_x + rep_bar_width, rep_bar_y, rep_bar_y + rep_bar_height, arcade.color.BLACK)
-        if rep_percent > 0:
-            color = arcade.color.YELLOW if rep_percent < 0.7 else arcade.color.PINK
-            fill_width = int(rep_bar_width * rep_percent)
-            arcade.draw_lrbt_rectangle_filled(rep_bar_x, rep_bar_x + fill_width, rep_bar_y, rep_bar_y + rep_bar_height, color)
-        arcade.draw_lrbt_rectangle_outline(rep_bar_x, rep_bar_x + rep_bar_width, rep_bar_y, rep_bar_y + rep_bar_height, arcade.color.WHITE, 2)
-        rep_text = f"{reputation:.0f}/100"
-        arcade.draw_text(rep_text, rep_bar_x + rep_bar_width + 10, rep_bar_y + (rep_bar_height // 2) - 6, arcade.color.WHITE, 12)
+        return cx - 110, cx + 110, 10, 36
+
+    def _stamina_geom(self, game):
+        bar_x = game.width - 200 - 80
+        return bar_x, bar_x + 200, 30, 50
+
+    def _reputation_geom(self, game):
+        bar_x = game.width - 200 - 80
+        return bar_x, bar_x + 200, 60, 80
+
+    def _speedo_geom(self, game):
+        return game.width - 200 - 80 + 235, 150, 35
+
+    @staticmethod
+    def _speedo_tick(cx, cy, radius, angle, inner, outer):
+        rad = math.radians(angle)
+        c, s = math.cos(rad), math.sin(rad)
+        return (cx + c * (radius - inner), cy + s * (radius - inner),
+                cx + c * (radius - outer), cy + s * (radius - outer))
+
+    def _bell_geom(self, game):
+        box_w, box_h = 48, 48
+        return game.width - box_w - 70, game.height - box_h - 50, box_w, box_h
+
+    def _bell_badge(self, game):
+        box_x, box_y, box_w, box_h = self._bell_geom(game)
+        return box_x + box_w - 10 + 2, box_y + box_h - 10 + 2
+
+    def _bell_visible(self) -> bool:
+        # Solo si el panel de inventario está cerrado
+        return not (self._inv_panel and self._inv_panel.is_open)
 
     def _speedo_anchor(self, game):
         right_margin = 80
@@ -181,85 +317,6 @@ class HUDRenderer:
         center_y = bottom_margin + 90
         return center_x, center_y, radius
 
-    def _draw_bike_speedometer(self, game):
-        speed = game.displayed_speed
-        max_speed = game.player.base_speed * 1.2
-        speed_percent = min(1.0, speed / max_speed)
-
-        bar_x = game.width - 200 - 80
-        center_x = bar_x + 235
-        center_y = 150
-        radius = 35
-
-        max_jitter_kmh = 1.5
-        jitter_units = max_jitter_kmh / 10.0
-        if speed > 0.05:
-            variation_intensity = min(1.0, speed / max(0.001, game.player.base_speed))
-            speed_variation = random.uniform(-jitter_units, jitter_units) * variation_intensity
-            varied_speed = max(0.0, speed + speed_variation)
-            varied_speed_percent = min(1.0, varied_speed / max_speed)
-        else:
-            varied_speed = speed
-            varied_speed_percent = speed_percent
-
-        arcade.draw_circle_filled(center_x, center_y, radius + 3, (40, 40, 40))
-        arcade.draw_circle_outline(center_x, center_y, radius + 3, arcade.color.WHITE, 2)
-
-        start_angle = 135
-        end_angle = 405
-
-        for angle in range(start_angle, end_angle, 3):
-            rad = math.radians(angle)
-            x1 = center_x + math.cos(rad) * (radius - 6)
-            y1 = center_y + math.sin(rad) * (radius - 6)
-            x2 = center_x + math.cos(rad) * (radius - 2)
-            y2 = center_y + math.sin(rad) * (radius - 2)
-            arcade.draw_line(x1, y1, x2, y2, (80, 80, 80), 2)
-
-        speed_angle_range = int((end_angle - start_angle) * varied_speed_percent)
-        for angle in range(start_angle, start_angle + speed_angle_range, 3):
-            rad = math.radians(angle)
-            x1 = center_x + math.cos(rad) * (radius - 6)
-            y1 = center_y + math.sin(rad) * (radius - 6)
-            x2 = center_x + math.cos(rad) * (radius - 2)
-            y2 = center_y + math.sin(rad) * (radius - 2)
-            if varied_speed_percent < 0.3:
-                color = arcade.color.GREEN
-            elif varied_speed_percent < 0.7:
-                color = arcade.color.YELLOW
-            else:
-                color = arcade.color.RED
-            arcade.draw_line(x1, y1, x2, y2, color, 3)
-
-        needle_angle = start_angle + (end_angle - start_angle) * varied_speed_percent
-        needle_rad = math.radians(needle_angle)
-        needle_x = center_x + math.cos(needle_rad) * (radius - 8)
-        needle_y = center_y + math.sin(needle_rad) * (radius - 8)
-        arcade.draw_line(center_x, center_y, needle_x, needle_y, arcade.color.WHITE, 2)
-        arcade.draw_circle_filled(center_x, center_y, 3, arcade.color.WHITE)
-
-        for i in range(5):
-            mark_percent = i / 4.0
-            mark_angle = start_angle + (end_angle - start_angle) * mark_percent
-            radm = math.radians(mark_angle)
-            x1 = center_x + math.cos(radm) * (radius - 4)
-            y1 = center_y + math.sin(radm) * (radius - 4)
-            x2 = center_x + math.cos(radm) * (radius - 1)
-            y2 = center_y + math.sin(radm) * (radius - 1)
-            arcade.draw_line(x1, y1, x2, y2, arcade.color.WHITE, 2)
-
-        speed_kmh = varied_speed * 10.0
-        arcade.draw_text(f"{speed_kmh:.0f}", center_x, center_y - 10, arcade.color.WHITE, 14, anchor_x="center")
-        arcade.draw_text("km/h", center_x, center_y - 22, arcade.color.LIGHT_GRAY, 8, anchor_x="center")
-
-        state_colors = {
-            "normal": arcade.color.GREEN,
-            "tired": arcade.color.YELLOW,
-            "exhausted": arcade.color.RED
-        }
-        state_color = state_colors.get(game.player.state, arcade.color.WHITE)
-        arcade.draw_circle_filled(center_x, center_y + 18, 4, state_color)
-
     def _draw_weather_icon_right_of_speedometer(self, game):
         if not game.weather_system:
             return
@@ -273,20 +330,20 @@ class HUDRenderer:
         y = max(10, min(game.height - chip_h - 10, y))
         self._draw_weather_icon_at(game, x, y, chip_w, chip_h)
 
-    # ---- Weather icon helpers ----
-    def _draw_weather_icon_chip_bg(self, x: int, y: int, w: int, h: int):
-        arcade.draw_lrbt_rectangle_filled(x, x + w, y, y + h, (0, 0, 0, 140))
-        arcade.draw_lrbt_rectangle_outline(x, x + w, y, y + h, arcade.color.WHITE, 2)
+    # ---- Weather icon helpers (dibujan en la capa `g`) ----
+    def _draw_weather_icon_chip_bg(self, g, x: int, y: int, w: int, h: int):
+        g.rect(x, x + w, y, y + h, (0, 0, 0, 140))
+        g.rect_outline(x, x + w, y, y + h, arcade.color.WHITE, 2)
 
-    def _draw_weather_cloud(self, cx: int, cy: int, scale: float = 1.0, color=(255, 255, 255)):
+    def _draw_weather_cloud(self, g, cx: int, cy: int, scale: float = 1.0, color=(255, 255, 255)):
         w = int(40 * scale)
         h = int(20 * scale)
-        arcade.draw_circle_filled(cx - w // 3, cy, h // 2 + 6, color)
-        arcade.draw_circle_filled(cx, cy + 4, h // 2 + 8, color)
-        arcade.draw_circle_filled(cx + w // 3, cy, h // 2 + 6, color)
-        arcade.draw_ellipse_filled(cx, cy - 4, w, h, color)
+        g.circle(cx - w // 3, cy, h // 2 + 6, color)
+        g.circle(cx, cy + 4, h // 2 + 8, color)
+        g.circle(cx + w // 3, cy, h // 2 + 6, color)
+        g.ellipse(cx, cy - 4, w, h, color)
 
-    def _draw_weather_rain(self, cx: int, cy: int, drops: int = 6, spread: int = 34, length: int = 10,
+    def _draw_weather_rain(self, g, cx: int, cy: int, drops: int = 6, spread: int = 34, length: int = 10,
                            color=(120, 180, 255)):
         left = cx - spread // 2
         step = max(1, spread // max(1, drops - 1))
@@ -294,19 +351,19 @@ class HUDRenderer:
             x = left + i * step
             y1r = cy - 6
             y2r = y1r - int(length * (0.8 + 0.4 * random.random()))
-            arcade.draw_line(x, y1r, x, y2r, color, 2)
+            g.line(x, y1r, x, y2r, color, 2)
 
-    def _draw_weather_lightning(self, cx: int, cy: int, color=(255, 255, 100)):
+    def _draw_weather_lightning(self, g, cx: int, cy: int, color=(255, 255, 100)):
         p1 = (cx - 6, cy + 6)
         p2 = (cx + 0, cy + 2)
         p3 = (cx - 3, cy - 2)
         p4 = (cx + 5, cy - 8)
-        arcade.draw_line(*p1, *p2, color, 3)
-        arcade.draw_line(*p2, *p3, color, 3)
-        arcade.draw_line(*p3, *p4, color, 3)
+        g.line(*p1, *p2, color, 3)
+        g.line(*p2, *p3, color, 3)
+        g.line(*p3, *p4, color, 3)
 
-    def _draw_weather_sun(self, cx: int, cy: int, radius: int = 10, color=(255, 220, 100)):
-        arcade.draw_circle_filled(cx, cy, radius, color)
+    def _draw_weather_sun(self, g, cx: int, cy: int, radius: int = 10, color=(255, 220, 100)):
+        g.circle(cx, cy, radius, color)
         rays = 8
         for i in range(rays):
             ang = i * (360 / rays)
@@ -315,9 +372,9 @@ class HUDRenderer:
             y1r = cy + math.sin(rad) * (radius + 2)
             x2r = cx + math.cos(rad) * (radius + 8)
             y2r = cy + math.sin(rad) * (radius + 8)
-            arcade.draw_line(x1r, y1r, x2r, y2r, color, 2)
+            g.line(x1r, y1r, x2r, y2r, color, 2)
 
-    def _draw_weather_fog(self, cx: int, cy: int, bands: int = 3,
+    def _draw_weather_fog(self, g, cx: int, cy: int, bands: int = 3,
                           band_width: int = 52, band_height: int = 6,
                           color=(220, 220, 220, 160)):
         if bands <= 0:
@@ -325,68 +382,77 @@ class HUDRenderer:
         top = cy + 10
         for i in range(bands):
             yb = top - i * 10
-            arcade.draw_lrbt_rectangle_filled(
-                cx - band_width // 2, cx + band_width // 2, yb - band_height // 2, yb + band_height // 2, color
-            )
+            g.rect(cx - band_width // 2, cx + band_width // 2, yb - band_height // 2, yb + band_height // 2, color)
 
-    def _draw_weather_wind(self, cx: int, cy: int, swirls: int = 2, color=(200, 220, 255)):
+    def _draw_weather_wind(self, g, cx: int, cy: int, swirls: int = 2, color=(200, 220, 255)):
         for i in range(swirls):
             yb = cy + (i * 8) - 6
-            arcade.draw_arc_outline(cx, yb, 40, 16, color, 10, 170, 2)
-            arcade.draw_arc_outline(cx + 8, yb - 4, 28, 12, color, 10, 170, 2)
+            g.arc_outline(cx, yb, 40, 16, color, 10, 170, 2)
+            g.arc_outline(cx + 8, yb - 4, 28, 12, color, 10, 170, 2)
 
-    def _draw_weather_snowflake(self, cx: int, cy: int, size: int = 10, color=(220, 240, 255)):
+    def _draw_weather_snowflake(self, g, cx: int, cy: int, size: int = 10, color=(220, 240, 255)):
         for ang in (0, 60, 120):
             rad = math.radians(ang)
             dx = math.cos(rad) * size
             dy = math.sin(rad) * size
-            arcade.draw_line(cx - dx, cy - dy, cx + dx, cy + dy, color, 2)
+            g.line(cx - dx, cy - dy, cx + dx, cy + dy, color, 2)
 
     def _draw_weather_icon_at(self, game, x: int, y: int, width: int = 64, height: int = 48):
+        """Icono del clima en su propia capa; se reconstruye solo si cambia el clima (o la lluvia, a 4 Hz)."""
         info = game.weather_system.get_weather_info()
         cond = str(info.get("condition", "clear")).lower()
         intensity = float(info.get("intensity", 0.2))
-        cloud_color = tuple(info.get("cloud_color", (255, 255, 255)))
-        sky_color = tuple(info.get("sky_color", (135, 206, 235)))
-
-        self._draw_weather_icon_chip_bg(x, y, width, height)
+        cloud_color = tuple(int(c) for c in info.get("cloud_color", (255, 255, 255)))
+        sky_color = tuple(int(c) for c in info.get("sky_color", (135, 206, 235)))
+        t = max(0.1, min(1.0, intensity))
+        tick = int(time.perf_counter() * 4) if cond in ("rain_light", "rain", "storm") else 0
+        key = (x, y, width, height, cond, round(t, 2), cloud_color, sky_color, tick)
+        g = self._layer_weather
+        if key != self._weather_key:
+            g.reset()
+            self._build_weather_icon(g, cond, t, cloud_color, sky_color, x, y, width, height)
+            self._weather_key = key
+        g.draw()
+
+    def _build_weather_icon(self, g, cond: str, t: float, cloud_color, sky_color,
+                            x: int, y: int, width: int, height: int):
+        self._draw_weather_icon_chip_bg(g, x, y, width, height)
 
         icx = x + width // 2
         icy = y + height // 2
 
-        t = max(0.1, min(1.0, intensity))
         rain_drops = 4 + int(6 * t)
         cloud_scale = 0.9 + 0.4 * t
 
         if cond in ("clear",):
-            arcade.draw_circle_filled(icx, icy, 18, (sky_color[0], sky_color[1], sky_color[2], 60))
-            self._draw_weather_sun(icx, icy, radius=10 + int(4 * t), color=(255, 220, 100))
+            g.circle(icx, icy, 18, (sky_color[0], sky_color[1], sky_color[2], 60))
+            self._draw_weather_sun(g, icx, icy, radius=10 + int(4 * t), color=(255, 220, 100))
         elif cond in ("clouds",):
-            self._draw_weather_cloud(icx, icy, scale=cloud_scale, color=cloud_color)
+            self._draw_weather_cloud(g, icx, icy, scale=cloud_scale, color=cloud_color)
         elif cond in ("rain_light",):
-            self._draw_weather_cloud(icx, icy, scale=0.95, color=cloud_color)
-            self._draw_weather_rain(icx, icy - 6, drops=rain_drops // 2, length=8 + int(6 * t))
+            self._draw_weather_cloud(g, icx, icy, scale=0.95, color=cloud_color)
+            self._draw_weather_rain(g, icx, icy - 6, drops=rain_drops // 2, length=8 + int(6 * t))
         elif cond in ("rain",):
-            self._draw_weather_cloud(icx, icy, scale=1.05, color=cloud_color)
-            self._draw_weather_rain(icx, icy - 6, drops=rain_drops, length=10 + int(10 * t))
+            self._draw_weather_cloud(g, icx, icy, scale=1.05, color=cloud_color)
+            self._draw_weather_rain(g, icx, icy - 6, drops=rain_drops, length=10 + int(10 * t))
         elif cond in ("storm",):
-            self._draw_weather_cloud(icx, icy + 2, scale=1.05, color=(80, 80, 80))
-            self._draw_weather_rain(icx, icy - 4, drops=rain_drops, length=12 + int(10 * t), color=(140, 180, 255))
-            self._draw_weather_lightning(icx, icy - 2)
+            self._draw_weather_cloud(g, icx, icy + 2, scale=1.05, color=(80, 80, 80))
+            self._draw_weather_rain(g, icx, icy - 4, drops=rain_drops, length=12 + int(10 * t), color=(140, 180, 255))
+            self._draw_weather_lightning(g, icx, icy - 2)
         elif cond in ("fog",):
-            self._draw_weather_fog(icx, icy, bands=3 + (1 if t > 0.6 else 0))
+            self._draw_weather_fog(g, icx, icy, bands=3 + (1 if t > 0.6 else 0))
         elif cond in ("wind",):
-            self._draw_weather_cloud(icx - 6, icy + 2, scale=0.8, color=cloud_color)
-            self._draw_weather_wind(icx + 6, icy - 2)
+            self._draw_weather_cloud(g, icx - 6, icy + 2, scale=0.8, color=cloud_color)
+            self._draw_weather_wind(g, icx + 6, icy - 2)
         elif cond in ("heat",):
-            self._draw_weather_sun(icx, icy, radius=11 + int(3 * t), color=(255, 210, 90))
-            arcade.draw_arc_outline(icx, icy + 10, 36, 10, (255, 220, 150), 0, 180, 2)
+            self._draw_weather_sun(g, icx, icy, radius=11 + int(3 * t), color=(255, 210, 90))
+            g.arc_outline(icx, icy + 10, 36, 10, (255, 220, 150), 0, 180, 2)
         elif cond in ("cold",):
-            self._draw_weather_cloud(icx, icy + 6, scale=0.9, color=cloud_color)
-            self._draw_weather_snowflake(icx, icy - 8, size=8 + int(4 * t))
+            self._draw_weather_cloud(g, icx, icy + 6, scale=0.9, color=cloud_color)
+            self._draw_weather_snowflake(g, icx, icy - 8, size=8 + int(4 * t))
         else:
-            self._draw_weather_cloud(icx, icy, scale=0.9, color=cloud_color)
-            arcade.draw_circle_filled(icx + 18, icy - 12, 3, arcade.color.WHITE)
+            self._draw_weather_cloud(g, icx, icy, scale=0.9, color=cloud_color)
+            g.circle(icx + 18, icy - 12, 3, arcade.color.WHITE)
 
     def ensure_inventory_panel(self, game):
         """
@@ -421,31 +487,3 @@ class HUDRenderer:
             self.ensure_inventory_panel(game)
         if self._inv_panel:
             self._inv_panel.update(delta_time)
-
-    def _draw_pending_bell(self, game):
-        # Mostrar solo si el panel de inventario está cerrado
-        inv_panel_open = getattr(self, "_inv_panel", None) and self._inv_panel.is_open
-        if inv_panel_open:
-            return
-        pending = len(getattr(game, "pending_orders", []) or [])
-        # Posición cerca del panel de inventario (margen superior derecho)
-        box_w, box_h = 48, 48
-        box_x = game.width - box_w - 70
-        box_y = game.height - box_h - 50
-        # Fondo café
-        arcade.draw_lrbt_rectangle_filled(box_x, box_x + box_w, box_y, box_y + box_h, (161, 130, 98, 220))
-        arcade.draw_lrbt_rectangle_outline(box_x, box_x + box_w, box_y, box_y + box_h, arcade.color.WHITE, 2)
-        # Campana simple (gris/blanca)
-        cx = box_x + box_w // 2
-        cy = box_y + box_h // 2
-        # cuerpo
-        arcade.draw_triangle_filled(cx - 10, cy - 4, cx + 10, cy - 4, cx, cy + 10, arcade.color.LIGHT_GRAY)
-        # badajo
-        arcade.draw_circle_filled(cx, cy - 8, 3, arcade.color.SILVER)
-        # Badge rojo con número
-        if pending > 0:
-            badge_r = 10
-            bx = box_x + box_w - badge_r + 2
-            by = box_y + box_h - badge_r + 2
-            arcade.draw_circle_filled(bx, by, badge_r, arcade.color.RED)
-            arcade.draw_text(str(pending), bx, by - 6, arcade.color.WHITE, 12, anchor_x="center")
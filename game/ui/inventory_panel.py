@@ -1,5 +1,6 @@
 import arcade
 from game.core.inventory import Inventory
+from game.ui.text_cache import draw_text, text_batch
 
 
 class InventoryPanel:
@@ -82,7 +83,7 @@ class InventoryPanel:
             2
         )
 
-        arcade.draw_text(
+        draw_text(
             "Inventario",
             current_x + width // 2 + 5,
             current_y + height - 20,
@@ -93,7 +94,7 @@ class InventoryPanel:
 
         # Muestra el peso total efectivo (sólo picked_up)
         weight_text = f"Peso: {self.inventory.current_weight:.1f}/{self.inventory.max_weight:.1f} kg"
-        arcade.draw_text(
+        draw_text(
             weight_text,
             current_x + width - 130,
             current_y + height - 20,
@@ -102,7 +103,7 @@ class InventoryPanel:
         )
 
         if not self.inventory.orders:
-            arcade.draw_text(
+            draw_text(
                 "No hay pedidos",
                 current_x + width // 2 + 10,
                 current_y + height - 50,
@@ -112,11 +113,12 @@ class InventoryPanel:
             return
 
         # Encabezados de columnas con nuevos offsets
-        arcade.draw_text("ID", current_x + 240, current_y + height - 50, (255, 255, 0, alpha), 10)
-        arcade.draw_text("Prioridad", current_x + 300, current_y + height - 50, (255, 255, 0, alpha), 10)
-        arcade.draw_text("Pago", current_x + 340, current_y + height - 50, (255, 255, 0, alpha), 10)
-        arcade.draw_text("Peso", current_x + 380, current_y + height - 50, (255, 255, 0, alpha), 10)
-        arcade.draw_text("Estado", current_x + 430, current_y + height - 50, (255, 255, 0, alpha), 10)
+        with text_batch("inventory_headers"):
+            draw_text("ID", current_x + 240, current_y + height - 50, (255, 255, 0, alpha), 10)
+            draw_text("Prioridad", current_x + 300, current_y + height - 50, (255, 255, 0, alpha), 10)
+            draw_text("Pago", current_x + 340, current_y + height - 50, (255, 255, 0, alpha), 10)
+            draw_text("Peso", current_x + 380, current_y + height - 50, (255, 255, 0, alpha), 10)
+            draw_text("Estado", current_x + 430, current_y + height - 50, (255, 255, 0, alpha), 10)
 
         start_y = current_y + height - 70
         line_height = 20
@@ -124,18 +126,18 @@ class InventoryPanel:
 
         for i, order in enumerate(self.inventory.orders[:max_display]):
             y_pos = start_y - (i * line_height)
-            arcade.draw_text(order.id[:8], current_x + 240, y_pos, (255, 255, 255, alpha), 10)
+            draw_text(order.id[:8], current_x + 240, y_pos, (255, 255, 255, alpha), 10)
             priority_color = (255, 200, 0, alpha) if order.priority > 0 else (255, 255, 255, alpha)
-            arcade.draw_text(str(order.priority), current_x + 300, y_pos, priority_color, 10)
-            arcade.draw_text(f"${order.payout:.0f}", current_x + 340, y_pos, (255, 255, 255, alpha), 10)
+            draw_text(str(order.priority), current_x + 300, y_pos, priority_color, 10)
+            draw_text(f"${order.payout:.0f}", current_x + 340, y_pos, (255, 255, 255, alpha), 10)
             weight_str = f"{order.weight:.1f} kg" if getattr(order, "status", "") == "picked_up" else ""
-            arcade.draw_text(weight_str, current_x + 380, y_pos, (255, 255, 255, alpha), 10)
+            draw_text(weight_str, current_x + 380, y_pos, (255, 255, 255, alpha), 10)
 
             status_color = (0, 255, 0, alpha) if order.status == "in_progress" else (255, 255, 0, alpha)
-            arcade.draw_text(order.status, current_x + 430, y_pos, status_color, 10)
+            draw_text(order.status, current_x + 430, y_pos, status_color, 10)
 
         if len(self.inventory.orders) > max_display:
-            arcade.draw_text(
+            draw_text(
                 f"... y {len(self.inventory.orders) - max_display} más",
                 current_x + 20,
                 current_y + 20,
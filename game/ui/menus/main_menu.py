@@ -1,6 +1,7 @@
 import arcade
 from pathlib import Path
 from game.core.gamestate import GameState
+from game.ui.text_cache import draw_text
 
 class MainMenu:
     def __init__(self, game_instance):
@@ -73,7 +74,7 @@ class MainMenu:
         if self.show_info:
             w, h = self.game.width, self.game.height
             arcade.draw_lrbt_rectangle_filled(0, w, 0, h, (0, 0, 0, 200))
-            arcade.draw_text("Información", w // 2, h - 80, (255, 220, 180), 28, anchor_x="center", bold=True)
+            draw_text("Información", w // 2, h - 80, (255, 220, 180), 28, anchor_x="center", bold=True)
             lines = [
                 "Controles:",
                 "  WASD/Flechas: Mover | ESC: Pausa/Menú | F5: Guardado rápido",
@@ -88,7 +89,7 @@ class MainMenu:
             ]
             y = h - 140
             for s in lines:
-                arcade.draw_text(s, w // 2, y, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
+                draw_text(s, w // 2, y, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
                 y -= 28
             return  # no dibujar el resto debajo del overlay
 
@@ -114,12 +115,12 @@ class MainMenu:
 
         # Título y subtítulo
         title_y = panel_y + panel_height - 80
-        arcade.draw_text("COURIER QUEST", width // 2 + 3, title_y - 3, (0, 0, 0, 180), 56, anchor_x="center", font_name="Kenney Future")
-        arcade.draw_text("COURIER QUEST", width // 2, title_y, (255, 220, 100), 56, anchor_x="center", font_name="Kenney Future", bold=True)
+        draw_text("COURIER QUEST", width // 2 + 3, title_y - 3, (0, 0, 0, 180), 56, anchor_x="center", font_name="Kenney Future")
+        draw_text("COURIER QUEST", width // 2, title_y, (255, 220, 100), 56, anchor_x="center", font_name="Kenney Future", bold=True)
 
         subtitle_y = title_y - 50
-        arcade.draw_text("Entrega. Explora. Sobrevive.", width // 2 + 2, subtitle_y - 2, (0, 0, 0, 180), 20, anchor_x="center")
-        arcade.draw_text("Entrega. Explora. Sobrevive.", width // 2, subtitle_y, (200, 220, 255), 20, anchor_x="center", bold=True)
+        draw_text("Entrega. Explora. Sobrevive.", width // 2 + 2, subtitle_y - 2, (0, 0, 0, 180), 20, anchor_x="center")
+        draw_text("Entrega. Explora. Sobrevive.", width // 2, subtitle_y, (200, 220, 255), 20, anchor_x="center", bold=True)
 
         # Opciones
         menu_start_y = panel_y + panel_height // 2 + 20
@@ -130,18 +131,18 @@ class MainMenu:
             is_disabled = (i in self.disabled_options)
             if is_disabled:
                 text = f"  {option}"
-                arcade.draw_text(text, width // 2 + 2, y_pos - 2, (0, 0, 0, 100), 24, anchor_x="center")
-                arcade.draw_text(text, width // 2, y_pos, (80, 80, 80), 24, anchor_x="center")
+                draw_text(text, width // 2 + 2, y_pos - 2, (0, 0, 0, 100), 24, anchor_x="center")
+                draw_text(text, width // 2, y_pos, (80, 80, 80), 24, anchor_x="center")
             elif is_selected:
                 text = f"> {option} <"
                 text_width = len(text) * 15
                 arcade.draw_lrbt_rectangle_filled(width // 2 - text_width // 2 - 10, width // 2 + text_width // 2 + 10, y_pos - 5, y_pos + 25, (255, 255, 100, 50))
-                arcade.draw_text(text, width // 2 + 2, y_pos - 2, (0, 0, 0, 200), 26, anchor_x="center", bold=True)
-                arcade.draw_text(text, width // 2, y_pos, (255, 255, 100), 26, anchor_x="center", bold=True)
+                draw_text(text, width // 2 + 2, y_pos - 2, (0, 0, 0, 200), 26, anchor_x="center", bold=True)
+                draw_text(text, width // 2, y_pos, (255, 255, 100), 26, anchor_x="center", bold=True)
             else:
                 text = f"  {option}"
-                arcade.draw_text(text, width // 2 + 2, y_pos - 2, (0, 0, 0, 150), 24, anchor_x="center")
-                arcade.draw_text(text, width // 2, y_pos, (255, 255, 255), 24, anchor_x="center")
+                draw_text(text, width // 2 + 2, y_pos - 2, (0, 0, 0, 150), 24, anchor_x="center")
+                draw_text(text, width // 2, y_pos, (255, 255, 255), 24, anchor_x="center")
 
         # Info de partida guardada
         if self.has_saved_game and self.selected_option == 1:
@@ -149,18 +150,18 @@ class MainMenu:
             if save_info:
                 info_y = panel_y + 80
                 arcade.draw_lrbt_rectangle_filled(width // 2 - 150, width // 2 + 150, info_y - 10, info_y + 20, (0, 0, 0, 120))
-                arcade.draw_text(f"Última partida: {save_info}", width // 2, info_y, (180, 220, 255), 14, anchor_x="center", bold=True)
+                draw_text(f"Última partida: {save_info}", width // 2, info_y, (180, 220, 255), 14, anchor_x="center", bold=True)
 
         # Instrucciones
         instructions_y = panel_y + 30
         arcade.draw_lrbt_rectangle_filled(panel_x + 10, panel_x + panel_width - 10, instructions_y - 10, instructions_y + 20, (0, 0, 0, 100))
-        arcade.draw_text("↑/↓ - Navegar    ENTER - Seleccionar    ESC - Salir", width // 2, instructions_y, (200, 220, 255), 16, anchor_x="center", bold=True)
+        draw_text("↑/↓ - Navegar    ENTER - Seleccionar    ESC - Salir", width // 2, instructions_y, (200, 220, 255), 16, anchor_x="center", bold=True)
 
         # Overlay de información
         if self.show_info:
             w, h = self.game.width, self.game.height
             arcade.draw_lrbt_rectangle_filled(0, w, 0, h, (0, 0, 0, 200))
-            arcade.draw_text("Información", w // 2, h - 80, (255, 220, 180), 28, anchor_x="center", bold=True)
+            draw_text("Información", w // 2, h - 80, (255, 220, 180), 28, anchor_x="center", bold=True)
             lines = [
                 "Controles:",
                 "  WASD/Flechas: Mover | ESC: Pausa/Menú | F5: Guardado rápido",
@@ -174,9 +175,13 @@ class MainMenu:
             ]
             y = h - 140
             for s in lines:
-                arcade.draw_text(s, w // 2, y, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
+                draw_text(s, w // 2, y, arcade.color.LIGHT_GRAY, 16, anchor_x="center")
                 y -= 28
 
+    def frame_key(self):
+        """Lo que cambia el dibujo (para el caché de frames estáticos)."""
+        return (self.selected_option, self.show_info, self.has_saved_game)
+
     def _get_save_info(self) -> str:
         try:
             from game.core.save_manager import SaveManager
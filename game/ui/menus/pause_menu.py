@@ -1,5 +1,6 @@
 import arcade
 from game.core.gamestate import GameState
+from game.ui.text_cache import draw_text
 
 class PauseMenu:
     """Menú de pausa durante el juego"""
@@ -26,7 +27,7 @@ class PauseMenu:
         arcade.draw_lrbt_rectangle_filled(panel_x, panel_x + panel_width, panel_y, panel_y + panel_height, (30, 40, 60))
         arcade.draw_lrbt_rectangle_outline(panel_x, panel_x + panel_width, panel_y, panel_y + panel_height, arcade.color.WHITE, 3)
 
-        arcade.draw_text("PAUSA", width // 2, panel_y + panel_height - 60, arcade.color.WHITE, 36, anchor_x="center")
+        draw_text("PAUSA", width // 2, panel_y + panel_height - 60, arcade.color.WHITE, 36, anchor_x="center")
 
         menu_start_y = panel_y + panel_height - 120
         option_spacing = 45
@@ -41,13 +42,17 @@ class PauseMenu:
                 color = arcade.color.WHITE
                 text = f"  {option}"
 
-            arcade.draw_text(text, width // 2, y_pos, color, 20, anchor_x="center")
+            draw_text(text, width // 2, y_pos, color, 20, anchor_x="center")
 
         if self.save_message and self.save_message_timer > 0:
             message_y = panel_y + 30
-            arcade.draw_text(self.save_message, width // 2, message_y, (100, 255, 100), 16, anchor_x="center")
+            draw_text(self.save_message, width // 2, message_y, (100, 255, 100), 16, anchor_x="center")
 
-        arcade.draw_text("↑/↓ - Navegar    ENTER - Seleccionar    ESC - Continuar", width // 2, panel_y - 30, (180, 180, 255), 14, anchor_x="center")
+        draw_text("↑/↓ - Navegar    ENTER - Seleccionar    ESC - Continuar", width // 2, panel_y - 30, (180, 180, 255), 14, anchor_x="center")
+
+    def frame_key(self):
+        """Lo que cambia el dibujo (para el caché de frames estáticos)."""
+        return (self.selected_option, self.save_message)
 
     def update(self, delta_time: float):
         if self.save_message_timer > 0:
@@ -1,4 +1,5 @@
 import arcade
+from game.ui.text_cache import draw_text
 
 
 
@@ -141,7 +142,7 @@ class SettingsMenu:
         )
 
         # Título
-        arcade.draw_text(
+        draw_text(
             "CONFIGURACIÓN",
             width // 2, panel_y + panel_height - 50,
             arcade.color.WHITE, 32,
@@ -186,7 +187,7 @@ class SettingsMenu:
             else:
                 text = f"{prefix}{option}{suffix}"
 
-            arcade.draw_text(
+            draw_text(
                 text,
                 width // 2, y_pos,
                 color, 20,
@@ -196,7 +197,7 @@ class SettingsMenu:
         # Mensaje temporal
         if self.message and self.message_timer > 0:
             message_y = panel_y + 30
-            arcade.draw_text(
+            draw_text(
                 self.message,
                 width // 2, message_y,
                 (100, 255, 100), 16,
@@ -204,13 +205,18 @@ class SettingsMenu:
             )
 
         # Instrucciones
-        arcade.draw_text(
+        draw_text(
             "↑/↓ - Navegar    ←/→ - Cambiar    ENTER - Confirmar    ESC - Volver",
             width // 2, panel_y - 30,
             (180, 180, 255), 14,
             anchor_x="center"
         )
 
+    def frame_key(self):
+        """Lo que cambia el dibujo (para el caché de frames estáticos)."""
+        return (self.selected_option, self.current_resolution_index, self.current_ray_index,
+                self.current_volume_index, self.current_ai_difficulty_index, self.debug_enabled, self.message)
+
     def update(self, delta_time: float):
         """Actualizar menú"""
         if self.message_timer > 0:
@@ -280,7 +286,11 @@ class SettingsMenu:
             # Aplicar número de rayos
             if self.game.renderer:
                 new_rays = self.ray_counts[self.current_ray_index]
-                self.game.renderer.num_rays = new_rays
+                governor = getattr(self.game, "quality_governor", None)
+                if governor:
+                    governor.set_preferred(num_rays=new_rays)
+                else:
+                    self.game.renderer.set_quality(num_rays=new_rays)
 
             # Aplicar debug
             self.game.debug = self.debug_enabled
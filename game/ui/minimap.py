@@ -3,23 +3,49 @@ import arcade
 import time
 from typing import Optional
 from game.core.city import CityMap
+from game.rendering import raycast
+from game.ui.text_cache import draw_text
 
 
 class MinimapRenderer:
     """
     Dibuja el minimapa. Extraído desde el renderer para separar responsabilidades (UI vs mundo).
     Mantiene posiciones y estilos originales.
+
+    El mapa estático es una textura (un píxel por tile, o por bloque en mapas
+    más grandes que minimap.max_texture) invalidada por city.map_version; las
+    ediciones chicas se escriben solo en su región. Los marcadores (jugador,
+    IA y pedidos) viven en un SpriteList reutilizado que se actualiza a
+    minimap.marker_hz, no en cada frame.
     """
     def __init__(self, city: CityMap, app_config: dict):
         self.city = city
         colors = app_config.get("colors", {}) or {}
+        minimap_conf = app_config.get("minimap", {}) or {}
         self.col_street = tuple(colors.get("street", (105, 105, 105)))
         self.col_building = tuple(colors.get("building", (160, 120, 80)))
         self.col_park = tuple(colors.get("park", (144, 238, 144)))
         self.col_player = tuple(colors.get("player", (255, 255, 0)))
-
-        self._minimap_shapes: Optional[object] = None
-        self._minimap_cache_key = None
+        self.max_texture = max(16, int(minimap_conf.get("max_texture", 1024)))
+        self.marker_interval = 1.0 / max(1.0, float(minimap_conf.get("marker_hz", 15)))
+
+        # Textura del mapa
+        self._map_texture = None
+        self._map_version = None
+        self._map_size = None
+        self._map_stride = 1
+        self._tile_rgba = {}
+        self._dirty_rects: list = []
+        self._border: Optional[object] = None
+        self._border_key = None
+        if hasattr(city, "subscribe_edits"):
+            city.subscribe_edits(self._on_map_edit)
+
+        # Marcadores
+        self._markers: Optional[object] = None
+        self._marker_pool: dict = {}
+        self._marker_key = None
+        self._last_marker_update = 0.0
 
         # Debug/perf
         self.debug = bool(app_config.get("debug", False))
@@ -35,110 +61,201 @@ class MinimapRenderer:
             return {"render_ms": 0.0}
         return {"render_ms": (self._perf_accum["render"] / f) * 1000.0}
 
-    def _ensure_minimap_cache(self, x: int, y: int, size: int):
-        key = (self.city.width, self.city.height, id(self.city.tiles), size)
-        if key == self._minimap_cache_key and self._minimap_shapes is not None:
-            return
-
-        scale_x = size / max(1, self.city.width)
-        scale_y = size / max(1, self.city.height)
-
-        shapes = arcade.shape_list.ShapeElementList()
-        create_rect = arcade.shape_list.create_rectangle_filled
-
-        for row in range(self.city.height):
-            line = self.city.tiles[row]
-            for col in range(self.city.width):
-                tile = line[col]
-                if tile == "B":
-                    c = self.col_building
-                elif tile == "P":
-                    c = self.col_park
-                else:
-                    c = self.col_street
-                # Asegurar que el color tenga canal alpha (RGBA) para evitar advertencias
-                try:
-                    c4 = (c[0], c[1], c[2], 255) if len(c) == 3 else c
-                except Exception:
-                    c4 = (105, 105, 105, 255)
-                cx = x + (col + 0.5) * scale_x
-                cy = y + (row + 0.5) * scale_y
-                shapes.append(create_rect(cx, cy, scale_x, scale_y, c4))
-
-        border = arcade.shape_list.create_rectangle_outline(
-            x + size / 2, y + size / 2, size, size, arcade.color.WHITE, border_width=2
-        )
-        shapes.append(border)
-
-        self._minimap_shapes = shapes
-        self._minimap_cache_key = key
-
-    def render(self, x: int, y: int, size: int, player):
-        t0 = time.perf_counter()
-
-        self._ensure_minimap_cache(x, y, size)
-        if not self._minimap_shapes:
-            return
-
-        self._minimap_shapes.draw()
-
+    def _on_map_edit(self, rect, map_version: int):
+        self._dirty_rects.append(rect)
+
+    def _tile_color(self, tile: str):
+        if tile == "B":
+            c = self.col_building
+        elif tile == "P":
+            c = self.col_park
+        else:
+            c = self.col_street
+        # Asegurar que el color tenga canal alpha (RGBA) para evitar advertencias
+        try:
+            return (c[0], c[1], c[2], 255) if len(c) == 3 else c
+        except Exception:
+            return (105, 105, 105, 255)
+
+    # ---------- Textura del mapa ----------
+    def _code_rgba(self, code: int) -> bytes:
+        rgba = self._tile_rgba.get(code)
+        if rgba is None:
+            chars = self.city._chars
+            tile = chars[code] if code < len(chars) else "C"
+            rgba = self._tile_rgba[code] = bytes(int(v) for v in self._tile_color(tile)[:4])
+        return rgba
+
+    def _region_rgba(self, x0: int, y0: int, x1: int, y1: int) -> bytes:
+        """
+        Píxeles RGBA de los tiles [x0, x1) x [y0, y1) con el paso de submuestreo
+        (un tile por bloque); fila 0 = abajo. En mapas por chunks se lee con
+        city.sample_row, que no pasa por el LRU de chunks residentes.
+        """
+        city = self.city
+        W, s = city.width, self._map_stride
+        np = raycast.np
+        codes = raycast.grid_array(city)
+        if codes is not None:
+            return self._code_lut()[codes.reshape(city.height, W)[y0:y1:s, x0:x1:s]].tobytes()
+        if hasattr(city, "sample_row"):
+            rows = b"".join(city.sample_row(y, x0, x1, s) for y in range(y0, y1, s))
+        else:
+            rows = b"".join(bytes(city.grid[y * W + x0:y * W + x1:s]) for y in range(y0, y1, s))
+        if np is not None:
+            return self._code_lut()[np.frombuffer(rows, dtype=np.uint8)].tobytes()
+        code_rgba = self._code_rgba
+        return b"".join(code_rgba(c) for c in rows)
+
+    def _code_lut(self):
+        """Tabla código de tile -> RGBA (256 x 4, uint8)."""
+        np = raycast.np
+        return np.frombuffer(b"".join(self._code_rgba(c) for c in range(256)), dtype=np.uint8).reshape(256, 4)
+
+    def _ensure_map_texture(self) -> bool:
+        """Crea o repara la textura del mapa; False si no hay contexto GL."""
+        city = self.city
+        W, H = city.width, city.height
+        version = getattr(city, "map_version", 0)
+        if self._map_texture is None:
+            try:
+                from game.rendering.framebuffer import TextureRect
+                self._map_texture = TextureRect(arcade.get_window().ctx)
+            except Exception as e:
+                print(f"[Minimap] Textura no disponible: {e}")
+                return False
+        if self._map_size == (W, H) and self._map_version == version and not self._dirty_rects:
+            return True
+
+        rects, self._dirty_rects = self._dirty_rects, []
+        s = self._map_stride
+        tw, th = -(-W // s), -(-H // s)
+        # Rectángulos editados -> bloques de la textura (inclusivos)
+        blocks = []
+        for x0, y0, x1, y1 in rects:
+            bx0, by0 = max(0, x0) // s, max(0, y0) // s
+            bx1, by1 = min(W - 1, x1) // s, min(H - 1, y1) // s
+            if bx0 <= bx1 and by0 <= by1:
+                blocks.append((bx0, by0, bx1, by1))
+        area = sum((bx1 - bx0 + 1) * (by1 - by0 + 1) for bx0, by0, bx1, by1 in blocks)
+        if (self._map_size == (W, H) and rects and area * 4 <= tw * th
+                and self._map_version is not None):
+            # Reparar solo los bloques editados (se vuelve a muestrear un tile por bloque)
+            for bx0, by0, bx1, by1 in blocks:
+                data = self._region_rgba(bx0 * s, by0 * s, min(W, (bx1 + 1) * s), min(H, (by1 + 1) * s))
+                self._map_texture.upload(data, (tw, th), region=(bx0, by0, bx1 - bx0 + 1, by1 - by0 + 1))
+        else:
+            self._map_stride = s = max(1, -(-max(W, H) // self.max_texture))
+            size = (-(-W // s), -(-H // s))
+            self._tile_rgba = {}
+            self._map_texture.upload(self._region_rgba(0, 0, W, H), size)
+            if self.debug:
+                print(f"[Minimap] Textura {size[0]}x{size[1]} (paso {s})")
+        self._map_size = (W, H)
+        self._map_version = version
+        return True
+
+    def _draw_border(self, x: int, y: int, size: int):
+        key = (x, y, size)
+        if self._border_key != key:
+            self._border = arcade.shape_list.ShapeElementList()
+            self._border.append(arcade.shape_list.create_rectangle_outline(
+                x + size / 2, y + size / 2, size, size, arcade.color.WHITE, border_width=2
+            ))
+            self._border_key = key
+        self._border.draw()
+
+    # ---------- Marcadores ----------
+    def _marker_sprites(self, kind: str, count: int, radius: float, arrow: float = 0.0):
+        """Los primeros `count` sprites del tipo (círculo y, si arrow > 0, flecha); crea los que falten."""
+        pool = self._marker_pool.setdefault(kind, [])
+        while len(pool) < count:
+            dot = arcade.SpriteCircle(max(1, int(radius)), arcade.color.WHITE)
+            parts = [dot]
+            if kind == "order":
+                # Contorno oscuro debajo del círculo
+                ring = arcade.SpriteCircle(max(1, int(radius)) + 1, arcade.color.COOL_BLACK)
+                self._markers.append(ring)
+                parts = [ring, dot]
+            if arrow:
+                tip = arcade.SpriteSolidColor(int(arrow), 2, color=arcade.color.WHITE)
+                parts.append(tip)
+                self._markers.append(tip)
+            self._markers.append(dot)
+            pool.append(parts)
+        for i, parts in enumerate(pool):
+            for sprite in parts:
+                sprite.visible = i < count
+        return pool[:count]
+
+    def _update_markers(self, x: int, y: int, size: int, player):
         scale_x = size / max(1, self.city.width)
         scale_y = size / max(1, self.city.height)
+        key = (x, y, size, self.city.width, self.city.height)
+        if self._markers is None or self._marker_key != key:
+            self._markers = arcade.SpriteList()
+            self._marker_pool = {}
+            self._marker_key = key
+        unit = min(scale_x, scale_y)
 
         # Marcadores de pedidos según estado
+        orders = []
         if hasattr(player, 'inventory') and player.inventory:
             for order in player.inventory.orders:
-                if getattr(order, "status", None) == "in_progress":
-                    pickup_x = x + (order.pickup_pos[0] + 0.5) * scale_x
-                    pickup_y = y + (order.pickup_pos[1] + 0.5) * scale_y
-                    r = max(4, int(min(scale_x, scale_y) * 0.4))
-                    arcade.draw_circle_filled(pickup_x, pickup_y, r, arcade.color.YELLOW_ROSE)
-                    arcade.draw_circle_outline(pickup_x, pickup_y, r, arcade.color.COOL_BLACK, 1.5)
-
-                if getattr(order, "status", None) == "picked_up":
-                    dropoff_x = x + (order.dropoff_pos[0] + 0.5) * scale_x
-                    dropoff_y = y + (order.dropoff_pos[1] + 0.5) * scale_y
-                    r = max(4, int(min(scale_x, scale_y) * 0.4))
-                    arcade.draw_circle_filled(dropoff_x, dropoff_y, r, arcade.color.RED)
-                    arcade.draw_circle_outline(dropoff_x, dropoff_y, r, arcade.color.COOL_BLACK, 1.5)
-
-        # Jugador
-        px = x + (player.x + 0.5) * scale_x
-        py = y + (player.y + 0.5) * scale_y
-        arcade.draw_circle_filled(px, py, max(2, int(min(scale_x, scale_y) * 0.3)), self.col_player)
-
-        # Flecha de dirección
-        fx = math.cos(player.angle)
-        fy = math.sin(player.angle)
-        arcade.draw_line(px, py, px + fx * 10, py + fy * 10, self.col_player, 2)
-
-        # Dibujar jugadores IA en el minimapa (obtener la ventana de arcade)
+                status = getattr(order, "status", None)
+                if status == "in_progress":
+                    orders.append((order.pickup_pos, arcade.color.YELLOW_ROSE))
+                elif status == "picked_up":
+                    orders.append((order.dropoff_pos, arcade.color.RED))
+        r = max(4, int(unit * 0.4))
+        for (pos, color), (ring, dot) in zip(orders, self._marker_sprites("order", len(orders), r)):
+            cx = x + (pos[0] + 0.5) * scale_x
+            cy = y + (pos[1] + 0.5) * scale_y
+            ring.position = dot.position = (cx, cy)
+            dot.color = color
+
+        # Jugador y jugadores IA (color según dificultad), con flecha de dirección
+        actors = [(player.x, player.y, player.angle, self.col_player, 10)]
         try:
             game = arcade.get_window()
-            if hasattr(game, 'ai_players') and game.ai_players:
-                for ai in game.ai_players:
-                    ai_x = x + (ai.x + 0.5) * scale_x
-                    ai_y = y + (ai.y + 0.5) * scale_y
-
-                    # Color según dificultad
-                    diff = getattr(ai, 'difficulty', 'easy')
-                    if diff == 'easy':
-                        color = (100, 255, 100)
-                    elif diff == 'medium':
-                        color = (255, 165, 0)
-                    else:
-                        color = (255, 50, 50)
-
-                    r = max(2, int(min(scale_x, scale_y) * 0.3))
-                    arcade.draw_circle_filled(ai_x, ai_y, r, color)
-
-                    # Flecha de dirección
-                    fx = math.cos(getattr(ai, 'angle', 0.0))
-                    fy = math.sin(getattr(ai, 'angle', 0.0))
-                    arcade.draw_line(ai_x, ai_y, ai_x + fx * 8, ai_y + fy * 8, color, 2)
+            for ai in (getattr(game, 'ai_players', None) or []):
+                diff = getattr(ai, 'difficulty', 'easy')
+                if diff == 'easy':
+                    color = (100, 255, 100)
+                elif diff == 'medium':
+                    color = (255, 165, 0)
+                else:
+                    color = (255, 50, 50)
+                actors.append((ai.x, ai.y, getattr(ai, 'angle', 0.0), color, 8))
         except Exception:
-            # No bloquear el render si algo falla al dibujar las IA
+            # No bloquear el render si algo falla al leer las IA
             pass
+        r = max(2, int(unit * 0.3))
+        for (ax, ay, ang, color, length), (dot, tip) in zip(actors, self._marker_sprites("actor", len(actors), r, 10)):
+            cx = x + (ax + 0.5) * scale_x
+            cy = y + (ay + 0.5) * scale_y
+            dot.position = (cx, cy)
+            dot.color = color
+            fx, fy = math.cos(ang), math.sin(ang)
+            tip.width = length
+            tip.position = (cx + fx * length * 0.5, cy + fy * length * 0.5)
+            tip.angle = -math.degrees(ang)  # arcade: grados en sentido horario
+            tip.color = color
+
+    def render(self, x: int, y: int, size: int, player):
+        t0 = time.perf_counter()
+
+        if not self._ensure_map_texture():
+            return
+        win = arcade.get_window()
+        self._map_texture.draw(x, y, size, size, (win.width, win.height))
+        self._draw_border(x, y, size)
+
+        now = time.perf_counter()
+        if self._markers is None or now - self._last_marker_update >= self.marker_interval:
+            self._update_markers(x, y, size, player)
+            self._last_marker_update = now
+        self._markers.draw()
 
         t1 = time.perf_counter()
         self._perf_accum["render"] += (t1 - t0)
@@ -201,7 +318,7 @@ class MinimapRenderer:
                             color = arcade.color.RED
 
                         state_text = f"{ai.difficulty[0].upper()} S:{ai.stamina:.0f}"
-                        arcade.draw_text(
+                        draw_text(
                             state_text,
                             ai_x,
                             ai_y + 12,
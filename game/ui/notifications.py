@@ -1,4 +1,5 @@
 import arcade
+from game.ui.text_cache import draw_text
 
 
 class NotificationManager:
@@ -27,4 +28,4 @@ class NotificationManager:
             msg_y = game.height - 150
             arcade.draw_lrbt_rectangle_filled(msg_x, msg_x + msg_width, msg_y, msg_y + msg_height, (0, 0, 0, 180))
             arcade.draw_lrbt_rectangle_outline(msg_x, msg_x + msg_width, msg_y, msg_y + msg_height, arcade.color.WHITE, 2)
-            arcade.draw_text(self.message, game.width // 2, msg_y + msg_height // 2 - 6, arcade.color.WHITE, 16, anchor_x="center")
\ No newline at end of file
+            draw_text(self.message, game.width // 2, msg_y + msg_height // 2 - 6, arcade.color.WHITE, 16, anchor_x="center")
\ No newline at end of file
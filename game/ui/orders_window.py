@@ -1,6 +1,7 @@
 import arcade
 from typing import List
 from game.core.orders import Order
+from game.ui.text_cache import draw_text
 
 
 class ordersWindow:
@@ -76,7 +77,7 @@ class ordersWindow:
             # Iniciar timer del pedido al aceptar
             if self.game and hasattr(self.game, "total_play_time"):
                 try:
-                    order.start_timer(self.game.total_play_time)
+                    self.game.orders_manager.start_order_timer(order, self.game.player, self.game.total_play_time)
                 except Exception:
                     pass
             # Remover de pedidos pendientes
@@ -188,7 +189,7 @@ class ordersWindow:
         )
 
         # Título
-        arcade.draw_text(
+        draw_text(
             "Pedidos Disponibles",
             current_x + self.panel_width // 2,
             current_y + self.panel_height - 30,
@@ -200,7 +201,7 @@ class ordersWindow:
 
         # Si no hay pedidos
         if not self.pending_orders:
-            arcade.draw_text(
+            draw_text(
                 "No hay pedidos disponibles",
                 current_x + self.panel_width // 2,
                 current_y + self.panel_height // 2,
@@ -228,7 +229,7 @@ class ordersWindow:
 
         for i, detail in enumerate(details):
             y_pos = info_y - (i * line_height)
-            arcade.draw_text(
+            draw_text(
                 detail,
                 current_x + 20,
                 y_pos,
@@ -239,7 +240,7 @@ class ordersWindow:
             if i == 1:
                 show_weight = getattr(order, "status", "") == "picked_up"
                 if show_weight:
-                    arcade.draw_text(
+                    draw_text(
                         f"{order.weight:.1f} kg",
                         current_x + 380,
                         y_pos,
@@ -249,7 +250,7 @@ class ordersWindow:
 
         # Indicador de pedidos (ej: "1/3")
         orders_count = f"{self.selected_order_index + 1}/{len(self.pending_orders)}"
-        arcade.draw_text(
+        draw_text(
             orders_count,
             current_x + self.panel_width - 40,
             current_y + self.panel_height - 30,
@@ -278,8 +279,8 @@ class ordersWindow:
         t = accept_cy + button_height // 2
         arcade.draw_lrbt_rectangle_filled(l, r, b, t, accept_color)
         arcade.draw_lrbt_rectangle_outline(l, r, b, t, (255, 255, 255, alpha), 2)
-        arcade.draw_text("Aceptar (A)", accept_cx, accept_cy, (255, 255, 255, alpha), 14, anchor_x="center",
-                         anchor_y="center")
+        draw_text("Aceptar (A)", accept_cx, accept_cy, (255, 255, 255, alpha), 14, anchor_x="center",
+                  anchor_y="center")
 
         # Botón Cancelar
         l = cancel_cx - button_width // 2
@@ -288,11 +289,11 @@ class ordersWindow:
         t = cancel_cy + button_height // 2
         arcade.draw_lrbt_rectangle_filled(l, r, b, t, (150, 0, 0, alpha))
         arcade.draw_lrbt_rectangle_outline(l, r, b, t, (255, 255, 255, alpha), 2)
-        arcade.draw_text("Cancelar (C)", cancel_cx, cancel_cy, (255, 255, 255, alpha), 14, anchor_x="center",
-                         anchor_y="center")
+        draw_text("Cancelar (C)", cancel_cx, cancel_cy, (255, 255, 255, alpha), 14, anchor_x="center",
+                  anchor_y="center")
 
         # Instrucciones
-        arcade.draw_text(
+        draw_text(
             "↑/↓: Navegar  |  A: Aceptar  |  C: Cancelar  |  O: Cerrar",
             current_x + self.panel_width // 2,
             current_y + 20,
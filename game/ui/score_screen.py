@@ -1,4 +1,5 @@
 import arcade
+from game.ui.text_cache import draw_text
 
 class ScoreScreen:
     def __init__(self, game, entry, leaderboard):
@@ -20,6 +21,10 @@ class ScoreScreen:
             return True
         return False
 
+    def frame_key(self):
+        """El resultado no cambia mientras la pantalla está abierta."""
+        return (id(self.entry), len(self.leaderboard))
+
     def draw(self):
         w = self.game.width
         h = self.game.height
@@ -37,7 +42,7 @@ class ScoreScreen:
         # Title
         title = "¡Victoria!" if self.entry.get("victory") else "Derrota"
         title_color = arcade.color.GREEN if self.entry.get("victory") else arcade.color.RED
-        arcade.draw_text(title, w // 2, top - 48, title_color, 28, anchor_x="center")
+        draw_text(title, w // 2, top - 48, title_color, 28, anchor_x="center")
 
         # Leaderboard column (fixed position; do not move)
         lb_x = right - 260
@@ -53,8 +58,8 @@ class ScoreScreen:
 
         def line(lbl: str, val: str):
             nonlocal y
-            arcade.draw_text(lbl, left + 24, y, lbl_color, 14)
-            arcade.draw_text(val, res_right, y, val_color, 14, anchor_x="right")
+            draw_text(lbl, left + 24, y, lbl_color, 14)
+            draw_text(val, res_right, y, val_color, 14, anchor_x="right")
             y -= line_h
 
         earnings = self.entry.get("earnings", 0)
@@ -80,13 +85,13 @@ class ScoreScreen:
 
         # Top leaderboard (right, unchanged)
         lb_y = lb_y_start
-        arcade.draw_text("Top Puntajes", lb_x, lb_y, arcade.color.YELLOW, 16)
+        draw_text("Top Puntajes", lb_x, lb_y, arcade.color.YELLOW, 16)
         lb_y -= 28
         for i, e in enumerate(self.leaderboard, start=1):
             txt = f"{i:>2}. {int(e.get('score', 0)):>6}  {'OK' if e.get('victory') else 'KO'}  {e.get('timestamp')[:10]}"
-            arcade.draw_text(txt, lb_x, lb_y, arcade.color.LIGHT_GRAY, 12)
+            draw_text(txt, lb_x, lb_y, arcade.color.LIGHT_GRAY, 12)
             lb_y -= 18
 
         # Instructions
         info = "Enter: Menu Principal"
-        arcade.draw_text(info, w // 2, bottom + 32, arcade.color.LIGHT_GRAY, 12, anchor_x="center")
\ No newline at end of file
+        draw_text(info, w // 2, bottom + 32, arcade.color.LIGHT_GRAY, 12, anchor_x="center")
\ No newline at end of file
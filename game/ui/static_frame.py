@@ -0,0 +1,74 @@
+"""
+Caché del frame de pantallas estáticas (menú principal, pausa, ajustes,
+puntajes): la escena se dibuja una vez en un framebuffer fuera de pantalla y
+en los frames siguientes se copia con un solo quad. Se vuelve a dibujar solo
+cuando cambia la clave del frame (entrada, tamaño de ventana, estado o los
+textos temporales de cada menú).
+"""
+from typing import Callable, Hashable, Optional, Sequence
+
+import arcade
+
+
+class StaticFrame:
+    """
+    Framebuffer con el último frame de una clave. draw() lo reutiliza si la
+    clave es la misma; si algo falla (sin framebuffers), se deshabilita y
+    dibuja la escena directo como antes.
+    """
+    def __init__(self, enabled: bool = True, debug: bool = False):
+        self.enabled = bool(enabled)
+        self.debug = bool(debug)
+        self._key: Optional[Hashable] = None
+        self._rect = None
+        self._fbo = None
+        self._size = (0, 0)
+        self.redraws = 0
+        self.hits = 0
+
+    def invalidate(self):
+        self._key = None
+
+    def draw(self, key: Hashable, draw_scene: Callable[[], None],
+             clear_color: Sequence[int] = (0, 0, 0, 255)) -> bool:
+        """Dibuja el frame de la clave; retorna True si se volvió a dibujar la escena."""
+        if not self.enabled:
+            draw_scene()
+            return True
+        win = arcade.get_window()
+        try:
+            size = tuple(win.get_framebuffer_size())
+            if key != self._key or self._fbo is None or size != self._size:
+                self._capture(win, size, draw_scene, clear_color)
+                self._key = key
+                self.redraws += 1
+                redrawn = True
+            else:
+                self.hits += 1
+                redrawn = False
+            self._rect.draw(0, 0, win.width, win.height, (win.width, win.height), blend=False)
+            return redrawn
+        except Exception as e:
+            print(f"[StaticFrame] Caché de frames deshabilitado: {e}")
+            self.enabled = False
+            self._key = None
+            self._fbo = None
+            win.clear()
+            draw_scene()
+            return True
+
+    # ---------- helpers privados ----------
+    def _capture(self, win, size, draw_scene, clear_color):
+        if self._rect is None:
+            from game.rendering.framebuffer import TextureRect
+            self._rect = TextureRect(win.ctx)
+        if self._fbo is None or size != self._size:
+            texture = self._rect.allocate(size)
+            self._fbo = win.ctx.framebuffer(color_attachments=[texture])
+            self._size = size
+        color = tuple(clear_color)
+        with self._fbo.activate():
+            self._fbo.clear(color=color if len(color) == 4 else color + (255,))
+            draw_scene()
+        if self.debug:
+            print(f"[StaticFrame] Redibujado {size[0]}x{size[1]} (reusos: {self.hits})")
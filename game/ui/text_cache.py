@@ -0,0 +1,183 @@
+"""
+Textos persistentes para la UI. arcade.draw_text reutiliza un Label por
+estilo y vuelve a maquetar el texto en cada llamada; aquí cada punto de
+llamada (archivo, línea, n-ésima llamada del frame) conserva su propio
+arcade.Text, así solo se vuelve a maquetar cuando cambia la cadena o el
+estilo. Posición y color se actualizan sin maquetar.
+
+Uso: `draw_text(...)` con la misma firma que arcade.draw_text; los textos
+consecutivos sin otras primitivas en medio pueden agruparse con
+`with text_batch("nombre"):` y se dibujan con un solo batch.draw().
+"""
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import arcade
+
+_DEFAULT_FONT = ("calibri", "arial")
+
+
+class _Entry:
+    __slots__ = ("text", "style", "group", "last_frame")
+
+    def __init__(self, text, style, group):
+        self.text = text
+        self.style = style
+        self.group = group
+        self.last_frame = 0
+
+
+class TextCache:
+    """
+    arcade.Text por punto de llamada. begin_frame() (una vez por frame)
+    reinicia el conteo de llamadas y descarta los textos que no se usan hace
+    más de `max_idle_frames` frames.
+    """
+    def __init__(self, max_entries: int = 512, max_idle_frames: int = 120):
+        self.max_entries = max(16, int(max_entries))
+        self.max_idle_frames = max(1, int(max_idle_frames))
+        self._entries: Dict[Tuple, _Entry] = {}
+        self._calls: Dict[Tuple, int] = {}
+        self._batches: Dict[str, object] = {}
+        self._group: Optional[str] = None
+        self._frame = 0
+        self.debug = False
+        # Estadísticas del frame en curso y del último completo
+        self._draws = 0
+        self._layouts = 0
+        self._seconds = 0.0
+        self.last_stats = {"texts": 0, "draws": 0, "layouts": 0, "ms": 0.0}
+
+    def begin_frame(self):
+        self.last_stats = {
+            "texts": len(self._entries),
+            "draws": self._draws,
+            "layouts": self._layouts,
+            "ms": self._seconds * 1000.0,
+        }
+        self._draws = 0
+        self._layouts = 0
+        self._seconds = 0.0
+        self._calls.clear()
+        self._frame += 1
+        if self._frame % 60 == 0 or len(self._entries) > self.max_entries:
+            self._evict()
+
+    def draw(self, site: Tuple, text, x: float, y: float, color=arcade.color.WHITE,
+             font_size: float = 12, width: int = 0, align: str = "left",
+             font_name=_DEFAULT_FONT, bold: bool = False, italic: bool = False,
+             anchor_x: str = "left", anchor_y: str = "baseline", multiline: bool = False,
+             rotation: float = 0):
+        t0 = time.perf_counter()
+        group = self._group
+        n = self._calls.get(site, 0)
+        self._calls[site] = n + 1
+        key = (site, n, group)
+        text = str(text)
+        style = (font_size, width, align, font_name, bold, italic, anchor_x, anchor_y, multiline, rotation)
+
+        entry = self._entries.get(key)
+        if entry is None or entry.style != style:
+            if entry is not None:
+                self._release(entry)
+            batch = self._batch(group) if group else None
+            label = arcade.Text(text, x, y, color, font_size, width=width or None, align=align,
+                                font_name=font_name, bold=bold, italic=italic, anchor_x=anchor_x,
+                                anchor_y=anchor_y, multiline=multiline, rotation=rotation, batch=batch)
+            entry = self._entries[key] = _Entry(label, style, group)
+            self._layouts += 1
+        else:
+            label = entry.text
+            if label.text != text:
+                label.text = text
+                self._layouts += 1
+            if label.x != x or label.y != y:
+                label.position = (x, y)
+            rgba = tuple(color) if len(color) == 4 else tuple(color) + (255,)
+            if tuple(label.color) != rgba:
+                label.color = rgba
+        entry.last_frame = self._frame
+
+        if group:
+            label.visible = True
+        else:
+            label.draw()
+            self._draws += 1
+        self._seconds += time.perf_counter() - t0
+
+    @contextmanager
+    def batch(self, name: str):
+        """Agrupa los textos del bloque en un pyglet Batch; se dibujan juntos al salir."""
+        previous = self._group
+        self._group = name
+        # Solo quedan visibles los textos del grupo que se vuelvan a pedir en este frame
+        for entry in self._entries.values():
+            if entry.group == name:
+                entry.text.visible = False
+        try:
+            yield
+        finally:
+            self._group = previous
+            t0 = time.perf_counter()
+            self._batch(name).draw()
+            self._draws += 1
+            self._seconds += time.perf_counter() - t0
+
+    def clear(self):
+        for entry in list(self._entries.values()):
+            self._release(entry)
+        self._entries.clear()
+        self._calls.clear()
+
+    # ---------- helpers privados ----------
+    def _batch(self, name: str):
+        batch = self._batches.get(name)
+        if batch is None:
+            import pyglet
+            batch = self._batches[name] = pyglet.graphics.Batch()
+        return batch
+
+    def _evict(self):
+        oldest = self._frame - self.max_idle_frames
+        stale = [k for k, e in self._entries.items() if e.last_frame < oldest]
+        if len(self._entries) - len(stale) > self.max_entries:
+            gone = set(stale)
+            alive = sorted((k for k in self._entries if k not in gone),
+                           key=lambda k: self._entries[k].last_frame)
+            stale.extend(alive[:len(alive) - self.max_entries])
+        for k in stale:
+            entry = self._entries.pop(k, None)
+            if entry is not None:
+                self._release(entry)
+
+    def _release(self, entry: _Entry):
+        """
+        Saca del batch los vértices de un texto agrupado (los sueltos los libera
+        el GC). Si no se puede, se descarta el batch del grupo con todos sus
+        textos: se vuelven a crear en un batch nuevo cuando se pidan.
+        """
+        if entry.group is None:
+            return
+        try:
+            entry.text.batch = None
+        except Exception as e:
+            if self.debug:
+                print(f"[TextCache] No se pudo sacar un texto del batch '{entry.group}': {e}")
+            self._batches.pop(entry.group, None)
+            for k in [k for k, e2 in self._entries.items() if e2.group == entry.group]:
+                del self._entries[k]
+
+
+TEXT_CACHE = TextCache()
+
+
+def draw_text(text, x: float, y: float, color=arcade.color.WHITE, font_size: float = 12, **kwargs):
+    """Reemplazo de arcade.draw_text con el arcade.Text de este punto de llamada."""
+    caller = sys._getframe(1)
+    TEXT_CACHE.draw((caller.f_code.co_filename, caller.f_lineno), text, x, y, color, font_size, **kwargs)
+
+
+def text_batch(name: str):
+    return TEXT_CACHE.batch(name)